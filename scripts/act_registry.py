@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Act Registry
+========================================
+Acts (labels / publishing entities) as data instead of constants: shortcode
+aliases, artist and publisher names, pseudonyms the watcher files under the
+act, default writer splits. Read from data/acts.json when it exists,
+otherwise the built-in acts below.
+
+Usage:
+    python act_registry.py list                      # registered acts + songs per act
+    python act_registry.py add STONE_MERIDIAN --name "Stone Meridian" --publisher "Stone Meridian" \\
+        --alias SM --split W-0001:100
+    python act_registry.py shard                     # move the catalog to per-act shards
+
+data/acts.json:
+    {"acts": [{"act_id": "FROZEN_CLOUD", "name": "Frozen Cloud", "publisher": "Frozen Cloud Music",
+               "aliases": ["FC"], "artists": ["Honest Mile", ...], "icon": "❄️",
+               "default_splits": [{"writer_id": "W-0001", "percentage": 50}, ...]}, ...]}
+
+The first `add` writes the file, seeded with the built-in acts. `shard`
+saves the catalog in the sharded working store (data/shards/<ACT>.json, see
+codec.py); set RIDGEMONT_STORE_FORMAT=sharded so later saves keep writing
+only the shards that changed.
+"""
+
+import re
+import sys
+import copy
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from codec import dump_file, load_file
+
+
+ACTS_FILE = "acts.json"
+FALLBACK_ACT = "FROZEN_CLOUD"  # whose splits a new song gets when its act has none
+ACT_ID_PATTERN = re.compile(r"^[A-Z0-9_]+$")
+DEFAULT_ACTS: List[Dict[str, Any]] = [
+    {"act_id": "FROZEN_CLOUD", "name": "Frozen Cloud", "publisher": "Frozen Cloud Music", "aliases": ["FC"], "icon": "❄️",
+     "artists": ["Honest Mile", "Echoes of Jahara"],
+     "default_splits": [{"writer_id": "W-0001", "percentage": 50}, {"writer_id": "W-0002", "percentage": 50}]},
+    {"act_id": "PARK_BELLEVUE", "name": "Park Bellevue", "publisher": "Park Bellevue Collective", "aliases": ["PB"], "icon": "🏛️",
+     "default_splits": [{"writer_id": "W-0001", "percentage": 50}, {"writer_id": "W-0003", "percentage": 50}]},
+    {"act_id": "BAJAN_SUN", "name": "Bajan Sun", "publisher": "Bajan Sun Publishing", "aliases": ["BS"], "icon": "☀️",
+     "default_splits": [{"writer_id": "W-0001", "percentage": 100}]},
+    {"act_id": "STONE_MERIDIAN", "name": "Stone Meridian", "publisher": "Stone Meridian", "aliases": []},
+]
+
+
+class ActRegistry:
+    """Registered acts in display order, with alias lookup."""
+
+    def __init__(self, acts: List[Dict[str, Any]], path: Optional[Path] = None):
+        self.acts = acts
+        self.path = path
+        self._aliases = None
+
+    @classmethod
+    def load(cls, data_dir: Path) -> "ActRegistry":
+        path = Path(data_dir) / ACTS_FILE
+        if path.exists():
+            return cls(load_file(path).get("acts", []), path)
+        return cls(copy.deepcopy(DEFAULT_ACTS), path)
+
+    def save(self) -> Path:
+        dump_file(self.path, {"acts": self.acts}, pretty=True)
+        return self.path
+
+    def ids(self) -> List[str]:
+        return [act["act_id"] for act in self.acts]
+
+    def get(self, act_id: str) -> Optional[Dict[str, Any]]:
+        return next((act for act in self.acts if act["act_id"] == act_id), None)
+
+    def aliases(self) -> Dict[str, str]:
+        """Every accepted spelling -> act_id, e.g. {"FROZEN_CLOUD": "FROZEN_CLOUD", "FC": "FROZEN_CLOUD"}."""
+        if self._aliases is None:
+            self._aliases = {}
+            for act in self.acts:
+                self._aliases[act["act_id"]] = act["act_id"]
+                for alias in act.get("aliases") or []:
+                    self._aliases[alias.upper()] = act["act_id"]
+        return self._aliases
+
+    def resolve(self, key: Optional[str]) -> Optional[str]:
+        """act_id for an alias or ID (case-insensitive); None if it isn't registered."""
+        return self.aliases().get(key.strip().upper()) if key else None
+
+    def name(self, act_id: str, default: str = "Unknown") -> str:
+        return (self.get(act_id) or {}).get("name") or default
+
+    def publisher(self, act_id: str) -> str:
+        """Publisher name; unregistered IDs read as "Phantom Frenzy"."""
+        return (self.get(act_id) or {}).get("publisher") or act_id.replace("_", " ").title()
+
+    def publisher_map(self) -> Dict[str, str]:
+        """act_id -> publisher name."""
+        return {act["act_id"]: act["publisher"] for act in self.acts if act.get("publisher")}
+
+    def labels(self) -> Dict[str, str]:
+        """publisher name -> act_id, for select boxes."""
+        return {publisher: act_id for act_id, publisher in self.publisher_map().items()}
+
+    def artist_names(self) -> List[str]:
+        return [act["name"] for act in self.acts if act.get("name")]
+
+    def act_for_artist(self, artist: str) -> Optional[str]:
+        """act_id whose name or pseudonyms (artists) match, case-insensitively."""
+        wanted = artist.strip().casefold()
+        for act in self.acts:
+            if wanted in (n.casefold() for n in [act.get("name") or ""] + (act.get("artists") or [])):
+                return act["act_id"]
+        return None
+
+    def default_splits(self, act_id: str) -> List[Dict[str, Any]]:
+        """Writer splits for a new song of this act (the fallback act's when it has none)."""
+        splits = (self.get(act_id) or {}).get("default_splits") or (self.get(FALLBACK_ACT) or {}).get("default_splits") or []
+        return copy.deepcopy(splits)
+
+    def register(self, act_id: str, name: Optional[str] = None, publisher: Optional[str] = None,
+                 aliases: Optional[List[str]] = None, default_splits: Optional[List[Dict[str, Any]]] = None,
+                 icon: Optional[str] = None, artists: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Add or update an act (aliases must not clash with another act's). Call save() to persist."""
+        act_id = act_id.strip().upper()
+        if not ACT_ID_PATTERN.match(act_id):
+            raise ValueError(f"act_id must be A-Z, 0-9 and _, got '{act_id}'")
+        aliases = [a.strip().upper() for a in aliases or [] if a.strip()]
+        for alias in aliases:
+            owner = self.aliases().get(alias)
+            if owner and owner != act_id:
+                raise ValueError(f"Alias '{alias}' already belongs to {owner}")
+        if default_splits and round(sum(float(s["percentage"]) for s in default_splits), 4) != 100:
+            raise ValueError("default splits must add up to 100%")
+        act = self.get(act_id)
+        if act is None:
+            act = {"act_id": act_id}
+            self.acts.append(act)
+        fields = {"name": name, "publisher": publisher, "icon": icon, "default_splits": default_splits}
+        act.update({k: v for k, v in fields.items() if v is not None})
+        act["aliases"] = sorted(set(act.get("aliases") or []) | set(aliases))
+        act["artists"] = (act.get("artists") or []) + [a for a in artists or [] if a not in (act.get("artists") or [])]
+        self._aliases = None
+        return act
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def _split(text: str) -> Dict[str, Any]:
+    writer_id, _, percentage = text.partition(":")
+    return {"writer_id": writer_id, "percentage": float(percentage)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Registered acts and per-act catalog shards.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list")
+    add = sub.add_parser("add")
+    add.add_argument("act_id")
+    add.add_argument("--name", help="artist name new songs default to")
+    add.add_argument("--publisher", help="publishing entity shown in the app")
+    add.add_argument("--alias", action="append", default=[], help="shortcode alias, e.g. SM (repeatable)")
+    add.add_argument("--artist", action="append", default=[], help="pseudonym the watcher files under this act (repeatable)")
+    add.add_argument("--split", action="append", type=_split, help="default writer split WRITER_ID:PERCENT (repeatable)")
+    add.add_argument("--icon")
+    sub.add_parser("shard")
+    args = parser.parse_args(argv)
+
+    from catalog_manager import CatalogManager
+    if args.command == "shard":
+        manager = CatalogManager(store_format="sharded")
+        manager.save_data()
+        print(f"🗂️ Catalog sharded by act → {manager.data_dir / 'shards'} (set RIDGEMONT_STORE_FORMAT=sharded to keep it that way)")
+        return
+    manager = CatalogManager()
+    registry = manager.act_registry
+    if args.command == "add":
+        try:
+            act = registry.register(args.act_id, args.name, args.publisher, args.alias, args.split, args.icon, args.artist)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        print(f"✅ {act['act_id']} saved to {registry.save()}")
+        return
+    counts = Counter(song.get("act_id") for song in manager.catalog["songs"])
+    for act_id in registry.ids() + sorted(a for a in counts if a and a not in registry.ids()):
+        act = registry.get(act_id) or {}
+        flag = "" if act else "   (not registered)"
+        print(f"  {act_id:<18} {', '.join(act.get('aliases') or []):<8} {registry.publisher(act_id):<28} {counts[act_id]:>6} songs{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,58 @@
 import streamlit as st
 import pandas as pd
 from catalog_manager import CatalogManager
+from catalog_views import STATUS_OPTIONS, SORT_OPTIONS, PAGE_SIZE_OPTIONS, DEFAULT_PAGE_SIZE, artist_options as build_artist_options, songs_frame, filter_frame, page_frame
 import os
+import time
 from pathlib import Path
-# Initialize Manager
-manager = CatalogManager()
+import metrics
+from models import normalize_status
+from coverage_matrix import CoverageMatrix
+# Initialize Manager: one per server process, built on first run (data
+# files load on first access) and re-read only when the catalog changes.
+@st.cache_resource(show_spinner=False)
+def get_manager():
+    return CatalogManager()
+
+manager = get_manager()
+manager.reload_if_changed()
 # Page Config
 st.set_page_config(page_title="Ridgemont Studio", page_icon="🎵", layout="wide")
+
+# Song tables: one frame per catalog version, shared read-only across reruns
+# and sessions; pages only filter, sort and slice it.
+# Publisher views come from the act registry (data/acts.json).
+SONG_TABLE_VIEWS = {
+    "📋 All": (None, "No songs match filters"),
+    **{f"{act.get('icon', '🎵')} {act['publisher']}": (act["act_id"], f"No {act['publisher']} songs match filters")
+       for act in manager.act_registry.acts if act.get("publisher")},
+}
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def catalog_frame(version, _songs):
+    return songs_frame(_songs)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def catalog_coverage(version, _songs):
+    return CoverageMatrix.from_songs(_songs)
+
+def paged_rows(df, key):
+    """Sort and paging controls for a table; returns the rows of the current page."""
+    col_sort, col_dir, col_size, col_page = st.columns([3, 2, 2, 2])
+    with col_sort:
+        sort_label = st.selectbox("Sort by", list(SORT_OPTIONS), key="table_sort")
+    with col_dir:
+        st.markdown("<br>", unsafe_allow_html=True)
+        descending = st.toggle("Descending", key="table_descending")
+    with col_size:
+        page_size = st.selectbox("Rows per page", PAGE_SIZE_OPTIONS, index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE), key="table_page_size")
+    pages = max(1, -(-len(df) // page_size))
+    with col_page:
+        page_num = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"page_{key}_{page_size}")
+    rows, _ = page_frame(df, page_num, page_size, SORT_OPTIONS[sort_label], descending)
+    first = (page_num - 1) * page_size
+    st.caption(f"Songs {first + 1}-{first + len(rows)} of {len(df)}")
+    return rows
 # Logo and Title
 col_logo, col_title = st.columns([0.5, 5])
 with col_logo:
@@ -26,6 +72,9 @@ nav_index = NAV_PAGES.index(st.session_state.nav_page) if st.session_state.nav_p
 
 page = st.sidebar.radio("Go to", NAV_PAGES, index=nav_index, key="nav_page")
 
+# Time each page render (st.rerun/st.stop skip the observation, which is fine)
+_render_started = time.perf_counter()
+
 if page == "Dashboard":
     st.header("Catalog Overview")
 
@@ -42,10 +91,9 @@ if page == "Dashboard":
 
     # Songs by Publisher
     st.subheader("Songs by Publisher")
-    pub_col1, pub_col2, pub_col3 = st.columns(3)
-    pub_col1.metric("❄️ Frozen Cloud", summary['by_act'].get('FROZEN_CLOUD', 0))
-    pub_col2.metric("🏛️ Park Bellevue", summary['by_act'].get('PARK_BELLEVUE', 0))
-    pub_col3.metric("☀️ Bajan Sun", summary['by_act'].get('BAJAN_SUN', 0))
+    publishers = [act for act in manager.act_registry.acts if act.get("publisher")]
+    for col, act in zip(st.columns(len(publishers) or 1), publishers):
+        col.metric(f"{act.get('icon', '🎵')} {act.get('name') or act['publisher']}", summary['by_act'].get(act["act_id"], 0))
 
     st.markdown("---")
     st.subheader("Recent Songs")
@@ -73,12 +121,10 @@ elif page == "All Songs":
     st.header("📀 Complete Catalog")
 
     songs = manager.catalog['songs']
+    frame = catalog_frame(manager.catalog_signature(), songs)
 
-    # Artist options - the three main bands
-    artist_options = ["All", "Frozen Cloud", "Park Bellevue", "Bajan Sun"]
-    # Also add any other artists found in catalog (like Honest Mile)
-    other_artists = sorted(set(s.get('artist', '') for s in songs if s.get('artist') and s.get('artist') not in artist_options))
-    artist_options.extend(other_artists)
+    # Artist options - the registered acts' artists, then any other artists found in catalog (like Honest Mile)
+    artist_options = build_artist_options(songs, manager.act_registry.artist_names())
 
     # Use a counter to force new widget keys when clearing
     if 'filter_version' not in st.session_state:
@@ -91,7 +137,7 @@ elif page == "All Songs":
     with col1:
         artist_filter = st.selectbox("Filter by Artist or Group", artist_options, key=f"artist_filter_{v}")
     with col2:
-        status_filter = st.selectbox("Filter by Status", ["All", "idea", "demo", "mixing", "mastered", "copyright", "released"], key=f"status_filter_{v}")
+        status_filter = st.selectbox("Filter by Status", ["All"] + STATUS_OPTIONS, key=f"status_filter_{v}")
     with col3:
         search = st.text_input("Search by Title or Code", key=f"search_field_{v}")
     with col4:
@@ -100,22 +146,16 @@ elif page == "All Songs":
             st.session_state.filter_version += 1
             st.rerun()
 
+    # Group by publishing company - only the selected view is filtered and rendered
+    view = st.radio("Publisher", list(SONG_TABLE_VIEWS), horizontal=True, label_visibility="collapsed", key="song_table_view")
+    act_id, empty_msg = SONG_TABLE_VIEWS[view]
+
     # Apply filters
-    filtered = songs
-    if artist_filter != "All":
-        filtered = [s for s in filtered if s.get('artist') == artist_filter]
-    if status_filter != "All":
-        filtered = [s for s in filtered if s.get('status') == status_filter]
-    if search:
-        search_lower = search.lower()
-        filtered = [s for s in filtered if search_lower in s.get('title', '').lower() or search_lower in s.get('legacy_code', '').lower()]
+    filtered = filter_frame(frame, artist_filter, status_filter, search, act_id=act_id)
 
     # Display count
     st.write(f"**Showing {len(filtered)} of {len(songs)} songs**")
 
-    # Group by publishing company tabs - with "All" option
-    tab_all, tab_fc, tab_pb, tab_bs = st.tabs(["📋 All", "❄️ Frozen Cloud Music", "🏛️ Park Bellevue Collective", "☀️ Bajan Sun Publishing"])
-
     # Determine columns based on filter - include song_id and artist column
     if status_filter == "copyright":
         display_cols = ['song_id', 'legacy_code', 'title', 'artist', 'copyright_number']
@@ -124,32 +164,13 @@ elif page == "All Songs":
         display_cols = ['song_id', 'legacy_code', 'title', 'artist', 'status']
         col_names = ['Song ID', 'Code', 'Title', 'Artist', 'Status']
 
-    def render_song_table(song_list, empty_msg):
-        if song_list:
-            df = pd.DataFrame(song_list)
-            available_cols = [c for c in display_cols if c in df.columns]
-            display_df = df[available_cols]
-            col_labels = [col_names[display_cols.index(c)] for c in available_cols]
-            display_df.columns = col_labels
-            st.dataframe(display_df, use_container_width=True, height=400)
-            st.caption(f"{len(song_list)} songs")
-        else:
-            st.info(empty_msg)
-
-    with tab_all:
-        render_song_table(filtered, "No songs match filters")
-
-    with tab_fc:
-        fc_songs = [s for s in filtered if s.get('act_id') == 'FROZEN_CLOUD']
-        render_song_table(fc_songs, "No Frozen Cloud Music songs match filters")
-
-    with tab_pb:
-        pb_songs = [s for s in filtered if s.get('act_id') == 'PARK_BELLEVUE']
-        render_song_table(pb_songs, "No Park Bellevue Collective songs match filters")
-
-    with tab_bs:
-        bs_songs = [s for s in filtered if s.get('act_id') == 'BAJAN_SUN']
-        render_song_table(bs_songs, "No Bajan Sun Publishing songs match filters")
+    if len(filtered):
+        rows = paged_rows(filtered, f"songs_{v}_{view}_{artist_filter}_{status_filter}_{search}")
+        display_df = rows[display_cols]
+        display_df.columns = col_names
+        st.dataframe(display_df, use_container_width=True, height=400, hide_index=True)
+    else:
+        st.info(empty_msg)
 
 elif page == "Albums":
     st.header("💿 Albums")
@@ -209,12 +230,7 @@ elif page == "Albums":
             st.caption(f"Existing artists: {', '.join(existing_artists)}")
 
         # Act selection
-        ACT_MAP = {
-            "Frozen Cloud Music": "FROZEN_CLOUD",
-            "Park Bellevue Collective": "PARK_BELLEVUE",
-            "Bajan Sun Publishing": "BAJAN_SUN",
-            "Stone Meridian": "STONE_MERIDIAN"
-        }
+        ACT_MAP = manager.act_registry.labels()
         act_label = st.selectbox("Publishing Act", list(ACT_MAP.keys()))
 
         album_status = st.selectbox("Status", ["in_progress", "mixing", "mastered", "released"])
@@ -243,10 +259,7 @@ elif page == "Albums":
                     "last_modified": datetime.now().isoformat()
                 }
 
-                if 'albums' not in manager.catalog:
-                    manager.catalog['albums'] = []
-                manager.catalog['albums'].append(new_album)
-                manager.save_catalog()
+                manager.add_album(new_album)
                 st.success(f"✅ Created album '{album_title}' by {album_artist}")
                 st.rerun()
 
@@ -254,11 +267,7 @@ elif page == "Add Song":
     st.header("New Song Entry")
 
     # Publishing company mapping
-    PUBLISHER_MAP = {
-        "Frozen Cloud Music": "FROZEN_CLOUD",
-        "Park Bellevue Collective": "PARK_BELLEVUE",
-        "Bajan Sun Publishing": "BAJAN_SUN"
-    }
+    PUBLISHER_MAP = manager.act_registry.labels()
 
     # Get unique artists from catalog for suggestions
     existing_artists = sorted(set(s.get('artist', '') for s in manager.catalog['songs'] if s.get('artist')))
@@ -276,7 +285,7 @@ elif page == "Add Song":
 
         publisher_label = st.selectbox("Publishing Company", list(PUBLISHER_MAP.keys()))
         publisher_id = PUBLISHER_MAP[publisher_label]
-        status = st.selectbox("Status", ["idea", "demo", "mixing", "mastered", "copyright", "released"])
+        status = st.selectbox("Status", STATUS_OPTIONS)
 
         # Cover song selection
         st.markdown("---")
@@ -387,9 +396,9 @@ elif page == "Edit Song":
                 st.subheader(f"Editing: {selected_song['title']}")
 
                 col1, col2 = st.columns(2)
-                new_status = col1.selectbox("Status",
-                                        ["idea", "demo", "mixing", "mastered", "released"],
-                                        index=["idea", "demo", "mixing", "mastered", "released"].index(selected_song['status']) if selected_song['status'] in ["idea", "demo", "mixing", "mastered", "released"] else 0)
+                current_status = normalize_status(selected_song.get('status'))
+                new_status = col1.selectbox("Status", STATUS_OPTIONS,
+                                        index=STATUS_OPTIONS.index(current_status) if current_status in STATUS_OPTIONS else 0)
 
                 st.markdown("### 📝 Registration Info")
                 c1, c2 = st.columns(2)
@@ -447,11 +456,7 @@ elif page == "View Deployments":
     songs = manager.catalog['songs']
 
     # Publisher mapping (legal entities)
-    PUBLISHER_MAP = {
-        "FROZEN_CLOUD": "Frozen Cloud Music",
-        "PARK_BELLEVUE": "Park Bellevue Collective",
-        "BAJAN_SUN": "Bajan Sun Publishing"
-    }
+    PUBLISHER_MAP = manager.act_registry.publisher_map()
 
     # All platform options
     ALL_DISTRIBUTORS = ["DistroKid", "TuneCore", "CD Baby", "Amuse", "AWAL", "Ditto"]
@@ -459,8 +464,11 @@ elif page == "View Deployments":
     ALL_STREAMING = ["Spotify", "Apple Music", "Amazon", "YouTube", "Tidal", "Deezer", "Pandora"]
     ALL_PLATFORMS = ALL_DISTRIBUTORS + ALL_SYNC_LIBS + ALL_STREAMING
 
+    frame = catalog_frame(manager.catalog_signature(), songs)
+    coverage = catalog_coverage(manager.catalog_signature(), songs)
+
     # Get unique publishers from catalog
-    ALL_PUBLISHERS = sorted(set(PUBLISHER_MAP.get(s.get('act_id', ''), 'Unknown') for s in songs))
+    ALL_PUBLISHERS = sorted(set(PUBLISHER_MAP.get(a, 'Unknown') for a in frame["act_id"].unique()))
 
     # Filters Row 1: Publisher
     selected_publishers = st.multiselect(
@@ -480,77 +488,45 @@ elif page == "View Deployments":
     with col2:
         match_mode = st.radio("Match Mode", ["Any (OR)", "All (AND)"], horizontal=True)
 
-    # Apply publisher filter first
-    if selected_publishers:
-        filtered_songs = [s for s in songs if PUBLISHER_MAP.get(s.get('act_id', ''), 'Unknown') in selected_publishers]
-    else:
-        filtered_songs = songs
+    # Apply publisher filter first, then platforms (Any = OR, All = AND)
+    filtered = filter_frame(frame, publishers=selected_publishers, publisher_map=PUBLISHER_MAP,
+                            platforms=selected_platforms, match_all=(match_mode == "All (AND)"), coverage=coverage)
 
-    # Apply platform filters
-    if selected_platforms:
-        platform_filtered = []
-        for s in filtered_songs:
-            deps = s.get('deployments', {})
-            song_platforms = (
-                deps.get('distribution', []) +
-                deps.get('sync_libraries', []) +
-                deps.get('streaming', [])
-            )
-
-            if match_mode == "Any (OR)":
-                # Song has at least ONE of the selected platforms
-                if any(p in song_platforms for p in selected_platforms):
-                    platform_filtered.append(s)
-            else:
-                # Song has ALL of the selected platforms
-                if all(p in song_platforms for p in selected_platforms):
-                    platform_filtered.append(s)
-        filtered_songs = platform_filtered
+    st.write(f"**Showing {len(filtered)} of {len(songs)} songs**")
 
-    st.write(f"**Showing {len(filtered_songs)} of {len(songs)} songs**")
+    # Build the table with emoji indicators - only for the rows on this page
+    if len(filtered):
+        rows = paged_rows(filtered, f"deployments_{selected_publishers}_{selected_platforms}_{match_mode}")
+
+        # Format with checkmarks for selected platforms
+        def format_platforms(platforms):
+            if not platforms:
+                return "-"
+            return ", ".join(f"✅ {p}" if p in selected_platforms else p for p in platforms)
 
-    # Build the table with emoji indicators
-    if filtered_songs:
         table_data = []
         song_id_map = {}  # Map row index to song data for jump-to-edit
-        for idx, s in enumerate(filtered_songs):
-            deps = s.get('deployments', {})
-            dist_list = deps.get('distribution', [])
-            sync_list = deps.get('sync_libraries', [])
-            stream_list = deps.get('streaming', [])
-
-            # Format with checkmarks for selected platforms
-            def format_platforms(platforms, all_options):
-                if not platforms:
-                    return "-"
-                result = []
-                for p in platforms:
-                    if selected_platforms and p in selected_platforms:
-                        result.append(f"✅ {p}")
-                    else:
-                        result.append(p)
-                return ", ".join(result)
-
+        for idx, s in enumerate(rows.itertuples(index=False)):
             # Get publisher from mapping
-            act_id = s.get('act_id', '')
+            act_id = s.act_id
             publisher = PUBLISHER_MAP.get(act_id, 'Unknown')
-            artist = s.get('artist', act_id.replace('_', ' ').title())
+            artist = s.artist or act_id.replace('_', ' ').title()
 
             table_data.append({
-                "Title": s['title'],
+                "Title": s.title,
                 "Artist": artist,
                 "Publisher": publisher,
-                "Status": s.get('status', '-').title(),
-                "Distributors": format_platforms(dist_list, ALL_DISTRIBUTORS),
-                "Sync Libraries": format_platforms(sync_list, ALL_SYNC_LIBS),
-                "Streaming": format_platforms(stream_list, ALL_STREAMING)
+                "Status": (s.status or '-').title(),
+                "Distributors": format_platforms(s.distribution),
+                "Sync Libraries": format_platforms(s.sync_libraries),
+                "Streaming": format_platforms(s.streaming)
             })
 
             # Store mapping for jump-to-edit
             song_id_map[idx] = {
-                'title': s['title'],
+                'title': s.title,
                 'artist': artist,
-                'song_id': s['song_id']
+                'song_id': s.song_id
             }
 
         # Display table with row selection
@@ -587,12 +563,7 @@ elif page == "View Deployments":
         st.subheader("📊 Platform Summary")
 
         # Count songs per platform
-        platform_counts = {}
-        for s in songs:
-            deps = s.get('deployments', {})
-            all_plats = deps.get('distribution', []) + deps.get('sync_libraries', []) + deps.get('streaming', [])
-            for p in all_plats:
-                platform_counts[p] = platform_counts.get(p, 0) + 1
+        platform_counts = coverage.coverage()
 
         if platform_counts:
             # Display in columns
@@ -624,6 +595,19 @@ elif page == "View Deployments":
                         st.write(f"✅ {p}: {count} songs")
                     else:
                         st.write(f"⬜ {p}: 0 songs")
+
+        # Gap report: songs missing from target platforms, by publisher and status
+        with st.expander("🕳️ Platform Gaps"):
+            targets = st.multiselect("Target platforms", ALL_PLATFORMS, default=selected_platforms or ["Spotify"], key="gap_targets")
+            if targets:
+                gaps = coverage.gap_report(targets)
+                st.dataframe(pd.DataFrame([{
+                    "Publisher": PUBLISHER_MAP.get(g["act_id"], g["act_id"].replace('_', ' ').title()),
+                    "Status": g["status"].title(),
+                    "Songs": g["songs"],
+                    "Missing any": g["missing_any"],
+                    **{f"No {t}": n for t, n in g["missing"].items()},
+                } for g in gaps]), use_container_width=True, hide_index=True)
     else:
         st.info("No songs match the selected platforms.")
 
@@ -669,3 +653,32 @@ elif page == "Pitching":
             if submitted and supervisor:
                 result = manager.execute_pitch_shortcode(song, supervisor)
                 st.markdown(result)
+
+        st.markdown("---")
+        st.subheader("📣 Pitch Campaign")
+        known_supervisors = [s['name'] for s in manager.supervisors.get('supervisors', [])]
+        with st.form("campaign_form"):
+            campaign_songs = st.multiselect("Songs to Pitch", sorted(set(titles)))
+            campaign_sups = st.multiselect("Supervisors", known_supervisors)
+            extra_sups = st.text_area("New Supervisors (one per line)")
+            project = st.text_input("Project", value="General Pitch")
+            launched = st.form_submit_button("Launch Campaign")
+
+            if launched and campaign_songs:
+                names = campaign_sups + [n for n in extra_sups.splitlines() if n.strip()]
+                if names:
+                    from pitch_campaign import format_campaign_summary
+                    st.markdown(format_campaign_summary(manager.run_pitch_campaign(campaign_songs, names, project=project)))
+
+        activity = manager.supervisor_store.last_contact_report()
+        if activity:
+            st.markdown("---")
+            st.subheader("📇 Supervisor Activity")
+            st.dataframe(pd.DataFrame(activity).rename(columns={
+                "id": "ID", "name": "Name", "email": "Email", "pitches": "Pitches", "last_contact": "Last Contact"
+            }), use_container_width=True, hide_index=True)
+
+metrics.observe("streamlit.page_render", time.perf_counter() - _render_started, page=page)
+metrics.flush()
+with st.sidebar.expander("⏱️ Metrics"):
+    st.json(metrics.REGISTRY.summary())
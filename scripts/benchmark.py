@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Benchmark Suite
+===========================================
+Times the hot paths of CatalogManager, the watcher and the Streamlit pages
+against synthetic catalogs, and writes a JSON report that can be compared
+across runs.
+
+Usage:
+    python benchmark.py                          # 1k and 10k songs
+    python benchmark.py --sizes 1000 10000 100000
+    python benchmark.py --only load_data save_data
+    python benchmark.py --only import_time cold_shortcode daemon_shortcode   # CLI startup vs warm daemon
+    python benchmark.py --compare ../benchmarks/benchmark_20260201_120000.json
+    RIDGEMONT_JSON_CODEC=json python benchmark.py   # stdlib-only baseline
+
+Every run works in a scratch directory: CatalogManager's data, backups,
+pitch decks, dashboards and exports are redirected there, so nothing in the
+real catalog is touched. Reports land in benchmarks/ at the repo root.
+"""
+
+import io
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import threading
+import argparse
+import statistics
+import subprocess
+import copy
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Callable
+
+import catalog_manager
+from catalog_manager import CatalogManager, BASE_DIR
+import codec
+from models import load_songs, dump_songs
+from catalog_views import songs_frame, filter_frame, page_frame
+from coverage_matrix import CoverageMatrix
+from rights_engine import RightsIndex
+from royalties import validate_splits, writer_statements
+from event_store import EventStore
+from history import CatalogHistory
+from catalog_cli import CatalogDaemon, request
+from synthetic_catalog import write_catalog
+
+
+REPORTS_DIR = BASE_DIR / "benchmarks"
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_SIZES = [1000, 10000]
+
+
+# =============================================================================
+# CASE REGISTRY
+# =============================================================================
+
+class BenchContext:
+    """Per-size scratch environment handed to every case."""
+
+    def __init__(self, root: Path, size: int):
+        self.root = root
+        self.size = size
+        self.data_dir = root / "data"
+        self.manager: Optional[CatalogManager] = None
+
+    def fresh_manager(self, lazy: bool = False) -> CatalogManager:
+        with quiet():
+            manager = CatalogManager(self.data_dir, lazy=lazy)
+        if not lazy:
+            self.manager = manager
+        return manager
+
+
+# name -> (factory(ctx) -> zero-arg callable to time, repeat)
+CASES: Dict[str, Any] = {}
+
+
+def case(name: str, repeat: int = 5):
+    """Register a benchmark. The factory does setup and returns the callable to time."""
+    def register(factory: Callable[[BenchContext], Callable[[], Any]]):
+        CASES[name] = (factory, repeat)
+        return factory
+    return register
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the manager's progress prints while timing."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def scratch_dirs(root: Path):
+    """Point catalog_manager's output folders at the scratch root."""
+    names = ["BACKUPS_DIR", "PITCH_DECKS_DIR", "DASHBOARDS_DIR", "EXPORTS_DIR", "PROJECTIONS_DIR", "STATEMENTS_DIR"]
+    saved = {n: getattr(catalog_manager, n) for n in names}
+    try:
+        for n in names:
+            setattr(catalog_manager, n, root / saved[n].name)
+        yield
+    finally:
+        for n, value in saved.items():
+            setattr(catalog_manager, n, value)
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        with quiet():
+            start = time.perf_counter()
+            fn()
+            runs.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": repeat,
+        "min_ms": round(min(runs), 3),
+        "median_ms": round(statistics.median(runs), 3),
+        "mean_ms": round(statistics.fmean(runs), 3),
+    }
+
+
+# =============================================================================
+# CASES
+# =============================================================================
+
+@case("load_data")
+def _load_data(ctx: BenchContext):
+    manager = ctx.fresh_manager()
+    return manager._load_data
+
+
+@case("load_data_lazy")
+def _load_data_lazy(ctx: BenchContext):
+    ctx.fresh_manager(lazy=True)  # builds the sidecars once
+    return lambda: CatalogManager(ctx.data_dir, lazy=True).get_catalog_summary()
+
+
+@case("song_details", repeat=20)
+def _song_details(ctx: BenchContext):
+    manager = ctx.fresh_manager(lazy=True)
+    ids = [s.song_id for s in manager.song_summaries()[::max(1, ctx.size // 100)]]
+
+    def fetch():
+        manager.lazy_catalog._details.clear()
+        for song_id in ids:
+            manager.get_song_details(song_id)
+    return fetch
+
+
+@case("save_data", repeat=3)
+def _save_data(ctx: BenchContext):
+    return ctx.fresh_manager().save_data
+
+
+@case("codec_encode", repeat=5)
+def _codec_encode(ctx: BenchContext):
+    catalog = (ctx.manager or ctx.fresh_manager()).catalog
+    return lambda: codec.dumps(catalog, pretty=True)
+
+
+@case("codec_decode", repeat=5)
+def _codec_decode(ctx: BenchContext):
+    payload = (ctx.data_dir / "catalog.json").read_bytes()
+    return lambda: codec.loads(payload)
+
+
+def _compact_dir(ctx: BenchContext) -> Path:
+    """A copy of the data dir saved once in the compact working store."""
+    target = ctx.root / "compact"
+    if not target.exists():
+        shutil.copytree(ctx.data_dir, target)
+        with quiet():
+            CatalogManager(target, store_format="compact").save_data()
+    return target
+
+
+@case("load_data_compact")
+def _load_data_compact(ctx: BenchContext):
+    with quiet():
+        manager = CatalogManager(_compact_dir(ctx), store_format="compact")
+    return manager._load_data
+
+
+@case("save_data_compact", repeat=3)
+def _save_data_compact(ctx: BenchContext):
+    with quiet():
+        manager = CatalogManager(_compact_dir(ctx), store_format="compact")
+    return manager.save_data
+
+
+def _sharded_dir(ctx: BenchContext) -> Path:
+    """A copy of the data dir saved once in the per-act sharded store."""
+    target = ctx.root / "sharded"
+    if not target.exists():
+        shutil.copytree(ctx.data_dir, target)
+        with quiet():
+            CatalogManager(target, store_format="sharded").save_data()
+    return target
+
+
+@case("save_data_sharded", repeat=3)
+def _save_data_sharded(ctx: BenchContext):
+    with quiet():
+        manager = CatalogManager(_sharded_dir(ctx), store_format="sharded")
+    song_id = next(s["song_id"] for s in manager.catalog["songs"] if s.get("act_id") == "BAJAN_SUN")
+    counter = iter(range(10 ** 6))
+    # A tracked edit to one act's song: only its shard (backed up, then rewritten) and the index are written
+    return lambda: manager.update_song(song_id, {"notes": f"bench {next(counter)}"})
+
+
+@case("load_act_sharded", repeat=5)
+def _load_act_sharded(ctx: BenchContext):
+    target = _sharded_dir(ctx)
+    return lambda: CatalogManager(target).act_catalog("BAJAN_SUN")
+
+
+@case("add_song", repeat=3)
+def _add_song(ctx: BenchContext):
+    manager = ctx.fresh_manager()
+    counter = iter(range(10 ** 6))
+    return lambda: manager.add_song(f"Benchmark Song {next(counter)}", "FROZEN_CLOUD", status="demo")
+
+
+@case("generate_unique_code", repeat=20)
+def _generate_unique_code(ctx: BenchContext):
+    manager = ctx.manager or ctx.fresh_manager()
+    return lambda: manager.generate_unique_code("Golden Summer Night")
+
+
+@case("find_song_by_title", repeat=20)
+def _find_song_by_title(ctx: BenchContext):
+    manager = ctx.manager or ctx.fresh_manager()
+    return lambda: manager.find_song_by_title("No Such Song Title")
+
+
+@case("shortcode_list", repeat=20)
+def _shortcode_list(ctx: BenchContext):
+    manager = ctx.manager or ctx.fresh_manager()
+    return lambda: manager.process_shortcode("> FC List")
+
+
+@case("shortcode_forecast", repeat=20)
+def _shortcode_forecast(ctx: BenchContext):
+    manager = ctx.manager or ctx.fresh_manager()
+    title = manager.catalog["songs"][-1]["title"]
+    return lambda: manager.process_shortcode(f'> Forecast "{title}" 1m')
+
+
+@case("tracks_payload", repeat=10)
+def _tracks_payload(ctx: BenchContext):
+    try:
+        from watch_and_upload import build_tracks_payload
+    except (ImportError, SystemExit):
+        return None
+    manager = ctx.manager or ctx.fresh_manager()
+    return lambda: build_tracks_payload(manager.catalog)
+
+
+@case("model_roundtrip", repeat=10)
+def _model_roundtrip(ctx: BenchContext):
+    catalog = (ctx.manager or ctx.fresh_manager()).catalog
+    return lambda: dump_songs(load_songs(catalog))
+
+
+@case("songs_frame", repeat=5)
+def _songs_frame(ctx: BenchContext):
+    songs = (ctx.manager or ctx.fresh_manager()).catalog["songs"]
+    return lambda: songs_frame(songs)
+
+
+@case("page_all_songs", repeat=10)
+def _page_all_songs(ctx: BenchContext):
+    frame = songs_frame((ctx.manager or ctx.fresh_manager()).catalog["songs"])
+
+    def render():
+        filtered = filter_frame(frame, "All", "released", "night", act_id="FROZEN_CLOUD")
+        page_frame(filtered, 1, 50, "title")
+        page_frame(frame, 3, 50, "artist", descending=True)
+    return render
+
+
+@case("coverage_matrix", repeat=5)
+def _coverage_matrix(ctx: BenchContext):
+    songs = (ctx.manager or ctx.fresh_manager()).catalog["songs"]
+    return lambda: CoverageMatrix.from_songs(songs)
+
+
+@case("page_deployments", repeat=10)
+def _page_deployments(ctx: BenchContext):
+    songs = (ctx.manager or ctx.fresh_manager()).catalog["songs"]
+    frame, coverage = songs_frame(songs), CoverageMatrix.from_songs(songs)
+    publishers = {"FROZEN_CLOUD": "Frozen Cloud Music"}
+
+    def render():
+        for match_all in (False, True):
+            filtered = filter_frame(frame, publishers=["Frozen Cloud Music"], publisher_map=publishers,
+                                    platforms=["Spotify", "DistroKid"], match_all=match_all, coverage=coverage)
+            page_frame(filtered, 1, 50)
+        coverage.coverage()
+        coverage.gap_report(["Spotify", "DistroKid"])
+    return render
+
+
+@case("rights_index", repeat=5)
+def _rights_index(ctx: BenchContext):
+    songs = (ctx.manager or ctx.fresh_manager()).catalog["songs"]
+    return lambda: RightsIndex.from_songs(songs)
+
+
+@case("rights_availability", repeat=10)
+def _rights_availability(ctx: BenchContext):
+    songs = (ctx.manager or ctx.fresh_manager()).catalog["songs"]
+    index, song_ids = RightsIndex.from_songs(songs), [s["song_id"] for s in songs]
+
+    def check():
+        index.availability(song_ids, "UK", "2025-06-01", "2025-12-31")
+        index.availability(song_ids, "Worldwide", "2025-06-01", "2025-12-31", exclusive=True)
+        index.expiring(90, today="2025-06-01")
+    return check
+
+
+@case("royalty_statements", repeat=5)
+def _royalty_statements(ctx: BenchContext):
+    songs = (ctx.manager or ctx.fresh_manager()).catalog["songs"]
+
+    def run():
+        validate_splits(songs)
+        writer_statements(songs, "2025")
+    return run
+
+
+@case("event_query", repeat=10)
+def _event_query(ctx: BenchContext):
+    songs = copy.deepcopy((ctx.manager or ctx.fresh_manager()).catalog["songs"])
+    store = EventStore(ctx.root / "event_bench")
+    store.migrate(songs)
+    song_id = songs[len(songs) // 2]["song_id"]
+
+    def run():
+        store.query("2020-01-01", "2020-03-31", event_types=["placement"])
+        store.for_song(song_id)
+        store.recent(7)
+    return run
+
+
+@case("history_diff", repeat=5)
+def _history_diff(ctx: BenchContext):
+    catalog = copy.deepcopy((ctx.manager or ctx.fresh_manager()).catalog)
+    backups = ctx.root / "history_bench"
+    backups.mkdir(exist_ok=True)
+    songs = catalog["songs"]
+    for n in range(20):  # 20 snapshots, 1% of songs touched between each
+        for song in songs[n::100]:
+            song["status"] = f"rev-{n}"
+        codec.dump_file(backups / f"catalog_backup_20260101_{n:06d}.json", catalog)
+    history = CatalogHistory(backups)
+    history.sync()
+    names = [s["name"] for s in history.snapshots()]
+    song_id = songs[0]["song_id"]
+
+    def run():
+        history.diff(names[0], names[-1])
+        history.field_history(song_id, "status")
+        history.state_at(names[10])
+    return run
+
+
+@case("read_catalog_parse", repeat=5)
+def _read_catalog_parse(ctx: BenchContext):
+    return lambda: codec.read_catalog(ctx.data_dir, snapshot=False)
+
+
+@case("read_catalog_snapshot", repeat=5)
+def _read_catalog_snapshot(ctx: BenchContext):
+    codec.read_catalog(ctx.data_dir)  # writes the snapshot
+    return lambda: codec.read_catalog(ctx.data_dir)
+
+
+def _python(code: str) -> Callable[[], Any]:
+    """A fresh interpreter running code from scripts/ - what a CLI invocation pays."""
+    return lambda: subprocess.run([sys.executable, "-c", code], cwd=SCRIPTS_DIR, check=True, capture_output=True)
+
+
+@case("import_time", repeat=5)
+def _import_time(ctx: BenchContext):
+    return _python("import catalog_manager, watch_and_upload")
+
+
+@case("cold_shortcode", repeat=5)
+def _cold_shortcode(ctx: BenchContext):
+    codec.read_catalog(ctx.data_dir)
+    return _python(f"from catalog_manager import CatalogManager; "
+                   f"CatalogManager({str(ctx.data_dir)!r}).process_shortcode('> FC List')")
+
+
+@case("daemon_shortcode", repeat=20)
+def _daemon_shortcode(ctx: BenchContext):
+    path = ctx.root / "cli.sock"
+    daemon = CatalogDaemon(ctx.manager or ctx.fresh_manager(), path)
+    daemon.bind()
+    threading.Thread(target=daemon.serve, daemon=True).start()  # ends with the benchmark process
+    return lambda: request(path, {"command": "> FC List"})
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def run(sizes: List[int], only: Optional[List[str]] = None, seed: int = 42) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "created": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": seed,
+        "json_codec": codec.BACKEND,
+        "results": {},
+    }
+    for size in sizes:
+        root = Path(tempfile.mkdtemp(prefix=f"ridgemont_bench_{size}_"))
+        try:
+            catalog_path = write_catalog(size, root / "data" / "catalog.json", seed)
+            report["results"][str(size)] = {"catalog_bytes": catalog_path.stat().st_size, "cases": {}}
+            with scratch_dirs(root):
+                ctx = BenchContext(root, size)
+                for name, (factory, repeat) in CASES.items():
+                    if only and name not in only:
+                        continue
+                    with quiet():
+                        fn = factory(ctx)
+                    if fn is None:
+                        report["results"][str(size)]["cases"][name] = {"skipped": True}
+                        continue
+                    result = _timed(fn, repeat)
+                    report["results"][str(size)]["cases"][name] = result
+                    print(f"  {size:>7} songs  {name:<24} median {result['median_ms']:>10.3f} ms")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Median ratio (current / baseline) per size and case; < 1.0 is faster."""
+    deltas: Dict[str, Any] = {}
+    for size, current in report["results"].items():
+        before = baseline.get("results", {}).get(size, {}).get("cases", {})
+        for name, result in current["cases"].items():
+            old = before.get(name, {})
+            if "median_ms" in result and old.get("median_ms"):
+                deltas.setdefault(size, {})[name] = round(result["median_ms"] / old["median_ms"], 3)
+    return deltas
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the catalog hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="run a subset of cases")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compare", type=Path, help="baseline report to compare against")
+    parser.add_argument("--output", type=Path, help="report path (default: benchmarks/benchmark_<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.only, args.seed)
+    if args.compare:
+        with open(args.compare, "r") as f:
+            report["compare"] = {"baseline": str(args.compare), "median_ratio": compare(report, json.load(f))}
+        for size, cases in report["compare"]["median_ratio"].items():
+            for name, ratio in cases.items():
+                print(f"  {size:>7} songs  {name:<24} x{ratio:.3f} vs baseline")
+
+    output = args.output or REPORTS_DIR / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📈 Report: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Command Line
+========================================
+Runs shortcodes from a shell, either in-process or through a daemon that
+keeps a warm CatalogManager between commands.
+
+Usage:
+    python catalog_cli.py '> FC List'
+    python catalog_cli.py '> Pitch "Midnight Rain" "Jane Doe"' '> Cost "Midnight Rain" 150 Mixing'
+    python catalog_cli.py -                      # one shortcode per line from stdin
+    python catalog_cli.py daemon                 # serve on data/.cache/catalog.sock (foreground)
+    python catalog_cli.py status | stop
+    python catalog_cli.py --local '> Activity 7' # never use the daemon
+    python catalog_manager.py '> FC List'        # same thing
+
+Commands go to the daemon when one is listening on the socket and run
+in-process otherwise, so the CLI works the same either way; only latency
+differs. A one-shot run pays interpreter start, imports and the catalog
+load; through the daemon a command costs one socket round trip plus the
+shortcode itself. The daemon re-reads the catalog and the supervisor
+contacts/pitch log before a command when another process saved them since
+(reload_if_changed), and runs commands one at a time, so shortcodes never
+interleave their saves.
+
+Protocol: one JSON object per line over a Unix socket (mode 0600). The
+client only imports the stdlib, so talking to the daemon costs little more
+than starting Python.
+    -> {"command": "> FC List"}        <- {"ok": true, "output": "..."}
+    -> {"op": "status"}                <- {"ok": true, "pid": ..., "songs": ..., "commands": ...}
+    -> {"op": "stop"}                  <- {"ok": true}
+The socket path defaults to data/.cache/catalog.sock; override it with
+--socket or RIDGEMONT_CLI_SOCKET.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import socketserver
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+
+SOCKET_ENV = "RIDGEMONT_CLI_SOCKET"
+SOCKET_NAME = "catalog.sock"
+CONNECT_TIMEOUT = 0.5
+DATA_DIR = Path(__file__).parent.parent / "data"  # catalog_manager.DATA_DIR, without importing it on the client path
+
+
+def default_socket(data_dir: Optional[Path] = None) -> Path:
+    if os.getenv(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    return Path(data_dir or DATA_DIR) / ".cache" / SOCKET_NAME
+
+
+# =============================================================================
+# DAEMON
+# =============================================================================
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = self.server.daemon.handle(json.loads(line))
+            except ValueError as e:
+                reply = {"ok": False, "error": f"bad request: {e}"}
+            self.wfile.write(_encode(reply))
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class CatalogDaemon:
+    """Owns the warm manager; requests are served one at a time under a lock."""
+
+    def __init__(self, manager: Any, path: Path):
+        self.manager = manager
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.commands = 0
+        self.server: Optional[_Server] = None
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            return {"ok": False, "error": f"unknown request: {request!r}"}
+        op = request.get("op", "command")
+        if op == "status":
+            with self.lock:  # a command may be swapping the catalog out mid-reload
+                return {"ok": True, "pid": os.getpid(), "socket": str(self.path), "songs": len(self.manager.catalog["songs"]),
+                        "commands": self.commands, "uptime_s": round(time.time() - self.started, 1)}
+        if op == "stop":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"ok": True}
+        if op != "command" or not isinstance(request.get("command"), str):
+            return {"ok": False, "error": f"unknown request: {request!r}"}
+        with self.lock:
+            self.manager.reload_if_changed()
+            self.commands += 1
+            return run_local(self.manager, request["command"], mode="daemon")
+
+    def bind(self) -> _Server:
+        """Claim the socket; a stale file left by a crashed daemon is replaced, a live daemon is not."""
+        if self.path.exists():
+            if ping(self.path) is not None:
+                raise RuntimeError(f"a daemon is already listening on {self.path}")
+            self.path.unlink()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            self.server = _Server(str(self.path), _Handler)
+        finally:
+            os.umask(old_umask)
+        self.server.daemon = self
+        return self.server
+
+    def serve(self) -> None:
+        server = self.server or self.bind()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if self.path.exists():
+                self.path.unlink()
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+
+def request(path: Path, payload: Dict[str, Any], timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Send one request to the daemon; None when nothing is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout):
+            return None
+        sock.settimeout(timeout)
+        sock.sendall(_encode(payload))
+        with sock.makefile("rb") as f:
+            line = f.readline()
+        return json.loads(line) if line else {"ok": False, "error": "daemon closed the connection"}
+    finally:
+        sock.close()
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def ping(path: Path) -> Optional[Dict[str, Any]]:
+    return request(path, {"op": "status"}, timeout=CONNECT_TIMEOUT * 4)
+
+
+def run_local(manager: Any, command: str, mode: str = "local") -> Dict[str, Any]:
+    from metrics import span, inc
+    with span("cli.command", mode=mode):
+        try:
+            output = manager.process_shortcode(command)
+        except Exception as e:  # a failing shortcode must not take the daemon down
+            inc("cli_commands_total", mode=mode, result="error")
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    inc("cli_commands_total", mode=mode, result="ok")
+    return {"ok": True, "output": output}
+
+
+def run_commands(commands: List[str], path: Path, data_dir: Optional[Path] = None, local: bool = False) -> int:
+    """Run each shortcode via the daemon if it's up, else in-process. Returns the number that failed."""
+    manager, failed = None, 0
+    for command in commands:
+        reply = None if local else request(path, {"command": command})
+        if reply is None:
+            if manager is None:
+                from catalog_manager import CatalogManager
+                manager = CatalogManager(data_dir or DATA_DIR)
+            reply = run_local(manager, command)
+        if reply.get("ok"):
+            print(reply["output"])
+        else:
+            failed += 1
+            print(f"❌ {reply.get('error')}", file=sys.stderr)
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run catalog shortcodes, optionally through a warm daemon.",
+                                     epilog="Commands: daemon, status, stop, '-' (stdin) or any '> ...' shortcode.")
+    parser.add_argument("commands", nargs="*", help="shortcodes such as '> FC List'")
+    parser.add_argument("--socket", type=Path, help=f"daemon socket (default: data/.cache/{SOCKET_NAME} or ${SOCKET_ENV})")
+    parser.add_argument("--data-dir", type=Path, help="catalog data folder (default: data/)")
+    parser.add_argument("--local", action="store_true", help="run in this process even if a daemon is listening")
+    args = parser.parse_args(argv)
+    path = args.socket or default_socket(args.data_dir)
+    word = args.commands[0].lower() if len(args.commands) == 1 else None
+
+    if word == "daemon":
+        from catalog_manager import CatalogManager
+        daemon = CatalogDaemon(None, path)
+        try:
+            daemon.bind()
+        except RuntimeError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        # Everything a shortcode may touch is loaded up front, so the first command is as fast as the rest
+        daemon.manager = CatalogManager(args.data_dir or DATA_DIR, defer=False)
+        print(f"🛰️ Catalog daemon on {path} ({len(daemon.manager.catalog['songs'])} songs, pid {os.getpid()})")
+        try:
+            daemon.serve()
+        except KeyboardInterrupt:
+            pass
+        print("🛰️ Catalog daemon stopped")
+        return
+    if word in ("status", "stop"):
+        reply = request(path, {"op": word})
+        if reply is None:
+            print(f"No daemon on {path}")
+            sys.exit(1)
+        if word == "stop":
+            print(f"🛑 Stopped daemon on {path}")
+        else:
+            print(f"🛰️ pid {reply['pid']} on {reply['socket']}: {reply['songs']} songs, "
+                  f"{reply['commands']} command(s), up {reply['uptime_s']}s")
+        return
+
+    commands = args.commands
+    if commands == ["-"]:
+        commands = [line.strip() for line in sys.stdin if line.strip()]
+    if not commands:
+        parser.print_help()
+        sys.exit(2)
+    if run_commands(commands, path, args.data_dir, args.local):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
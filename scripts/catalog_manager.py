@@ -7,17 +7,28 @@ Date: January 24, 2026
 Updates in v5.2:
 - Pitch Engine: > Pitch "Song" "Supervisor" command.
 - Email Drafter: Auto-generates subject lines and body text based on song mood.
-- Pitch Logging: Automatically records the pitch in supervisors.json.
+- Pitch Logging: Automatically records the pitch in the supervisor pitch log.
 """
 import json
 import os
 import re
 import csv
 import glob
+import time
+import shutil
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from collections import defaultdict
+from supervisor_store import SupervisorStore
+from change_feed import ChangeFeed, change
+from event_store import EventStore, detach_events
+from lazy_catalog import LazyCatalog, SongSummary, sidecars_exist
+from models import STATUSES, new_song
+from codec import dumps, write_bytes, read_catalog, read_shards, write_catalog, export_pretty, catalog_source, store_format as resolve_store_format, SHARD_DIR, UNASSIGNED_SHARD, PARTITIONED_KEYS
+from act_registry import ActRegistry, DEFAULT_ACTS
+import metrics
+from metrics import span, record_file_write
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -31,56 +42,197 @@ EXPORTS_DIR = BASE_DIR / "exports"
 DASHBOARDS_DIR = BASE_DIR / "dashboards"
 BACKUPS_DIR = BASE_DIR / "backups"
 PITCH_DECKS_DIR = BASE_DIR / "pitch_decks"
-ACT_IDS = { "FROZEN_CLOUD": "FROZEN_CLOUD", "FC": "FROZEN_CLOUD", "PARK_BELLEVUE": "PARK_BELLEVUE", "PB": "PARK_BELLEVUE", "BAJAN_SUN": "BAJAN_SUN", "BS": "BAJAN_SUN" }
-DEFAULT_SPLITS = {
-    "FROZEN_CLOUD": [{"writer_id": "W-0001", "percentage": 50}, {"writer_id": "W-0002", "percentage": 50}],
-    "PARK_BELLEVUE": [{"writer_id": "W-0001", "percentage": 50}, {"writer_id": "W-0003", "percentage": 50}],
-    "BAJAN_SUN": [{"writer_id": "W-0001", "percentage": 100}],
-}
+PROJECTIONS_DIR = BASE_DIR / "projections"
+STATEMENTS_DIR = BASE_DIR / "statements"
+# Built-in acts only; acts added in data/acts.json are seen through CatalogManager.act_registry
+ACT_IDS = ActRegistry(DEFAULT_ACTS).aliases()
+DEFAULT_SPLITS = {act["act_id"]: act["default_splits"] for act in DEFAULT_ACTS if act.get("default_splits")}
+DASHBOARD_RETENTION = 10
+BACKUP_RETENTION = 10
+FULL_BACKUP_INTERVAL = 3600  # sharded store: seconds between whole-catalog backups
+def touch(song: Dict) -> None:
+    """Stamp dates.last_modified, which incremental exports (exporter.py --incremental) select on."""
+    song['dates'] = song.get('dates') or {}
+    song['dates']['last_modified'] = datetime.now().isoformat()
+def atomic_write(path: Path, text: str) -> None:
+    """Write text to a temp file next to path, then rename it into place."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f: f.write(text)
+    os.replace(tmp, path)
+def backup_catalog(payload: bytes) -> Path:
+    """Write pretty catalog JSON to backups/catalog_backup_<ts>.json, keeping the newest 10.
+    Shared by CatalogManager and the watcher, so every backup is a whole catalog whatever the store format."""
+    with span("backup_data"):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        BACKUPS_DIR.mkdir(parents=True, exist_ok=True)
+        backup_path = BACKUPS_DIR / f"catalog_backup_{timestamp}.json"
+        write_bytes(backup_path, payload)
+        record_file_write(backup_path, "backup")
+        print(f"📦 Backup created: {backup_path.name}")
+        backups = sorted(glob.glob(str(BACKUPS_DIR / "catalog_backup_*.json")))
+        if len(backups) > BACKUP_RETENTION:  # index snapshots before they rotate out
+            from history import CatalogHistory
+            history = CatalogHistory(BACKUPS_DIR)
+            if history.exists():
+                try: history.sync()
+                except Exception as e: print(f"⚠️ History index not updated: {e}")
+        while len(backups) > BACKUP_RETENTION: os.remove(backups.pop(0))
+        return backup_path
+def full_backup_due() -> bool:
+    """True when no whole-catalog backup was taken in the last FULL_BACKUP_INTERVAL seconds."""
+    backups = glob.glob(str(BACKUPS_DIR / "catalog_backup_*.json"))
+    return not backups or time.time() - max(os.path.getmtime(b) for b in backups) > FULL_BACKUP_INTERVAL
+def rotate_shard_backups() -> None:
+    """Keep the newest 10 backups/shards/<ts>/ folders (shards a sharded save replaced, plus the old index)."""
+    folder = BACKUPS_DIR / SHARD_DIR
+    snapshots = sorted(p for p in folder.iterdir() if p.is_dir()) if folder.exists() else []
+    while len(snapshots) > BACKUP_RETENTION: shutil.rmtree(snapshots.pop(0), ignore_errors=True)
 # ============================================================================
 # CATALOG MANAGER CLASS
 # ============================================================================
+DATA_FILES = ("writers", "integrations")
 class CatalogManager:
-    def __init__(self, data_dir: Path = DATA_DIR):
+    def __init__(self, data_dir: Path = DATA_DIR, lazy: bool = False, store_format: str = None, defer: bool = True):
+        """lazy=True loads only per-song summaries at startup; the full catalog is parsed on first use of .catalog.
+        defer=True (default) reads nothing at all until the catalog, a data file or the supervisors are first used.
+        store_format: json (pretty catalog.json), compact, msgpack or sharded (per act); defaults to RIDGEMONT_STORE_FORMAT."""
         self.data_dir = Path(data_dir)
-        self.catalog = {"songs": []}
-        self.supervisors = {"supervisors": []}
-        BACKUPS_DIR.mkdir(parents=True, exist_ok=True)
-        PITCH_DECKS_DIR.mkdir(parents=True, exist_ok=True)
-        self._load_data()
-    def _load_data(self):
-        files = ["catalog.json", "writers.json", "acts.json", "supervisors.json", "integrations.json"]
-        for filename in files:
-            p = self.data_dir / filename
+        self.store_format = store_format
+        self._catalog = None
+        self._loaded_signature = None
+        self.lazy_catalog: Optional[LazyCatalog] = None
+        self.changes = ChangeFeed(self.data_dir)
+        self.events = EventStore(self.data_dir)
+        self._pending_changes: List[Dict] = []
+        self._coverage = self._rights = None
+        self._supervisor_store: Optional[SupervisorStore] = None
+        self._act_registry: Optional[ActRegistry] = None
+        if lazy or not defer: self._load_data(lazy=lazy)
+    @property
+    def catalog(self) -> Dict:
+        if self._catalog is None:
+            with span("load_catalog"):
+                self._loaded_signature = self.catalog_signature()
+                self._catalog = read_catalog(self.data_dir)
+        return self._catalog
+    @catalog.setter
+    def catalog(self, value: Dict):
+        self._catalog = value
+        self._coverage = self._rights = None
+    def __getattr__(self, name: str):
+        """writers / acts / integrations: data/<name>.json, read on first access (AttributeError if the file is absent)."""
+        if name in DATA_FILES and "data_dir" in self.__dict__:
+            p = self.data_dir / f"{name}.json"
             if p.exists():
-                attr = filename.replace(".json", "")
-                if attr == "catalog": attr = "catalog"
-                with open(p, 'r') as f: setattr(self, attr, json.load(f))
-        if not hasattr(self, 'catalog'): self.catalog = {"songs": []}
-        if not hasattr(self, 'supervisors'): self.supervisors = {"supervisors": []}
-    def _backup_data(self):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = BACKUPS_DIR / f"catalog_backup_{timestamp}.json"
-        with open(backup_path, 'w') as f: json.dump(self.catalog, f, indent=2, default=str)
-        print(f"📦 Backup created: {backup_path.name}")
-        backups = sorted(glob.glob(str(BACKUPS_DIR / "catalog_backup_*.json")))
-        while len(backups) > 10: os.remove(backups.pop(0))
-        return str(backup_path)
+                with open(p, 'r') as f: setattr(self, name, json.load(f))
+                return self.__dict__[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+    @property
+    def supervisor_store(self) -> SupervisorStore:
+        if self._supervisor_store is None: self._supervisor_store = SupervisorStore(self.data_dir)
+        return self._supervisor_store
+    @property
+    def supervisors(self) -> Dict:
+        return self.supervisor_store.document
+    @property
+    def act_registry(self) -> ActRegistry:
+        """Registered acts (data/acts.json, else the built-ins): aliases, publishers, default splits."""
+        if self._act_registry is None: self._act_registry = ActRegistry.load(self.data_dir)
+        return self._act_registry
+    def act_catalog(self, act_id: str) -> Dict:
+        """One act's songs and albums plus the shared keys (read-only view). With the sharded store and
+        nothing loaded yet, only that act's shard is read."""
+        act_id = self.act_registry.resolve(act_id) or act_id.upper()
+        if self._catalog is None and self.lazy_catalog is None and catalog_source(self.data_dir).parent.name == SHARD_DIR:
+            with span("load_act") as s: s.set(act_id=act_id); return read_shards(self.data_dir, [act_id])
+        return {k: [x for x in v if isinstance(x, dict) and x.get("act_id") == act_id] if k in PARTITIONED_KEYS and isinstance(v, list) else v
+                for k, v in self.catalog.items()}
+    def _load_data(self, lazy: bool = False):
+        """Eager load (defer=False / lazy=True): the catalog or its summaries, the data files and the supervisors."""
+        with span("load_data", lazy=lazy):
+            self._loaded_signature = self.catalog_signature()
+            if lazy and catalog_source(self.data_dir).exists():
+                self.lazy_catalog = LazyCatalog(self.data_dir)
+                self._catalog = None
+            else:
+                self._catalog = read_catalog(self.data_dir)
+            for name in DATA_FILES: getattr(self, name, None)
+            self.supervisor_store
+            self.act_registry
+    def reload_if_changed(self) -> bool:
+        """Re-read the catalog and supervisor contacts if another process (watcher, app, CLI) rewrote them since we
+        loaded or saved them. Returns True when the catalog was re-read (the event store checks its own index)."""
+        if self._supervisor_store is not None: self._supervisor_store.reload_if_changed()
+        if self._catalog is None and self.lazy_catalog is None: return False  # nothing read yet
+        signature = self.catalog_signature()
+        if signature == self._loaded_signature: return False
+        with span("reload_catalog"):
+            if self.lazy_catalog is not None and self._catalog is None: self.lazy_catalog.load()
+            else: self._catalog = read_catalog(self.data_dir)
+        self._coverage = self._rights = None
+        self._loaded_signature = signature
+        return True
+    def _backup_data(self, payload: bytes = None):
+        return str(backup_catalog(payload if payload is not None else dumps(self.catalog, pretty=True)))
+    def catalog_history(self):
+        """Song-level history over backups/ (see history.py)."""
+        from history import CatalogHistory
+        return CatalogHistory(BACKUPS_DIR)
     def save_data(self):
-        try: self._backup_data()
-        except: pass
-        data_map = {"catalog.json": self.catalog, "supervisors.json": self.supervisors}
-        for filename, data in data_map.items():
-            with open(self.data_dir / filename, 'w') as f: json.dump(data, f, indent=2, default=str)
+        with span("save_data"):
+            fmt, acts, pretty, shard_backup = resolve_store_format(self.store_format), self._dirty_acts(), None, None
+            if fmt == "sharded" and acts is not None and not full_backup_due():
+                # Between whole-catalog backups a tracked sharded save only keeps the shards it replaces
+                shard_backup = BACKUPS_DIR / SHARD_DIR / datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            else:
+                pretty = dumps(self.catalog, pretty=True)  # encoded once: backup + json store
+                try: self._backup_data(pretty)
+                except: pass
+            record_file_write(write_catalog(self.data_dir, self.catalog, fmt, payload=pretty if fmt == "json" else None, acts=acts, backup_dir=shard_backup))
+            if shard_backup is not None: rotate_shard_backups()
+            self._loaded_signature = self.catalog_signature()
+            self._refresh_lazy_sidecars()
+            if self._supervisor_store is not None: self._supervisor_store.save_contacts()
+            self._publish_changes()
+        metrics.flush()
         print(f"✅ Data saved to {self.data_dir}")
+    def _refresh_lazy_sidecars(self):
+        """Keep the summary/detail sidecars current once anyone has created them."""
+        if self.lazy_catalog is None:
+            if not sidecars_exist(self.data_dir): return
+            self.lazy_catalog = LazyCatalog(self.data_dir, autoload=False)
+        with span("refresh_lazy_sidecars"): self.lazy_catalog.refresh(self.catalog)
+    def _track_change(self, entity: str, op: str, entity_id: str, **kwargs):
+        """Queue a change for the feed; it is published once the change is on disk."""
+        self._pending_changes.append(change(entity, op, entity_id, **kwargs))
+    def _dirty_acts(self) -> Optional[set]:
+        """Acts touched by the pending changes (their shards are the ones to rewrite); None when nothing was tracked."""
+        records = [c for c in self._pending_changes if c["entity"] in ("song", "album", "license")]
+        if not records: return None
+        return {c.get("act_id") or UNASSIGNED_SHARD for c in records} | {c["from_act_id"] for c in records if c.get("from_act_id")}
+    def _publish_changes(self):
+        pending, self._pending_changes = self._pending_changes, []
+        self.changes.append_many(pending)
+    def save_supervisors(self):
+        """Persist supervisor contacts if they changed (pitches go to the append-only log)."""
+        self.supervisor_store.save_contacts()
+        self._publish_changes()
     # ========================================================================
     # PHASE 5C: THE PITCH ENGINE (Shortcodes)
     # ========================================================================
     def process_shortcode(self, command: str) -> str:
         """
         > Pitch "Song" "Supervisor"
+        > Campaign "Song A, Song B" "Supervisor 1, Supervisor 2"
         > Cost "Song" 150 Category
         > Forecast "Song" 1m
+        > Export csv distrokid
+        > Export json              (pretty catalog.json from the working store)
+        > Dashboard [full]
+        > Portals [full]
+        > Royalties 2026Q1         (writer statements; "> Royalties check" validates splits)
+        > Activity [days]          (event feed, default 7 days)
         """
         parts = [p.strip() for p in re.split(r'\s+', command.strip()) if p.strip()]
         if not parts or parts[0] != '>': return "Invalid command."
@@ -92,6 +244,14 @@ class CatalogManager:
             if not match: return "Format: > Pitch \"Song Title\" \"Supervisor Name\""
             title, supervisor_name = match.groups()
             return self.execute_pitch_shortcode(title, supervisor_name)
+        # > CAMPAIGN "Song A, Song B" "Sup 1, Sup 2"   ("*" = every known supervisor)
+        if cmd == "campaign":
+            match = re.search(r'Campaign "(.*?)" "(.*?)"', command, re.IGNORECASE)
+            if not match: return "Format: > Campaign \"Song A, Song B\" \"Supervisor 1, Supervisor 2\""
+            titles = [t.strip() for t in match.group(1).split(",") if t.strip()]
+            names = [s["name"] for s in self.supervisors["supervisors"]] if match.group(2).strip() == "*" else match.group(2).split(",")
+            from pitch_campaign import format_campaign_summary
+            return format_campaign_summary(self.run_pitch_campaign(titles, names))
         # > COST / FORECAST / NEW / LIST (Preserved from v5.1)
         if cmd == "forecast":
             match = re.search(r'Forecast "(.*?)" ([\d\.]+[km]?)', command, re.IGNORECASE)
@@ -103,9 +263,35 @@ class CatalogManager:
             return self.add_expense_shortcode(match.group(1), float(match.group(2)), match.group(3))
         if cmd == "sync": return "Excel Sync Stub Executed."
         if cmd == "backup": return f"Backup: {self._backup_data()}"
+        if cmd == "dashboard":
+            result = self.build_dashboard_site(full=len(parts) > 2 and parts[2].lower() == "full")
+            return f"📊 Dashboard rebuilt: {len(result['pages_written'])} page(s) in {result['elapsed_ms']} ms → {result['site_dir']}"
+        if cmd == "portals":
+            result = self.build_portal_projections(full=len(parts) > 2 and parts[2].lower() == "full")
+            return f"🌐 Portal projections: {len(result['written'])} written, {len(result['unchanged'])} unchanged, {len(result['skipped'])} skipped → {result['out_dir']}"
+        if cmd == "activity":
+            days = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 7
+            feed = self.events.recent(days, limit=50)
+            if not feed: return f"No activity in the last {days} day(s)."
+            return "\n".join([f"📜 **Activity, last {days} day(s):**"] + [f"- {e.get('timestamp', '')[:16].replace('T', ' ')} {e.get('song_id', '')} {e.get('event_type', '')}: {e.get('description', '')}" for e in feed])
+        if cmd == "royalties":
+            if len(parts) < 3: return "Format: > Royalties 2026Q1   (or: > Royalties check)"
+            if parts[2].lower() == "check":
+                report = self.validate_writer_splits()
+                if not len(report): return "✅ All writer splits add up to 100%."
+                return f"⚠️ {len(report)} song(s) need split fixes:\n" + "\n".join(f"- {r.song_id} {r.title}: {r.issue}" for r in report.itertuples(index=False))
+            try: result = self.royalty_statements(parts[2])
+            except ValueError as e: return f"❌ Error: {e}"
+            return f"💵 Royalties {result['period']}: ${result['gross']:,.2f} gross, {len(result['statements'])} writer statement(s) → {result['out_dir']}"
+        if cmd == "export":
+            fmt = parts[2].lower() if len(parts) > 2 else "csv"
+            template = parts[3].lower() if len(parts) > 3 else "catalog"
+            if fmt == "json": return f"📤 Catalog written → {self.export_catalog_json()}"
+            try: result = self.export_catalog(fmt, template=template)
+            except (ValueError, RuntimeError) as e: return f"❌ Error: {e}"
+            return f"📤 Exported {result['rows']} songs → {result['path']}"
         # > FC New / List
-        act_key = parts[1].upper()
-        act_id = ACT_IDS.get(act_key)
+        act_id = self.act_registry.resolve(parts[1])
         if not act_id: return f"Unknown Act: {parts[1]}"
         action = parts[2].lower()
 
@@ -127,7 +313,7 @@ class CatalogManager:
                 if len(part_clean) == 4 and part_clean.isupper() and part_clean.isalpha():
                     legacy_code = part_clean
                 # Check if it's a status
-                elif part_clean.lower() in ["idea", "demo", "mixing", "mastered", "copyright", "released"]:
+                elif part_clean.lower() in STATUSES:
                     status = part_clean.lower()
 
             result = self.add_song(title, act_id, status=status, legacy_code=legacy_code)
@@ -150,23 +336,16 @@ class CatalogManager:
         # 1. Find Song
         song = self.find_song_by_title(song_title)
         if not song: return f"Error: Song '{song_title}' not found."
+        blocking = self.rights_index().exclusively_licensed(song["song_id"])
+        if blocking:
+            until = max((l.get("end_date") or "open-ended") for l in blocking)
+            return f"⛔ '{song['title']}' is exclusively licensed to {', '.join(sorted({l.get('licensee', '?') for l in blocking}))} (until {until}). Not pitched."
         # 2. Find/Create Supervisor
-        supervisor = next((s for s in self.supervisors["supervisors"] if s["name"].lower() == supervisor_name.lower()), None)
-        if not supervisor:
-            supervisor = {"id": f"SUP-{datetime.now().strftime('%M%S')}", "name": supervisor_name, "email": "TBD", "history": []}
-            self.supervisors["supervisors"].append(supervisor)
-            new_sup_msg = "(New Contact Created)"
-        else:
-            new_sup_msg = ""
+        supervisor, is_new = self.get_or_create_supervisor(supervisor_name)
+        new_sup_msg = "(New Contact Created)" if is_new else ""
         # 3. Log Pitch
-        pitch_entry = {
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "song": song["title"],
-            "project": "General Pitch"
-        }
-        if "history" not in supervisor: supervisor["history"] = []
-        supervisor["history"].append(pitch_entry)
-        self.save_data()
+        self.supervisor_store.log_pitch(supervisor["id"], song)
+        self.save_supervisors()
         # 4. Generate HTML Page
         html_path = self.generate_pitch_html(song, supervisor)
         # 5. Draft Email
@@ -193,25 +372,26 @@ class CatalogManager:
             f"✅ **Logged:** Added to supervisor history."
         )
     def generate_pitch_html(self, song: Dict, supervisor: Dict) -> str:
-        filename = f"pitch_{song['song_id']}_{supervisor['name'].replace(' ', '')}.html"
-        path = PITCH_DECKS_DIR / filename
-        html = f"""<html><body style="font-family:sans-serif; padding:40px; background:#f4f4f4;">
-        <div style="max-width:600px; margin:auto; background:white; padding:30px; border-radius:10px; box-shadow:0 2px 10px rgba(0,0,0,0.1);">
-            <h1 style="color:#333;">{song['title']}</h1>
-            <p style="color:#666;">Prepared exclusively for <strong>{supervisor['name']}</strong></p>
-            <hr>
-            <p><strong>Artist:</strong> {song['act_id'].replace('_', ' ')}</p>
-            <p><strong>BPM:</strong> {song.get('musical_info', {}).get('bpm', 'N/A')}</p>
-            <p><strong>Moods:</strong> {', '.join(song.get('sync_metadata', {}).get('moods', []))}</p>
-            <div style="background:#e8f0fe; padding:15px; border-radius:5px; margin-top:20px;">
-                <strong>✅ Sync Status:</strong> One-Stop | Mastered | Stems Available
-            </div>
-            <p style="margin-top:30px; font-size:12px; color:#999;">&copy; 2026 Ridgemont Studio</p>
-        </div></body></html>"""
-        with open(path, 'w') as f: f.write(html)
+        from pitch_campaign import pitch_deck_filename, render_pitch_html, deck_uri
+        filename = pitch_deck_filename(song, supervisor)
+        PITCH_DECKS_DIR.mkdir(parents=True, exist_ok=True)
+        with open(PITCH_DECKS_DIR / filename, 'w') as f: f.write(render_pitch_html(song, supervisor))
         # FIX: Return user's Mac path for clickable links
-        user_path = USER_MAC_ROOT / "pitch_decks" / filename
-        return user_path.as_uri()
+        return deck_uri(filename)
+    def run_pitch_campaign(self, song_titles: List[str], supervisor_names: List[str], project: str = "General Pitch") -> Dict:
+        """Pitch a shortlist of songs to many supervisors: batch render + one history write."""
+        from pitch_campaign import run_campaign
+        return run_campaign(self, song_titles, supervisor_names, project=project)
+    def get_or_create_supervisor(self, name: str):
+        """Returns (supervisor, created). Accepts a name or an email address."""
+        if "@" in name:
+            found = self.supervisor_store.find_by_email(name)
+            if found: return found, False
+            supervisor, created = self.supervisor_store.get_or_create(name.split("@")[0], email=name.strip())
+        else:
+            supervisor, created = self.supervisor_store.get_or_create(name)
+        if created: self._track_change("supervisor", "create", supervisor["id"], data=dict(supervisor))
+        return supervisor, created
     def generate_dashboard_html(self, output_path: str = None, include_charts: bool = True) -> str:
         if output_path is None:
             DASHBOARDS_DIR.mkdir(parents=True, exist_ok=True)
@@ -228,18 +408,55 @@ class CatalogManager:
         <p style="color:#666">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>
         </body></html>"""
 
-        with open(output_path, 'w') as f: f.write(html)
+        atomic_write(output_path, html)
+        snapshots = sorted(glob.glob(str(DASHBOARDS_DIR / "dashboard_*.html")))
+        while len(snapshots) > DASHBOARD_RETENTION: os.remove(snapshots.pop(0))
         # FIX: Return user's Mac path for clickable links
         filename = Path(output_path).name
         user_path = USER_MAC_ROOT / "dashboards" / filename
         return user_path.as_uri()
+    def export_catalog(self, fmt: str = "csv", template: str = "catalog", act: str = None, status: str = None, deployment: str = None, incremental: bool = False) -> Dict:
+        """Stream songs into exports/ as CSV (per-platform template), JSONL or Parquet."""
+        from exporter import export_songs
+        if act: act = self.act_registry.resolve(act) or act.upper()
+        songs = self.act_catalog(act)["songs"] if act else self.catalog["songs"]
+        return export_songs(songs, fmt=fmt, template=template, act=act, status=status, deployment=deployment, incremental=incremental)
+    def build_dashboard_site(self, full: bool = False) -> Dict:
+        """Incrementally rebuild dashboards/site/ from cached per-act/status/revenue fragments."""
+        from dashboard_builder import DashboardSiteBuilder
+        return DashboardSiteBuilder().build(self.catalog.get("songs", []), full=full, version=self.catalog_signature())
+    def export_catalog_json(self) -> str:
+        """Write a pretty data/catalog.json (for humans and git diffs) when saves go to a compact/binary store."""
+        path = export_pretty(self.data_dir, self.catalog, self.store_format)
+        record_file_write(path)
+        return str(path)
+    def build_portal_projections(self, full: bool = False, acts: List[str] = None) -> Dict:
+        """Rebuild projections/<ACT>.json for the portals; only acts changed since the last run."""
+        from projections import ProjectionBuilder
+        return ProjectionBuilder(PROJECTIONS_DIR, self.changes).build(self.catalog, acts=acts, full=full, signature=self.catalog_signature())
+    def catalog_signature(self) -> Optional[str]:
+        """Cheap version token for the current catalog file (mtime + size); None if it doesn't exist."""
+        p = catalog_source(self.data_dir)
+        if not p.exists(): return None
+        st = p.stat()
+        return f"{st.st_mtime_ns}-{st.st_size}"
+    def song_summaries(self) -> List[SongSummary]:
+        """Compact id/title/artist/act/status/code records, without touching heavy sub-documents in lazy mode."""
+        if self._catalog is None and self.lazy_catalog is not None: return self.lazy_catalog.summaries
+        return [SongSummary.from_song(s) for s in self.catalog.get("songs", [])]
+    def get_song_details(self, song_id: str) -> Optional[Dict]:
+        """Full song document (events, licenses, expenses, checklist), read on demand in lazy mode."""
+        if self._catalog is None and self.lazy_catalog is not None: return self.lazy_catalog.get(song_id)
+        for s in self.catalog.get("songs", []):
+            if s.get("song_id") == song_id: return s
+        return None
     def get_catalog_summary(self) -> Dict:
-        songs = self.catalog.get("songs", [])
+        songs = self.song_summaries()
         by_act = {}
         by_status = {}
         for s in songs:
-            act = s.get('act_id', 'Unknown')
-            status = s.get('status', 'unknown')
+            act = s.act_id or 'Unknown'
+            status = s.status or 'unknown'
             by_act[act] = by_act.get(act, 0) + 1
             by_status[status] = by_status.get(status, 0) + 1
         return {"total_songs": len(songs), "by_act": by_act, "by_status": by_status}
@@ -328,46 +545,44 @@ class CatalogManager:
             if not legacy_code:
                 return f"❌ Error: Could not generate unique code for '{title}'"
 
-        writers = DEFAULT_SPLITS.get(act_id, DEFAULT_SPLITS["FROZEN_CLOUD"])
+        writers = self.act_registry.default_splits(act_id)
         year = str(datetime.now().year)
         count = sum(1 for s in self.catalog["songs"] if s["song_id"].startswith(f"RS-{year}"))
         song_id = f"RS-{year}-{count + 1:04d}"
         # Determine artist name (default to act name if not provided)
-        if not artist:
-            artist_map = {
-                "FROZEN_CLOUD": "Frozen Cloud",
-                "PARK_BELLEVUE": "Park Bellevue",
-                "BAJAN_SUN": "Bajan Sun"
-            }
-            artist = artist_map.get(act_id, "Unknown")
+        if not artist: artist = self.act_registry.name(act_id)
 
-        song = {
-            "song_id": song_id,
-            "title": title,
-            "artist": artist,
-            "act_id": act_id,
-            "writers": writers,
-            "status": status,
-            "legacy_code": legacy_code or "",
-            "deployments": deployments or {
-                "distribution": [],      # e.g., DistroKid, TuneCore, CD Baby
-                "sync_libraries": [],    # e.g., Songtradr, Music Gateway, Pond5
-                "streaming": []          # e.g., Spotify, Apple Music, Amazon
-            },
-            "revenue": {"expenses": [], "total_earned": 0},
-            "dates": {"created": datetime.now().strftime("%Y-%m-%d")}
-        }
+        song = new_song(song_id, title, act_id, artist, status=status, legacy_code=legacy_code, writers=writers,
+                        deployments=deployments, created_by="Catalog Manager", description="Added via Catalog Manager").to_dict()
         # Add cover info if applicable
         if is_cover and cover_of:
             song["is_cover"] = True
             song["cover_of"] = cover_of
+        events = detach_events(song)  # history lives in the event store, not the catalog
         self.catalog["songs"].append(song)
+        if self._coverage is not None: self._coverage.add_song(song)
+        self._track_change("song", "create", song_id, act_id=act_id, data=song)
         self.save_data()
+        self.events.append_many(events)
         return song
+    def update_song_links(self, links_by_song: Dict[str, Dict]) -> int:
+        """Merge new links (renditions, ...) into many songs with one save. Returns songs updated."""
+        updated = 0
+        for song in self.catalog['songs']:
+            links = links_by_song.get(song['song_id'])
+            if not links: continue
+            song.setdefault('links', {}).update(links)
+            touch(song)
+            self._track_change("song", "update", song['song_id'], act_id=song.get('act_id'), fields=["links"], data={"links": song['links']})
+            updated += 1
+        if updated: self.save_data()
+        return updated
     def update_song(self, song_id: str, updates: dict) -> bool:
         """Updates an existing song's details (status, deployments, ISRC, ISWC, etc.)."""
         for song in self.catalog['songs']:
             if song['song_id'] == song_id:
+                fields = sorted(set(updates) | {'dates'})
+                old_status, old_act = song.get('status'), song.get('act_id')
                 # Handle nested updates for registration info (ISRC, ISWC, etc.)
                 if 'registration' in updates:
                     if 'registration' not in song:
@@ -384,13 +599,64 @@ class CatalogManager:
                 song.update(updates)
 
                 # Update timestamp
-                if 'dates' not in song:
-                    song['dates'] = {}
-                song['dates']['last_modified'] = datetime.now().isoformat()
+                touch(song)
+                if self._coverage is not None: self._coverage.update_song(song)
+                if 'rights' in fields: self._rights = None  # licenses may have been replaced
 
+                self._track_change("song", "update", song_id, act_id=song.get('act_id'), from_act_id=old_act, fields=fields, data={f: song.get(f) for f in fields})
                 self.save_data()
+                if song.get('status') != old_status:
+                    self.log_event(song_id, "status_change", f"{old_status} → {song.get('status')}", act_id=song.get('act_id'))
                 return True
         return False
+    def coverage_matrix(self):
+        """Song x platform bitsets (coverage_matrix.CoverageMatrix), built on first use and kept current by add_song/update_song."""
+        if self._coverage is None:
+            from coverage_matrix import CoverageMatrix
+            with span("build_coverage_matrix"): self._coverage = CoverageMatrix.from_songs(self.catalog["songs"])
+        return self._coverage
+    def add_album(self, album: Dict) -> Dict:
+        """Append an album record and save."""
+        self.catalog.setdefault("albums", []).append(album)
+        self._track_change("album", "create", album.get("album_id"), act_id=album.get("act_id"), data=album)
+        self.save_data()
+        return album
+    def rights_index(self):
+        """License interval index (rights_engine.RightsIndex), built on first use and kept current by add_license."""
+        if self._rights is None:
+            from rights_engine import RightsIndex
+            with span("build_rights_index"): self._rights = RightsIndex.from_songs(self.catalog["songs"])
+        return self._rights
+    def add_license(self, song_id: str, license: Dict, check: bool = True) -> Optional[Dict]:
+        """Attach a license (sync, mechanical, ...) to a song's rights and save.
+        Raises rights_engine.LicenseConflict if it overlaps an exclusive deal (or, when exclusive, any deal); check=False skips that."""
+        song = next((s for s in self.catalog["songs"] if s.get("song_id") == song_id), None)
+        if song is None: return None
+        if check:
+            from rights_engine import LicenseConflict
+            conflicts = self.rights_index().check_license(song_id, license)
+            if conflicts: raise LicenseConflict(song_id, conflicts)
+        license = {"license_id": f"LIC-{datetime.now().strftime('%Y%m%d%H%M%S%f')}", "created": datetime.now().isoformat(), **license}
+        song.setdefault("rights", {}).setdefault("licenses", []).append(license)
+        touch(song)
+        if self._rights is not None: self._rights.add_license(song_id, license)
+        self._track_change("license", "create", license["license_id"], act_id=song.get("act_id"), data={"song_id": song_id, **license})
+        self.save_data()
+        self.log_event(song_id, "license_added", f"{license.get('type', 'sync')} license to {license.get('licensee', '?')} ({license.get('territory', 'Worldwide')})", act_id=song.get("act_id"))
+        return license
+    def log_event(self, song_id: str, event_type: str, description: str = "", user: str = "Catalog Manager", act_id: str = None) -> Dict:
+        """Append one history event (placement, pitched, status_change, ...) to the event store."""
+        return self.events.append(song_id, event_type, description, user=user, act_id=act_id)
+    def song_events(self, song_id: str) -> List[Dict]:
+        """A song's full history: the event store plus any events still embedded in the catalog."""
+        song = self.get_song_details(song_id) or {}
+        embedded = [dict(e, song_id=song_id) for e in song.get("events") or []]
+        return sorted(embedded + self.events.for_song(song_id), key=lambda e: e.get("timestamp") or "")
+    def migrate_events(self) -> Dict:
+        """Move every song's embedded events into the event store and save the slimmer catalog."""
+        result = self.events.migrate(self.catalog["songs"])
+        if result["songs"]: self.save_data()
+        return result
 
     def add_expense_shortcode(self, title: str, amount: float, category: str) -> str:
         song = self.find_song_by_title(title)
@@ -398,8 +664,21 @@ class CatalogManager:
         if "revenue" not in song: song["revenue"] = {}
         if "expenses" not in song["revenue"]: song["revenue"]["expenses"] = []
         song["revenue"]["expenses"].append({"date": datetime.now().strftime("%Y-%m-%d"), "amount": amount, "category": category})
+        touch(song)
+        self._track_change("song", "update", song["song_id"], act_id=song.get("act_id"), fields=["revenue"], data={"revenue": song["revenue"]})
         self.save_data()
         return f"💸 Logged ${amount} for {title}."
+    def validate_writer_splits(self):
+        """DataFrame of songs whose writer splits are missing, malformed or don't total 100%."""
+        from royalties import validate_splits
+        with span("validate_splits"): return validate_splits(self.catalog["songs"])
+    def royalty_statements(self, period: str, write: bool = True) -> Dict:
+        """Per-writer payout statements for '2026Q1', '2026-05' or '2026'; written to statements/<period>/."""
+        from royalties import writer_statements, write_statements, writer_names_from
+        with span("royalty_statements"):
+            result = writer_statements(self.catalog["songs"], period, writer_names_from(self))
+            if write: result["out_dir"] = str(write_statements(result, STATEMENTS_DIR)[-1].parent)
+        return result
     def simulate_royalties(self, title: str, amount_str: str) -> str:
         song = self.find_song_by_title(title)
         if not song: return "Song not found."
@@ -412,4 +691,5 @@ class CatalogManager:
         rows = [f"| {s['title']} | {s['status']} |" for s in songs]
         return "\n".join(["| Title | Status |", "|---|---|"] + rows)
 if __name__ == "__main__":
-    print("Ridgemont Catalog Manager v5.2 Loaded")
+    from catalog_cli import main
+    main()
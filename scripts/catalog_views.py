@@ -0,0 +1,160 @@
+"""
+Ridgemont Catalog Manager - Page Views
+======================================
+Pure filtering/aggregation helpers behind the Streamlit pages, kept free of
+Streamlit so they can be reused and benchmarked outside the app.
+"""
+
+from typing import Dict, List, Any, Iterable
+
+from models import STATUSES, DEPLOYMENT_KEYS, normalize_status
+
+
+STATUS_OPTIONS = list(STATUSES)
+
+
+def filter_songs(songs: List[Dict[str, Any]], artist: str = "All", status: str = "All", search: str = "") -> List[Dict[str, Any]]:
+    """All Songs page: artist, status and title/code search filters."""
+    filtered = songs
+    if artist != "All":
+        filtered = [s for s in filtered if s.get('artist') == artist]
+    if status != "All":
+        filtered = [s for s in filtered if normalize_status(s.get('status')) == status]
+    if search:
+        search_lower = search.lower()
+        filtered = [s for s in filtered if search_lower in s.get('title', '').lower() or search_lower in s.get('legacy_code', '').lower()]
+    return filtered
+
+
+def songs_for_act(songs: Iterable[Dict[str, Any]], act_id: str) -> List[Dict[str, Any]]:
+    return [s for s in songs if s.get('act_id') == act_id]
+
+
+def artist_options(songs: Iterable[Dict[str, Any]], primary: List[str]) -> List[str]:
+    """Primary artists first, then every other artist found in the catalog."""
+    options = ["All"] + list(primary)
+    options.extend(sorted(set(s.get('artist', '') for s in songs if s.get('artist') and s.get('artist') not in options)))
+    return options
+
+
+def song_platforms(song: Dict[str, Any]) -> List[str]:
+    deps = song.get('deployments', {}) or {}
+    return [p for key in DEPLOYMENT_KEYS for p in deps.get(key, []) or []]
+
+
+def filter_by_publishers(songs: List[Dict[str, Any]], publishers: List[str], publisher_map: Dict[str, str]) -> List[Dict[str, Any]]:
+    """View Deployments page: keep songs whose act maps to a selected publisher."""
+    if not publishers:
+        return songs
+    return [s for s in songs if publisher_map.get(s.get('act_id', ''), 'Unknown') in publishers]
+
+
+def filter_by_platforms(songs: List[Dict[str, Any]], platforms: List[str], match_all: bool = False) -> List[Dict[str, Any]]:
+    """View Deployments page: songs on any (OR) or all (AND) of the platforms."""
+    if not platforms:
+        return songs
+    test = all if match_all else any
+    filtered = []
+    for s in songs:
+        on = song_platforms(s)
+        if test(p in on for p in platforms):
+            filtered.append(s)
+    return filtered
+
+
+def platform_counts(songs: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Songs per platform across every deployment list."""
+    counts: Dict[str, int] = {}
+    for s in songs:
+        for p in song_platforms(s):
+            counts[p] = counts.get(p, 0) + 1
+    return counts
+
+
+# =============================================================================
+# TABLE FRAMES (paginated song tables)
+# =============================================================================
+
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = 50
+SORT_OPTIONS = {"Catalog order": None, "Title": "title", "Artist": "artist", "Status": "status", "Song ID": "song_id", "Code": "legacy_code"}
+TABLE_FIELDS = ("song_id", "legacy_code", "title", "artist", "act_id", "status", "copyright_number")
+
+
+def songs_frame(songs: List[Dict[str, Any]]):
+    """One row per song: display columns, deployment lists and precomputed filter/sort keys.
+
+    Built once per catalog version (the app caches it); filter_frame and
+    page_frame then only do vectorised work on it. Row index = catalog position.
+    """
+    import pandas as pd
+
+    columns: Dict[str, List[Any]] = {c: [] for c in TABLE_FIELDS + DEPLOYMENT_KEYS}
+    platforms, search, status_key = [], [], []
+    for s in songs:
+        deps = s.get('deployments', {}) or {}
+        for c in TABLE_FIELDS:
+            columns[c].append(s.get(c) or "")
+        for key in DEPLOYMENT_KEYS:
+            columns[key].append(list(deps.get(key, []) or []))
+        platforms.append(frozenset(p for key in DEPLOYMENT_KEYS for p in deps.get(key, []) or []))
+        search.append(f"{s.get('title', '')}\x00{s.get('legacy_code', '')}".lower())
+        status_key.append(normalize_status(s.get('status')))
+    df = pd.DataFrame(columns)
+    df["_platforms"] = platforms
+    df["_search"] = search
+    df["_status"] = status_key
+    for col in filter(None, SORT_OPTIONS.values()):
+        df[f"_sort_{col}"] = df[col].str.casefold()
+    return df
+
+
+def filter_frame(df, artist: str = "All", status: str = "All", search: str = "", act_id: str = None,
+                 publishers: List[str] = None, publisher_map: Dict[str, str] = None,
+                 platforms: List[str] = None, match_all: bool = False, coverage=None):
+    """Frame version of filter_songs / filter_by_publishers / filter_by_platforms.
+
+    coverage: a CoverageMatrix built from the same song list, used for the
+    platform filter instead of testing each row's platform set.
+    """
+    mask = None
+
+    def both(m):
+        return m if mask is None else mask & m
+
+    if act_id:
+        mask = both(df["act_id"] == act_id)
+    if artist != "All":
+        mask = both(df["artist"] == artist)
+    if status != "All":
+        mask = both(df["_status"] == status)
+    if search:
+        mask = both(df["_search"].str.contains(search.lower(), regex=False))
+    if publishers:
+        mask = both(df["act_id"].map(lambda a: publisher_map.get(a, 'Unknown')).isin(publishers))
+    if platforms and coverage is not None:
+        mask = both(_mask_bools(coverage.select(platforms, match_all), len(df))[df.index.to_numpy()])
+    elif platforms:
+        wanted = frozenset(platforms)
+        test = wanted.issubset if match_all else (lambda on: not wanted.isdisjoint(on))
+        mask = both(df["_platforms"].map(test).astype(bool))
+    return df if mask is None else df[mask]
+
+
+def _mask_bools(mask: int, n: int):
+    """Bitset -> numpy bool array of at least n rows."""
+    import numpy as np
+
+    size = max(n, mask.bit_length(), 1)
+    raw = np.frombuffer(mask.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:size].astype(bool)
+
+
+def page_frame(df, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE, sort: str = None, descending: bool = False):
+    """(rows for one page, page count). Sorting uses the precomputed _sort_* keys."""
+    pages = max(1, -(-len(df) // page_size))
+    page = min(max(1, page), pages)
+    if sort:
+        df = df.sort_values(f"_sort_{sort}", ascending=not descending, kind="stable")
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size], pages
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Change Feed
+=======================================
+Append-only change-data-capture log for the catalog, so downstream syncs
+(portals, tracks.json, the GitHub sync) can apply deltas instead of
+re-copying catalog.json.
+
+Usage:
+    python change_feed.py tail                    # every change
+    python change_feed.py tail --after 120        # changes after seq 120
+    python change_feed.py poll portal-fc          # pending for a consumer
+    python change_feed.py commit portal-fc 140    # advance its cursor
+    python change_feed.py cursors
+
+Files (in data/):
+    changes.jsonl     one change per line, never rewritten
+    .cursors/*.json   last processed seq per named consumer
+
+Record:
+    {"seq": 41, "ts": "...", "entity": "song|album|supervisor|license",
+     "op": "create|update|delete", "id": "RS-2026-0042", "act_id": "FROZEN_CLOUD",
+     "fields": ["status"], "data": {"status": "released"}}
+
+For creates, data is the full entity. For updates it holds the new values
+of the changed top-level fields; an update that moves a song to another act
+also carries "from_act_id" (the act it left). seq increases monotonically across
+processes: appends take an exclusive file lock and continue from the last
+seq on disk. Catching up from a cursor binary-searches the log by byte
+offset, so it doesn't rescan history.
+"""
+
+import os
+import argparse
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+from codec import dumps, loads, write_bytes
+from metrics import inc
+
+
+LOG_FILE = "changes.jsonl"
+CURSORS_DIR = ".cursors"
+ENTITIES = ("song", "album", "supervisor", "license")
+OPS = ("create", "update", "delete")
+TAIL_CHUNK = 64 * 1024
+
+
+def change(entity: str, op: str, entity_id: str, data: Optional[Dict[str, Any]] = None,
+           act_id: Optional[str] = None, fields: Optional[List[str]] = None,
+           from_act_id: Optional[str] = None) -> Dict[str, Any]:
+    """Build an (unsequenced) change record. from_act_id: the act an entity moved away from."""
+    if entity not in ENTITIES:
+        raise ValueError(f"Unknown entity '{entity}'. Use one of: {', '.join(ENTITIES)}")
+    if op not in OPS:
+        raise ValueError(f"Unknown op '{op}'. Use one of: {', '.join(OPS)}")
+    record = {"entity": entity, "op": op, "id": entity_id}
+    if act_id:
+        record["act_id"] = act_id
+    if from_act_id and from_act_id != act_id:
+        record["from_act_id"] = from_act_id
+    if fields:
+        record["fields"] = list(fields)
+    if data is not None:
+        record["data"] = data
+    return record
+
+
+class ChangeFeed:
+    """The change log plus per-consumer cursors."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.log_path = self.data_dir / LOG_FILE
+        self.cursors_dir = self.data_dir / CURSORS_DIR
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+    # =========================================================================
+    # WRITING
+    # =========================================================================
+
+    def append(self, entity: str, op: str, entity_id: str, **kwargs: Any) -> Dict[str, Any]:
+        return self.append_many([change(entity, op, entity_id, **kwargs)])[0]
+
+    def append_many(self, changes: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sequence and append changes in one locked write; notifies subscribers."""
+        changes = list(changes)
+        if not changes:
+            return []
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        now = datetime.now().isoformat()
+        with self._lock, open(self.log_path, "ab+") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                end = self._complete_end(f)
+                if end != f.seek(0, os.SEEK_END):
+                    f.truncate(end)  # a crashed writer's torn line: never readable, so never published
+                seq = self._last_seq(f)
+                records = []
+                for item in changes:
+                    seq += 1
+                    records.append({"seq": seq, "ts": now, **item})
+                payload = b"".join(dumps(r) + b"\n" for r in records)
+                f.seek(0, os.SEEK_END)
+                f.write(payload)
+                f.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        inc("bytes_written_total", len(payload), target=LOG_FILE)
+        for listener in list(self._listeners):
+            listener(records)
+        return records
+
+    def subscribe(self, listener: Callable[[List[Dict[str, Any]]], None]) -> Callable[[], None]:
+        """Call listener(records) after every append in this process. Returns an unsubscribe function."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    # =========================================================================
+    # READING
+    # =========================================================================
+
+    @staticmethod
+    def _last_seq(f) -> int:
+        """seq of the last complete line, reading backwards from the end (a torn last line is skipped)."""
+        end = f.seek(0, os.SEEK_END)
+        pos, tail = end, b""
+        while pos > 0:
+            step = min(TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            lines = tail[:tail.rfind(b"\n") + 1].rstrip(b"\n").split(b"\n")
+            if len(lines) > 1 or pos == 0:
+                last = lines[-1].strip()
+                return loads(last)["seq"] if last else 0
+        return 0
+
+    @staticmethod
+    def _complete_end(f) -> int:
+        """Byte offset just past the last newline (0 if there is none)."""
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            step = min(TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                return pos + newline + 1
+        return 0
+
+    def last_seq(self) -> int:
+        if not self.log_path.exists():
+            return 0
+        with open(self.log_path, "rb") as f:
+            return self._last_seq(f)
+
+    @staticmethod
+    def _line_start(f, pos: int) -> int:
+        """First line start at or after byte pos."""
+        if pos == 0:
+            f.seek(0)
+            return 0
+        f.seek(pos - 1)
+        f.readline()
+        return f.tell()
+
+    def _offset_after(self, f, seq: int, size: int) -> int:
+        """Byte offset of the first record with seq > given seq (binary search)."""
+        lo, hi = 0, size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            self._line_start(f, mid)
+            line = f.readline()
+            if not line.strip() or loads(line)["seq"] > seq:
+                hi = mid
+            else:
+                lo = mid + 1
+        return self._line_start(f, lo)
+
+    def read(self, after: int = 0, entities: Optional[Iterable[str]] = None,
+             limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Changes with seq > after, oldest first, optionally filtered by entity."""
+        if not self.log_path.exists():
+            return
+        wanted = set(entities) if entities else None
+        yielded = 0
+        with open(self.log_path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(self._offset_after(f, after, size) if after > 0 else 0)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a write in progress
+                record = loads(line)
+                if wanted and record["entity"] not in wanted:
+                    continue
+                yield record
+                yielded += 1
+                if limit and yielded >= limit:
+                    return
+
+    # =========================================================================
+    # CURSORS
+    # =========================================================================
+
+    def _cursor_path(self, consumer: str) -> Path:
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in consumer)
+        return self.cursors_dir / f"{safe}.json"
+
+    def cursor(self, consumer: str) -> int:
+        path = self._cursor_path(consumer)
+        if not path.exists():
+            return 0
+        with open(path, "rb") as f:
+            return loads(f.read()).get("seq", 0)
+
+    def commit(self, consumer: str, seq: int) -> None:
+        """Record that consumer has processed everything up to seq."""
+        self.cursors_dir.mkdir(parents=True, exist_ok=True)
+        write_bytes(self._cursor_path(consumer), dumps({"consumer": consumer, "seq": seq, "updated": datetime.now().isoformat()}))
+
+    def cursors(self) -> Dict[str, int]:
+        if not self.cursors_dir.exists():
+            return {}
+        result = {}
+        for path in sorted(self.cursors_dir.glob("*.json")):
+            with open(path, "rb") as f:
+                doc = loads(f.read())
+            result[doc.get("consumer", path.stem)] = doc.get("seq", 0)
+        return result
+
+    def poll(self, consumer: str, entities: Optional[Iterable[str]] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Pending changes for consumer; the cursor only moves on commit()."""
+        return list(self.read(self.cursor(consumer), entities, limit))
+
+    def consume(self, consumer: str, handler: Callable[[List[Dict[str, Any]]], None],
+                entities: Optional[Iterable[str]] = None, batch: int = 500) -> int:
+        """Catch consumer up in batches: handler(records), then commit. Returns changes handled.
+
+        The cursor advances past filtered-out entities too, so a consumer
+        only interested in songs doesn't re-read album changes next time.
+        """
+        handled = 0
+        after = self.cursor(consumer)
+        while True:
+            records = list(self.read(after, limit=batch))
+            if not records:
+                return handled
+            relevant = [r for r in records if not entities or r["entity"] in entities]
+            if relevant:
+                handler(relevant)
+                handled += len(relevant)
+            after = records[-1]["seq"]
+            self.commit(consumer, after)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from catalog_manager import DATA_DIR
+
+    parser = argparse.ArgumentParser(description="Inspect the catalog change feed.")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    tail = sub.add_parser("tail")
+    tail.add_argument("--after", type=int, default=0)
+    tail.add_argument("--entity", choices=ENTITIES, action="append")
+    poll = sub.add_parser("poll")
+    poll.add_argument("consumer")
+    poll.add_argument("--entity", choices=ENTITIES, action="append")
+    commit = sub.add_parser("commit")
+    commit.add_argument("consumer")
+    commit.add_argument("seq", type=int)
+    sub.add_parser("cursors")
+    args = parser.parse_args(argv)
+
+    feed = ChangeFeed(args.data_dir)
+    if args.command == "tail":
+        for record in feed.read(args.after, args.entity):
+            print(dumps(record).decode("utf-8"))
+    elif args.command == "poll":
+        for record in feed.poll(args.consumer, args.entity):
+            print(dumps(record).decode("utf-8"))
+    elif args.command == "commit":
+        feed.commit(args.consumer, args.seq)
+        print(f"✅ {args.consumer} → seq {args.seq}")
+    else:
+        for consumer, seq in feed.cursors().items():
+            print(f"{consumer:<24} {seq:>8} / {feed.last_seq()}")
+
+
+if __name__ == "__main__":
+    main()
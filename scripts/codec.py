@@ -0,0 +1,492 @@
+"""
+Ridgemont Catalog Manager - JSON Codec & Working Store
+======================================================
+One place for encoding/decoding catalog data, using the fastest backend
+installed:
+
+    orjson   (pip install orjson)    preferred
+    msgspec  (pip install msgspec)   also enables the binary msgpack store
+    json     (stdlib)                always available
+
+    from codec import dumps, loads
+    payload = dumps(catalog, pretty=True)     # bytes, indent=2 like before
+    catalog = loads(payload)
+
+RIDGEMONT_JSON_CODEC=json|orjson|msgspec forces a backend.
+
+Working store (RIDGEMONT_STORE_FORMAT):
+    json      data/catalog.json, pretty-printed (default, same as before)
+    compact   data/catalog.store.json, minified JSON
+    msgpack   data/catalog.store.msgpack (needs msgspec)
+    sharded   data/shards/<ACT_ID>.json per act + data/shards/index.json
+
+With a compact/binary store, saves go to the store file and catalog.json is
+written by export_pretty() (CatalogManager.export_catalog_json, "> Export json")
+for humans and git diffs. Readers take whichever file is newer, so a
+catalog.json edited by hand, pulled from git or written by a watcher running
+in json mode is never silently ignored.
+
+The sharded store splits songs and albums by act_id (see SHARDED STORE
+below): a save rewrites only the shards whose content changed, and
+read_shards(data_dir, acts=[...]) loads just the acts asked for.
+
+read_catalog() keeps a marshal snapshot of the last parsed catalog in
+data/.cache/ and reuses it while the source file is unchanged, for the
+sharded store and large single-file catalogs (see PARSED SNAPSHOT below).
+"""
+
+import gc
+import os
+import sys
+import json
+import re
+import marshal
+import shutil
+import hashlib
+from pathlib import Path
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+CODEC_ENV = "RIDGEMONT_JSON_CODEC"
+STORE_FORMAT_ENV = "RIDGEMONT_STORE_FORMAT"
+CATALOG_FILE = "catalog.json"
+STORE_FILES = {"compact": "catalog.store.json", "msgpack": "catalog.store.msgpack"}
+STORE_FORMATS = ("json",) + tuple(STORE_FILES) + ("sharded",)
+SHARD_DIR = "shards"
+SHARD_INDEX = "index.json"
+SHARED_SHARD = "_shared"          # top-level keys that aren't split by act
+UNASSIGNED_SHARD = "_unassigned"  # songs/albums without an act_id
+PARTITIONED_KEYS = ("songs", "albums")
+# Decoding builds millions of containers; above this size the cyclic GC is
+# paused meanwhile, since its repeated full passes cost more than the parse.
+GC_PAUSE_BYTES = 1 << 20
+# Parsed-catalog snapshot (see read_catalog); RIDGEMONT_CATALOG_SNAPSHOT=0 turns it off
+SNAPSHOT_ENV = "RIDGEMONT_CATALOG_SNAPSHOT"
+SNAPSHOT_DIR = ".cache"
+SNAPSHOT_FILE = "catalog.snapshot"
+SNAPSHOT_TAG = f"py{sys.version_info[0]}.{sys.version_info[1]}-m{marshal.version}"
+# Single-file catalogs smaller than this are parsed directly: marshal only pulls
+# ahead of orjson at a few thousand songs. The shard index always uses it.
+SNAPSHOT_MIN_BYTES = 4 << 20
+
+
+def available_backends():
+    return [name for name, module in (("orjson", orjson), ("msgspec", msgspec)) if module] + ["json"]
+
+
+def _pick_backend() -> str:
+    wanted = os.getenv(CODEC_ENV, "").strip().lower()
+    backends = available_backends()
+    return wanted if wanted in backends else backends[0]
+
+
+BACKEND = _pick_backend()
+
+if msgspec is not None:
+    _msgspec_encoder = msgspec.json.Encoder(enc_hook=str)
+    _msgspec_decoder = msgspec.json.Decoder()
+
+
+# =============================================================================
+# ENCODE / DECODE
+# =============================================================================
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape_char(match) -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}"
+
+
+def _ascii_only(payload: bytes) -> bytes:
+    """\\uXXXX-escape non-ASCII characters, as json.dumps(ensure_ascii=True) does.
+
+    Only string contents can be non-ASCII, so this is safe on encoded JSON.
+    """
+    if payload.isascii():
+        return payload
+    return _NON_ASCII.sub(_escape_char, payload.decode("utf-8")).encode("ascii")
+
+
+def _stdlib_dumps(obj: Any, pretty: bool) -> bytes:
+    if pretty:
+        return json.dumps(obj, indent=2, default=str).encode("ascii")
+    return json.dumps(obj, separators=(",", ":"), default=str, ensure_ascii=False).encode("utf-8")
+
+
+def dumps(obj: Any, pretty: bool = False, backend: Optional[str] = None) -> bytes:
+    """UTF-8 JSON bytes. pretty=True gives the 2-space, \\u-escaped layout of catalog.json
+    (byte-identical to json.dumps(indent=2)); compact output keeps UTF-8 as is."""
+    backend = backend or BACKEND
+    if backend == "orjson":
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            payload = orjson.dumps(obj, default=str, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles them
+            return _stdlib_dumps(obj, pretty)
+        return _ascii_only(payload) if pretty else payload
+    if backend == "msgspec":
+        payload = _msgspec_encoder.encode(obj)
+        return _ascii_only(msgspec.json.format(payload, indent=2)) if pretty else payload
+    return _stdlib_dumps(obj, pretty)
+
+
+def _decode(data: Union[bytes, str], backend: str) -> Any:
+    if backend == "orjson":
+        return orjson.loads(data)
+    if backend == "msgspec":
+        try:
+            return _msgspec_decoder.decode(data)
+        except msgspec.DecodeError as e:  # not a ValueError; keep one error type across backends
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def _without_gc(decode, data: Union[bytes, str], min_bytes: int = GC_PAUSE_BYTES) -> Any:
+    if len(data) < min_bytes or not gc.isenabled():
+        return decode(data)
+    gc.disable()
+    try:
+        return decode(data)
+    finally:
+        gc.enable()
+
+
+def loads(data: Union[bytes, str], backend: Optional[str] = None) -> Any:
+    backend = backend or BACKEND
+    return _without_gc(lambda payload: _decode(payload, backend), data)
+
+
+def write_bytes(path: Path, payload: bytes) -> Path:
+    """Atomic write: temp file next to path, then rename into place."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+    return path
+
+
+def dump_file(path: Path, obj: Any, pretty: bool = False) -> int:
+    """Encode obj and write it atomically. Returns the bytes written."""
+    payload = dumps(obj, pretty=pretty)
+    write_bytes(path, payload)
+    return len(payload)
+
+
+def load_file(path: Path) -> Any:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+# =============================================================================
+# WORKING STORE
+# =============================================================================
+
+def store_format(fmt: Optional[str] = None) -> str:
+    """Resolve the working-store format (argument, then env, then "json")."""
+    fmt = (fmt or os.getenv(STORE_FORMAT_ENV, "") or "json").strip().lower()
+    if fmt not in STORE_FORMATS:
+        raise ValueError(f"Unknown store format '{fmt}'. Use one of: {', '.join(STORE_FORMATS)}")
+    if fmt == "msgpack" and msgspec is None:
+        print("⚠️ msgpack store needs msgspec (pip install msgspec) - using compact JSON")
+        return "compact"
+    return fmt
+
+
+def store_path(data_dir: Path, fmt: str) -> Path:
+    if fmt == "sharded":
+        return Path(data_dir) / SHARD_DIR / SHARD_INDEX
+    return Path(data_dir) / STORE_FILES.get(fmt, CATALOG_FILE)
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+def catalog_source(data_dir: Path) -> Path:
+    """The newest catalog file in data_dir: a store file, the shard index or catalog.json."""
+    pretty = Path(data_dir) / CATALOG_FILE
+    best, best_mtime = pretty, _mtime_ns(pretty)
+    for fmt in STORE_FORMATS[1:]:
+        if fmt == "msgpack" and msgspec is None:
+            continue
+        candidate = store_path(data_dir, fmt)
+        mtime = _mtime_ns(candidate)
+        if mtime >= 0 and mtime >= best_mtime:
+            best, best_mtime = candidate, mtime
+    return best
+
+
+def _decode_catalog(path: Path, raw: bytes) -> Dict[str, Any]:
+    if path.suffix == ".msgpack":
+        return _without_gc(msgspec.msgpack.decode, raw)
+    if _is_shard_index(path):
+        return _assemble_shards(path.parent, _decode_index(raw))
+    return loads(raw)
+
+
+def _is_shard_index(path: Path) -> bool:
+    return path.name == SHARD_INDEX and path.parent.name == SHARD_DIR
+
+
+def read_catalog(data_dir: Path, default: Optional[Dict[str, Any]] = None, snapshot: bool = True) -> Dict[str, Any]:
+    """Load the current catalog from whichever file is newest.
+
+    With snapshot=True (and RIDGEMONT_CATALOG_SNAPSHOT not "0") the parsed
+    catalog is reused from data/.cache/ while the source file is unchanged,
+    for the sharded store and for single files of SNAPSHOT_MIN_BYTES or more.
+    """
+    path = catalog_source(data_dir)
+    if not path.exists():
+        return default if default is not None else {"songs": []}
+    if snapshot and os.getenv(SNAPSHOT_ENV, "1") != "0" and (_is_shard_index(path) or path.stat().st_size >= SNAPSHOT_MIN_BYTES):
+        return _read_via_snapshot(Path(data_dir), path)
+    with open(path, "rb") as f:
+        return _decode_catalog(path, f.read())
+
+
+# =============================================================================
+# PARSED SNAPSHOT
+# =============================================================================
+# data/.cache/catalog.snapshot holds the last parsed catalog as marshal data,
+# and catalog.snapshot.meta the source file's name/size/mtime and content hash:
+#   - size + mtime match       -> load the snapshot, the source isn't read at all
+#   - content hash still match -> load the snapshot (file was touched/copied)
+#   - otherwise                -> parse the source and rewrite the snapshot
+# The snapshot body starts with the same hash, so a meta/body pair written by
+# two racing processes is detected and treated as a miss. marshal data is
+# only valid for one Python version, which is part of the key.
+#
+# Measured load times, snapshot vs parse (orjson, benchmark-style catalogs):
+#   catalog.json   300 songs  2.5 vs 2.7 ms   1k  5.8 vs 5.5 ms   10k  81 vs 93 ms
+#   shards        300 songs  2.0 vs 4.0 ms   3k   26 vs 45 ms    10k  82 vs 230 ms
+# A single file gains ~12% at best, so it is gated on SNAPSHOT_MIN_BYTES; the
+# sharded store reads one file per act and gains 2-3x at any size.
+
+def _snapshot_paths(data_dir: Path):
+    folder = data_dir / SNAPSHOT_DIR
+    return folder / SNAPSHOT_FILE, folder / (SNAPSHOT_FILE + ".meta")
+
+
+def _load_snapshot(body_path: Path, digest: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(body_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    head = digest.encode("ascii") + b"\n"
+    if not data.startswith(head):
+        return None
+    return _without_gc(lambda payload: marshal.loads(payload[len(head):]), data)
+
+
+def _read_via_snapshot(data_dir: Path, path: Path) -> Dict[str, Any]:
+    body_path, meta_path = _snapshot_paths(data_dir)
+    st = path.stat()
+    key = {"source": path.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "tag": SNAPSHOT_TAG}
+    try:
+        meta = json.loads(meta_path.read_bytes())
+    except (OSError, ValueError):
+        meta = {}
+    if meta.get("digest") and all(meta.get(k) == v for k, v in key.items()):
+        catalog = _load_snapshot(body_path, meta["digest"])
+        if catalog is not None:
+            return catalog
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    if meta.get("digest") == digest and meta.get("tag") == SNAPSHOT_TAG:
+        catalog = _load_snapshot(body_path, digest)
+        if catalog is not None:
+            _write_snapshot_meta(meta_path, {**key, "digest": digest})
+            return catalog
+
+    catalog = _decode_catalog(path, raw)
+    try:
+        body = marshal.dumps(catalog)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes(body_path, digest.encode("ascii") + b"\n" + body)
+        _write_snapshot_meta(meta_path, {**key, "digest": digest})
+    except (OSError, ValueError):
+        pass  # read-only data dir or a value marshal can't encode: just skip the cache
+    return catalog
+
+
+def _write_snapshot_meta(meta_path: Path, meta: Dict[str, Any]) -> None:
+    try:
+        write_bytes(meta_path, json.dumps(meta).encode("utf-8"))
+    except OSError:
+        pass
+
+
+# =============================================================================
+# SHARDED STORE
+# =============================================================================
+# data/shards/<ACT_ID>.json holds one act's songs and albums, _shared.json the
+# remaining top-level keys. index.json records each shard's content hash and
+# the catalog's song/album order as runs of (act_id, count), so the merged
+# catalog comes back in the order it was saved. Shards are written before the
+# index; entries a reader finds beyond the recorded runs (a half-finished save,
+# a hand edit) are appended in shard order rather than dropped. Hand edits
+# belong in catalog.json, which wins while it is the newer file.
+
+def _shard_file(act: str, taken: set) -> str:
+    name = re.sub(r"[^\w-]", "_", act)
+    if name.lower() in taken:  # case-insensitive file systems
+        name += "-" + hashlib.blake2b(act.encode("utf-8"), digest_size=3).hexdigest()
+    taken.add(name.lower())
+    return name + ".json"
+
+
+def _assemble_shards(folder: Path, index: Dict[str, Any], acts: Optional[List[str]] = None) -> Dict[str, Any]:
+    shards = index.get("shards", {})
+    wanted = [act for act in shards if acts is None or act in acts or act == SHARED_SHARD]
+    parts = {act: load_file(folder / shards[act]["file"]) for act in wanted if (folder / shards[act]["file"]).exists()}
+    catalog = parts.pop(SHARED_SHARD, {})
+    for key, runs in index.get("order", {}).items():
+        pending = {act: iter(part.get(key) or []) for act, part in parts.items()}
+        items: List[Any] = []
+        for act, count in runs:
+            if act in pending:
+                items.extend(islice(pending[act], count))
+        for rest in pending.values():
+            items.extend(rest)
+        catalog[key] = items
+    ordered = {key: catalog.pop(key) for key in index.get("keys", []) if key in catalog}
+    ordered.update(catalog)
+    return ordered
+
+
+def _decode_index(raw: bytes) -> Dict[str, Any]:
+    # Thousands of small order runs: with a big catalog in memory, collections triggered
+    # mid-parse cost ~100x the parse itself, so the GC is paused whatever the size
+    return _without_gc(lambda payload: _decode(payload, BACKEND), raw, min_bytes=0)
+
+
+def read_shards(data_dir: Path, acts: Optional[List[str]] = None) -> Dict[str, Any]:
+    """The sharded catalog; with acts, only those acts' songs and albums (plus the shared keys)."""
+    folder = Path(data_dir) / SHARD_DIR
+    with open(folder / SHARD_INDEX, "rb") as f:
+        return _assemble_shards(folder, _decode_index(f.read()), acts)
+
+
+def write_shards(data_dir: Path, catalog: Dict[str, Any], acts: Optional[Iterable[str]] = None,
+                 backup_dir: Optional[Path] = None) -> Path:
+    """Write the shards whose content changed, drop shards of acts that are gone, then the index.
+
+    acts: the acts whose songs/albums changed since the last save. Only those
+    shards (plus the shared one, new ones and any whose counts moved) are
+    encoded; the rest keep their files and digests. None encodes and compares
+    every shard. backup_dir: copy each file here before it is replaced or removed.
+    """
+    folder = Path(data_dir) / SHARD_DIR
+    index_path = folder / SHARD_INDEX
+    try:
+        with open(index_path, "rb") as f:
+            old = _decode_index(f.read())
+    except (OSError, ValueError):
+        old = {}
+
+    def replace(path: Path, payload: Optional[bytes] = None) -> None:
+        if backup_dir is not None and path.exists():
+            Path(backup_dir).mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, Path(backup_dir) / path.name)
+        if payload is None:
+            path.unlink(missing_ok=True)
+        else:
+            write_bytes(path, payload)
+    old_shards = old.get("shards", {})
+
+    parts: Dict[str, Dict[str, Any]] = {SHARED_SHARD: {}}
+    order: Dict[str, List[List[Any]]] = {}
+    for key, value in catalog.items():
+        if key not in PARTITIONED_KEYS or not isinstance(value, list):
+            parts[SHARED_SHARD][key] = value
+            continue
+        runs = order[key] = []
+        for item in value:
+            act = (item.get("act_id") if isinstance(item, dict) else None) or UNASSIGNED_SHARD
+            parts.setdefault(act, {"act_id": act}).setdefault(key, []).append(item)
+            if runs and runs[-1][0] == act:
+                runs[-1][1] += 1
+            else:
+                runs.append([act, 1])
+
+    folder.mkdir(parents=True, exist_ok=True)
+    taken = {entry["file"][:-5].lower() for act, entry in old_shards.items() if act in parts}
+    shards: Dict[str, Dict[str, Any]] = {}
+    dirty = None if acts is None else set(acts) | {SHARED_SHARD}
+    for act, part in parts.items():
+        entry = old_shards.get(act)
+        counts = {k: len(part[k]) for k in PARTITIONED_KEYS if k in part}
+        name = entry["file"] if entry else _shard_file(act, taken)
+        if dirty is not None and act not in dirty and entry and counts == {k: entry[k] for k in PARTITIONED_KEYS if k in entry} \
+                and (folder / name).exists():
+            shards[act] = entry
+            continue
+        payload = dumps(part, pretty=True)
+        digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        if not entry or entry.get("digest") != digest or not (folder / name).exists():
+            replace(folder / name, payload)
+        shards[act] = {"file": name, "digest": digest, **counts}
+    for act, entry in old_shards.items():
+        if act not in shards:
+            replace(folder / entry["file"])
+
+    index = {"version": 1, "keys": list(catalog), "order": order, "shards": shards}
+    if index != old or not index_path.exists():
+        replace(index_path, dumps(index, pretty=True))
+    return index_path
+
+
+def encode_store(catalog: Dict[str, Any], fmt: str) -> bytes:
+    if fmt == "msgpack":
+        return msgspec.msgpack.encode(catalog, enc_hook=str)
+    return dumps(catalog, pretty=(fmt == "json"))
+
+
+def write_catalog(data_dir: Path, catalog: Dict[str, Any], fmt: Optional[str] = None,
+                  payload: Optional[bytes] = None, acts: Optional[Iterable[str]] = None,
+                  backup_dir: Optional[Path] = None) -> Path:
+    """Save the catalog in the working-store format. payload: pre-encoded bytes for that format;
+    acts / backup_dir: the acts that changed and where replaced shards are copied (sharded store, see write_shards)."""
+    fmt = store_format(fmt)
+    if fmt == "sharded":
+        return write_shards(data_dir, catalog, acts, backup_dir)
+    return write_bytes(store_path(data_dir, fmt), payload if payload is not None else encode_store(catalog, fmt))
+
+
+def export_pretty(data_dir: Path, catalog: Dict[str, Any], fmt: Optional[str] = None) -> Path:
+    """Write the human-readable catalog.json alongside the working store.
+
+    The store is rewritten from the same catalog and stamped with
+    catalog.json's mtime, so it stays the (faster) source of truth.
+    """
+    fmt = store_format(fmt)
+    store = write_catalog(data_dir, catalog, fmt) if fmt != "json" else None
+    path = write_bytes(Path(data_dir) / CATALOG_FILE, dumps(catalog, pretty=True))
+    if store is not None:
+        mtime = path.stat().st_mtime_ns
+        os.utime(store, ns=(mtime, mtime))
+    return path
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Deployment Coverage Matrix
+======================================================
+Song x platform bitsets over distribution, sync libraries and streaming.
+Each platform (and each act / status) is one Python int whose bit i is set
+when the song in row i is on it, so AND/OR platform filters are a handful
+of integer operations and coverage counts are popcounts.
+
+Usage:
+    python coverage_matrix.py coverage                         # songs per platform
+    python coverage_matrix.py gaps --target Spotify --target DistroKid
+    python coverage_matrix.py gaps --target Spotify --status released --songs
+
+In code:
+    matrix = manager.coverage_matrix()           # built once, kept current by add_song/update_song
+    mask = matrix.select(["Spotify", "DistroKid"], match_all=True)
+    matrix.song_ids(mask), matrix.count(mask)
+    matrix.gap_report(["Spotify", "Songtradr"])
+"""
+
+import argparse
+from typing import Dict, List, Optional, Any, Iterable, FrozenSet
+
+from models import DEPLOYMENT_KEYS, normalize_status
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+popcount = getattr(int, "bit_count", _popcount)
+
+
+def song_platform_set(song: Dict[str, Any]) -> FrozenSet[str]:
+    deps = song.get("deployments", {}) or {}
+    return frozenset(p for key in DEPLOYMENT_KEYS for p in deps.get(key, []) or [])
+
+
+class CoverageMatrix:
+    """Bitset index of which songs are on which platforms. Row i = i-th song added."""
+
+    def __init__(self):
+        self.song_rows: List[Optional[str]] = []
+        self.row_of: Dict[str, int] = {}
+        self.platforms: Dict[str, int] = {}
+        self.acts: Dict[str, int] = {}
+        self.statuses: Dict[str, int] = {}
+        self.platform_kind: Dict[str, str] = {}
+        self.live = 0
+        self._row_state: List[Optional[tuple]] = []
+
+    @classmethod
+    def from_songs(cls, songs: Iterable[Dict[str, Any]]) -> "CoverageMatrix":
+        matrix = cls()
+        # Build the ints from row lists in one pass; setting bits one song at a
+        # time would copy a growing int per bit.
+        rows: Dict[str, Dict[str, List[int]]] = {"platforms": {}, "acts": {}, "statuses": {}}
+        for row, song in enumerate(songs):
+            song_id = song.get("song_id")
+            state = matrix._state(song)
+            matrix.song_rows.append(song_id)
+            matrix._row_state.append(state)
+            if song_id:
+                matrix.row_of[song_id] = row
+            act, status, platforms = state
+            rows["acts"].setdefault(act, []).append(row)
+            rows["statuses"].setdefault(status, []).append(row)
+            for p in platforms:
+                rows["platforms"].setdefault(p, []).append(row)
+            matrix._note_kinds(song)
+        for name, groups in rows.items():
+            target = getattr(matrix, name)
+            for key, members in groups.items():
+                target[key] = cls._mask_of(members)
+        matrix.live = (1 << len(matrix.song_rows)) - 1
+        return matrix
+
+    @staticmethod
+    def _mask_of(rows: List[int]) -> int:
+        if not rows:
+            return 0
+        bits = bytearray((rows[-1] >> 3) + 1)
+        for row in rows:
+            bits[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(bits, "little")
+
+    @staticmethod
+    def _state(song: Dict[str, Any]) -> tuple:
+        return (song.get("act_id") or "UNKNOWN", normalize_status(song.get("status")) or "unknown", song_platform_set(song))
+
+    def _note_kinds(self, song: Dict[str, Any]) -> None:
+        deps = song.get("deployments", {}) or {}
+        for key in DEPLOYMENT_KEYS:
+            for p in deps.get(key, []) or []:
+                self.platform_kind.setdefault(p, key)
+
+    # =========================================================================
+    # INCREMENTAL UPDATES
+    # =========================================================================
+
+    def _set(self, table: Dict[str, int], key: str, bit: int, on: bool) -> None:
+        if on:
+            table[key] = table.get(key, 0) | bit
+        elif key in table:
+            table[key] &= ~bit
+
+    def update_song(self, song: Dict[str, Any]) -> None:
+        """Add a song or re-index one whose act, status or deployments changed."""
+        song_id = song.get("song_id")
+        row = self.row_of.get(song_id)
+        if row is None:
+            row = len(self.song_rows)
+            self.song_rows.append(song_id)
+            self._row_state.append(None)
+            self.row_of[song_id] = row
+            self.live |= 1 << row
+        bit = 1 << row
+        old, new = self._row_state[row], self._state(song)
+        if old == new:
+            return
+        if old is not None:
+            self._set(self.acts, old[0], bit, False)
+            self._set(self.statuses, old[1], bit, False)
+            for p in old[2] - new[2]:
+                self._set(self.platforms, p, bit, False)
+        self._set(self.acts, new[0], bit, True)
+        self._set(self.statuses, new[1], bit, True)
+        for p in new[2] - (old[2] if old else frozenset()):
+            self._set(self.platforms, p, bit, True)
+        self._row_state[row] = new
+        self._note_kinds(song)
+
+    add_song = update_song
+
+    def remove_song(self, song_id: str) -> bool:
+        """Clear a song's bits; its row is left empty rather than renumbering the rest."""
+        row = self.row_of.pop(song_id, None)
+        if row is None:
+            return False
+        bit = 1 << row
+        act, status, platforms = self._row_state[row]
+        self._set(self.acts, act, bit, False)
+        self._set(self.statuses, status, bit, False)
+        for p in platforms:
+            self._set(self.platforms, p, bit, False)
+        self.song_rows[row] = None
+        self._row_state[row] = None
+        self.live &= ~bit
+        return True
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def select(self, platforms: Iterable[str], match_all: bool = False, acts: Optional[Iterable[str]] = None,
+               statuses: Optional[Iterable[str]] = None) -> int:
+        """Mask of songs on any (OR) or all (AND) of platforms, optionally within acts/statuses."""
+        mask = self.live
+        platforms = list(platforms)
+        if platforms:
+            if match_all:
+                for p in platforms:
+                    mask &= self.platforms.get(p, 0)
+            else:
+                mask = 0
+                for p in platforms:
+                    mask |= self.platforms.get(p, 0)
+        if acts:
+            mask &= self._union(self.acts, acts)
+        if statuses:
+            mask &= self._union(self.statuses, (normalize_status(s) for s in statuses))
+        return mask
+
+    @staticmethod
+    def _union(table: Dict[str, int], keys: Iterable[str]) -> int:
+        mask = 0
+        for key in keys:
+            mask |= table.get(key, 0)
+        return mask
+
+    def rows(self, mask: int) -> List[int]:
+        """Row numbers set in mask, ascending."""
+        digits = bin(mask)[:1:-1]  # little-endian bit string
+        rows, i = [], digits.find("1")
+        while i >= 0:
+            rows.append(i)
+            i = digits.find("1", i + 1)
+        return rows
+
+    def song_ids(self, mask: int) -> List[str]:
+        return [self.song_rows[r] for r in self.rows(mask)]
+
+    def count(self, mask: int) -> int:
+        return popcount(mask)
+
+    def coverage(self) -> Dict[str, int]:
+        """Songs per platform, most-covered first."""
+        counts = {p: popcount(mask) for p, mask in self.platforms.items() if mask}
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    def gap_report(self, targets: Iterable[str], acts: Optional[Iterable[str]] = None,
+                   statuses: Optional[Iterable[str]] = None, with_songs: bool = False) -> List[Dict[str, Any]]:
+        """Per act and status: songs missing from each target platform and from any of them."""
+        targets = list(targets)
+        on_all = self.select(targets, match_all=True) if targets else self.live
+        report = []
+        for act in sorted(acts or self.acts):
+            act_mask = self.acts.get(act, 0) & self.live
+            for status in sorted(statuses or self.statuses):
+                group = act_mask & self.statuses.get(normalize_status(status), 0)
+                if not group:
+                    continue
+                missing_any = group & ~on_all
+                row = {
+                    "act_id": act,
+                    "status": status,
+                    "songs": popcount(group),
+                    "missing": {t: popcount(group & ~self.platforms.get(t, 0)) for t in targets},
+                    "missing_any": popcount(missing_any),
+                }
+                if with_songs:
+                    row["missing_song_ids"] = self.song_ids(missing_any)
+                report.append(row)
+        return report
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from catalog_manager import CatalogManager
+
+    parser = argparse.ArgumentParser(description="Deployment coverage and platform gap report.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("coverage")
+    gaps = sub.add_parser("gaps")
+    gaps.add_argument("--target", action="append", required=True, help="platform every song should be on")
+    gaps.add_argument("--act", action="append")
+    gaps.add_argument("--status", action="append")
+    gaps.add_argument("--songs", action="store_true", help="list the song IDs missing a target")
+    args = parser.parse_args(argv)
+
+    manager = CatalogManager()
+    matrix = manager.coverage_matrix()
+    if args.command == "coverage":
+        for platform, count in matrix.coverage().items():
+            print(f"  {platform:<20} {matrix.platform_kind.get(platform, ''):<16} {count:>7,}")
+        return
+    for row in matrix.gap_report(args.target, args.act, args.status, with_songs=args.songs):
+        missing = ", ".join(f"{t}: {n}" for t, n in row["missing"].items())
+        print(f"  {row['act_id']:<16} {row['status']:<10} {row['songs']:>6} songs  missing any: {row['missing_any']:>6}  ({missing})")
+        if args.songs and row["missing_song_ids"]:
+            print(f"      {', '.join(row['missing_song_ids'])}")
+
+
+if __name__ == "__main__":
+    main()
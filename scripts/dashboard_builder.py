@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Static Dashboard Site
+=================================================
+Builds dashboards/site/ (overview, per-act, per-status and revenue pages)
+from cached HTML fragments.
+
+Usage:
+    python dashboard_builder.py            # incremental rebuild
+    python dashboard_builder.py --full     # ignore the fragment cache
+
+Each fragment (chunks of the per-act and per-status song tables, plus the
+revenue and overview panels) carries a fingerprint of the data it was
+rendered from. On the next build only fragments whose fingerprint moved are
+re-rendered, and only pages containing a re-rendered fragment are rewritten.
+When the catalog file signature hasn't moved since the last build, the
+build is skipped outright. Every file is written to a temp name and renamed
+into place, and pages for acts or statuses that no longer exist are pruned.
+"""
+
+import json
+import time
+import hashlib
+import argparse
+from html import escape
+from datetime import datetime
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+from catalog_manager import CatalogManager, DASHBOARDS_DIR, atomic_write
+from codec import dumps
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SITE_DIR = DASHBOARDS_DIR / "site"
+FRAGMENT_CACHE = ".fragments.json"
+# Bump when fragment markup changes so cached HTML is discarded.
+FRAGMENT_VERSION = "1"
+
+PAGE_STYLE = (
+    "body{font-family:sans-serif;padding:20px;background:#1a1a2e;color:#fff}h1,h2{color:#64ffda}"
+    "a{color:#64ffda}.stat{background:rgba(255,255,255,0.05);padding:20px;border-radius:10px;margin:10px 0}"
+    "table{border-collapse:collapse;width:100%}td,th{padding:6px 10px;border-bottom:1px solid #333;text-align:left}"
+    "nav a{margin-right:12px}"
+)
+
+
+def _song_key(song: Dict[str, Any]) -> Tuple:
+    """The song fields a table row depends on."""
+    return (
+        song.get("song_id"), song.get("title"), song.get("artist"), song.get("status"), song.get("legacy_code"),
+        (song.get("revenue") or {}).get("total_earned", 0), (song.get("dates") or {}).get("last_modified"),
+    )
+
+
+def _fingerprint(value: Any) -> str:
+    return f"{FRAGMENT_VERSION}:{hashlib.blake2b(dumps(value), digest_size=16).hexdigest()}"
+
+
+def _slug(value: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in value.lower()) or "unknown"
+
+
+def _title(act_id: str) -> str:
+    return act_id.replace("_", " ").title()
+
+
+def _page(title: str, nav: str, body: str) -> str:
+    return (
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">"
+        f"<title>{escape(title)} - Ridgemont Studio</title><style>{PAGE_STYLE}</style></head><body>"
+        f"<h1>🎵 {escape(title)}</h1>{nav}{body}"
+        f"<p style=\"color:#666\">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p></body></html>"
+    )
+
+
+# =============================================================================
+# FRAGMENTS
+# =============================================================================
+
+TABLE_HEAD = "<table><tr><th>Song ID</th><th>Code</th><th>Title</th><th>Artist</th><th>Status</th><th>Earned</th></tr>"
+
+
+def _song_rows(songs: List[Dict[str, Any]]) -> str:
+    return "".join(
+        f"<tr><td>{escape(s.get('song_id') or '')}</td><td>{escape(s.get('legacy_code') or '')}</td>"
+        f"<td>{escape(s.get('title') or '')}</td><td>{escape(s.get('artist') or '')}</td>"
+        f"<td>{escape(s.get('status') or '')}</td><td>${(s.get('revenue') or {}).get('total_earned') or 0:,.2f}</td></tr>"
+        for s in songs
+    )
+
+
+def _revenue_fragment(earned: Dict[str, float], spent: Dict[str, float], top: List[Dict[str, Any]]) -> str:
+    rows = "".join(
+        f"<tr><td>{escape(_title(act))}</td><td>${earned[act]:,.2f}</td><td>${spent[act]:,.2f}</td>"
+        f"<td>${earned[act] - spent[act]:,.2f}</td></tr>" for act in sorted(earned)
+    )
+    return (
+        f"<div class=\"stat\"><h3>Total Revenue</h3><p style=\"font-size:2rem;color:#ffd700\">${sum(earned.values()):,.2f}</p></div>"
+        f"<h2>By Act</h2><table><tr><th>Act</th><th>Earned</th><th>Expenses</th><th>Net</th></tr>{rows}</table>"
+        f"<h2>Top Earners</h2>{TABLE_HEAD}{_song_rows(top)}</table>"
+    )
+
+
+def _overview_fragment(by_act: Dict[str, int], by_status: Dict[str, int]) -> str:
+    acts = "".join(f"<li><a href=\"act_{_slug(a)}.html\">{escape(_title(a))}</a>: {n}</li>" for a, n in sorted(by_act.items()))
+    statuses = "".join(f"<li><a href=\"status_{_slug(k)}.html\">{escape(k)}</a>: {n}</li>" for k, n in sorted(by_status.items()))
+    return (
+        f"<div class=\"stat\"><h3>Total Songs</h3><p style=\"font-size:2rem;color:#64ffda\">{sum(by_act.values())}</p></div>"
+        f"<h2>By Act</h2><ul>{acts}</ul><h2>By Status</h2><ul>{statuses}</ul>"
+    )
+
+
+# =============================================================================
+# BUILDER
+# =============================================================================
+
+class DashboardSiteBuilder:
+    """Incrementally renders the static dashboard site from a fragment cache.
+
+    Song tables are cached in chunks of CHUNK_ROWS rows, so editing one song
+    re-renders a single chunk of its act and status pages (a song that moves
+    between groups also re-renders the chunks that follow it). The overview and
+    revenue fragments are fingerprinted on their aggregates (counts, totals,
+    top earners) rather than on every song.
+    """
+
+    CHUNK_ROWS = 500
+
+    def __init__(self, site_dir: Path = SITE_DIR):
+        self.site_dir = Path(site_dir)
+        self.cache_path = self.site_dir / FRAGMENT_CACHE
+
+    def _load_cache(self) -> Dict[str, Any]:
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, "r") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        return {}
+
+    def build(self, songs: List[Dict[str, Any]], full: bool = False, version: Optional[str] = None) -> Dict[str, Any]:
+        """Re-render changed fragments and rewrite only the pages that use them.
+
+        version is an opaque catalog version (e.g. file signature); when it
+        matches the previous build and the site is intact, nothing is done.
+        """
+        start = time.perf_counter()
+        self.site_dir.mkdir(parents=True, exist_ok=True)
+        cache = {} if full else self._load_cache()
+        fragments_cache: Dict[str, Dict[str, str]] = cache.get("fragments", {})
+        pages_cache: Dict[str, str] = cache.get("pages", {})
+
+        if version is not None and cache.get("version") == version and all((self.site_dir / p).exists() for p in pages_cache):
+            return self._result([], 0, [], [], start, unchanged=True)
+
+        by_act: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        by_status: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        keys: Dict[int, Tuple] = {}
+        earned: Dict[str, float] = defaultdict(float)
+        spent: Dict[str, float] = defaultdict(float)
+        for song in songs:
+            keys[id(song)] = _song_key(song)
+            act = song.get("act_id") or "UNKNOWN"
+            by_act[act].append(song)
+            by_status[song.get("status") or "unknown"].append(song)
+            revenue = song.get("revenue") or {}
+            earned[act] += revenue.get("total_earned", 0) or 0
+            expenses = revenue.get("expenses")
+            if expenses:
+                spent[act] += sum(e.get("amount", 0) for e in expenses)
+        top = sorted(songs, key=lambda s: (s.get("revenue") or {}).get("total_earned", 0) or 0, reverse=True)[:10]
+        counts_act = {a: len(m) for a, m in by_act.items()}
+        counts_status = {k: len(m) for k, m in by_status.items()}
+
+        # page filename -> (title, [(fragment name, fingerprint, renderer)], table row count or None)
+        pages: Dict[str, Tuple[str, List[Tuple[str, str, Callable[[], str]]], Optional[int]]] = {
+            "index.html": ("Ridgemont Studio Dashboard", [(
+                "overview", _fingerprint((sorted(counts_act.items()), sorted(counts_status.items()))),
+                lambda: _overview_fragment(counts_act, counts_status))], None),
+            "revenue.html": ("Revenue", [(
+                "revenue", _fingerprint((sorted(earned.items()), sorted(spent.items()), [keys[id(s)] for s in top])),
+                lambda: _revenue_fragment(earned, spent, top))], None),
+        }
+        for prefix, groups, title in (("act", by_act, _title), ("status", by_status, lambda k: f"Status: {k}")):
+            for group, members in groups.items():
+                name = f"{prefix}_{_slug(group)}"
+                chunks = []
+                for n in range(0, len(members), self.CHUNK_ROWS):
+                    chunk = members[n:n + self.CHUNK_ROWS]
+                    chunks.append((f"{name}#{n // self.CHUNK_ROWS}", _fingerprint([keys[id(s)] for s in chunk]),
+                                   lambda c=chunk: _song_rows(c)))
+                pages[f"{name}.html"] = (title(group), chunks, len(members))
+
+        nav = "<nav><a href=\"index.html\">Overview</a><a href=\"revenue.html\">Revenue</a>" + "".join(
+            f"<a href=\"act_{_slug(a)}.html\">{escape(_title(a))}</a>" for a in sorted(by_act)) + "</nav>"
+        nav_fingerprint = _fingerprint(nav)
+
+        rebuilt, written = [], []
+        new_fragments: Dict[str, Dict[str, str]] = {}
+        new_pages: Dict[str, str] = {}
+        for filename, (title, parts, rows) in pages.items():
+            html_parts = []
+            for name, fingerprint, render in parts:
+                cached = fragments_cache.get(name)
+                if not cached or cached.get("fingerprint") != fingerprint:
+                    cached = {"fingerprint": fingerprint, "html": render()}
+                    rebuilt.append(name)
+                new_fragments[name] = cached
+                html_parts.append(cached["html"])
+            page_fingerprint = _fingerprint([nav_fingerprint] + [fp for _, fp, _ in parts])
+            new_pages[filename] = page_fingerprint
+            path = self.site_dir / filename
+            if pages_cache.get(filename) != page_fingerprint or not path.exists():
+                body = "".join(html_parts)
+                if rows is not None:
+                    body = f"<p>{rows} songs</p>{TABLE_HEAD}{body}</table>"
+                atomic_write(path, _page(title, nav, body))
+                written.append(filename)
+
+        pruned = []
+        for path in self.site_dir.glob("*.html"):
+            if path.name not in pages:
+                path.unlink()
+                pruned.append(path.name)
+
+        atomic_write(self.cache_path, json.dumps({"version": version, "pages": new_pages, "fragments": new_fragments}))
+        return self._result(rebuilt, len(new_fragments) - len(rebuilt), written, pruned, start)
+
+    def _result(self, rebuilt: List[str], cached: int, written: List[str], pruned: List[str], start: float,
+                unchanged: bool = False) -> Dict[str, Any]:
+        return {
+            "site_dir": str(self.site_dir),
+            "unchanged": unchanged,
+            "fragments_rebuilt": rebuilt,
+            "fragments_cached": cached,
+            "pages_written": written,
+            "pages_pruned": pruned,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build the static dashboard site.")
+    parser.add_argument("--full", action="store_true", help="ignore cached fragments")
+    args = parser.parse_args(argv)
+
+    manager = CatalogManager()
+    result = DashboardSiteBuilder().build(manager.catalog.get("songs", []), full=args.full, version=manager.catalog_signature())
+    print(f"📊 Dashboard site: {len(result['pages_written'])} page(s) written, "
+          f"{result['fragments_cached']} fragment(s) cached, {result['elapsed_ms']} ms → {result['site_dir']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Event Store
+=======================================
+Append-only song history (created, placement, license_added, status_change,
+...) kept outside catalog.json, partitioned by month.
+
+Usage:
+    python event_store.py migrate                      # move embedded song events into the store
+    python event_store.py recent --days 7              # activity feed
+    python event_store.py query --type placement --period 2026Q1
+    python event_store.py query --song RS-2026-0042
+    python event_store.py stats
+
+Files (in data/events/):
+    2026-01.jsonl   one event per line, appended, never rewritten
+    undated.jsonl   events without a usable timestamp
+    index.json      per partition: count, bytes, first/last timestamp and
+                    counts by type; per song: the partitions holding its events
+
+Event: {"timestamp", "song_id", "act_id", "event_type", "description", "user"}
+(the embedded event fields plus song_id/act_id).
+
+Queries pick partitions from the index - by month for a time range, by the
+song's partition list for a song - and only read those files, so an activity
+feed or "placements in Q1" never loads the catalog.
+"""
+
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+from codec import dumps, loads, write_bytes
+from metrics import inc, span
+
+
+EVENTS_DIR = "events"
+INDEX_FILE = "index.json"
+LOCK_FILE = ".lock"
+UNDATED = "undated"
+WhenLike = Union[str, date, datetime, None]
+
+
+def partition_of(timestamp: Optional[str]) -> str:
+    """'2026-03-14T10:00:00' -> '2026-03'."""
+    ts = str(timestamp or "")
+    return ts[:7] if len(ts) >= 7 and ts[4] == "-" and ts[:4].isdigit() and ts[5:7].isdigit() else UNDATED
+
+
+def _bound(value: WhenLike, end: bool = False) -> Optional[str]:
+    """ISO string bound; a bare date as an end bound covers the whole day."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return datetime.combine(value, time.max if end else time.min).isoformat()
+    value = str(value)
+    if len(value) == 10 and end:
+        return value + "T23:59:59.999999"
+    return value
+
+
+def event_record(song: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
+    record = {"song_id": song.get("song_id"), "act_id": song.get("act_id"), **event}
+    return {k: v for k, v in record.items() if v is not None}
+
+
+def detach_events(song: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Remove a song's embedded events and return them as store records."""
+    return [event_record(song, e) for e in song.pop("events", None) or []]
+
+
+class EventStore:
+    """Monthly JSONL partitions plus a small index."""
+
+    def __init__(self, data_dir: Path):
+        self.root = Path(data_dir) / EVENTS_DIR
+        self.index_path = self.root / INDEX_FILE
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Any]] = None
+        self._index_mtime = None
+
+    def _partition_path(self, name: str) -> Path:
+        return self.root / f"{name}.jsonl"
+
+    # =========================================================================
+    # INDEX
+    # =========================================================================
+
+    def index(self) -> Dict[str, Any]:
+        """The partition/song index, re-read when another process updated it."""
+        try:
+            mtime = self.index_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._index is None or mtime != self._index_mtime:
+            self._index = self._read_index() if mtime is not None else {"partitions": {}, "songs": {}}
+            self._index_mtime = mtime
+        return self._index
+
+    def _read_index(self) -> Dict[str, Any]:
+        with open(self.index_path, "rb") as f:
+            index = loads(f.read())
+        # A partition that grew without its index entry (crash mid-append) is re-scanned
+        for name, meta in list(index["partitions"].items()):
+            path = self._partition_path(name)
+            if not path.exists() or path.stat().st_size != meta["bytes"]:
+                self._reindex_partition(index, name)
+        for path in self.root.glob("*.jsonl"):
+            if path.stem not in index["partitions"]:
+                self._reindex_partition(index, path.stem)
+        return index
+
+    def _reindex_partition(self, index: Dict[str, Any], name: str) -> None:
+        meta = {"count": 0, "bytes": 0, "first": None, "last": None, "sorted": True, "types": {}}
+        index["partitions"][name] = meta
+        path = self._partition_path(name)
+        if path.exists():
+            self._note(index, name, list(self._scan(path)), path.stat().st_size)
+
+    @staticmethod
+    def _note(index: Dict[str, Any], name: str, records: List[Dict[str, Any]], size: int) -> None:
+        meta = index["partitions"].setdefault(name, {"count": 0, "bytes": 0, "first": None, "last": None, "sorted": True, "types": {}})
+        for record in records:
+            ts = record.get("timestamp") or ""
+            if meta["last"] is not None and ts < meta["last"]:
+                meta["sorted"] = False
+            meta["first"] = ts if meta["first"] is None else min(meta["first"], ts)
+            meta["last"] = ts if meta["last"] is None else max(meta["last"], ts)
+            event_type = record.get("event_type") or "unknown"
+            meta["types"][event_type] = meta["types"].get(event_type, 0) + 1
+            song_parts = index["songs"].setdefault(record.get("song_id") or "", [])
+            if name not in song_parts:
+                song_parts.append(name)
+        meta["count"] += len(records)
+        meta["bytes"] = size
+
+    def rebuild_index(self) -> Dict[str, Any]:
+        """Re-scan every partition (after copying files in by hand, for instance)."""
+        with self._locked():
+            index = {"partitions": {}, "songs": {}}
+            for path in sorted(self.root.glob("*.jsonl")):
+                self._reindex_partition(index, path.stem)
+            self._write_index(index)
+        return index
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        write_bytes(self.index_path, dumps(index))
+        self._index, self._index_mtime = index, self.index_path.stat().st_mtime_ns
+
+    # =========================================================================
+    # WRITING
+    # =========================================================================
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive across threads and processes (watcher + app) for append + index update."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / LOCK_FILE, "a") as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def append(self, song_id: str, event_type: str, description: str = "", user: str = "System",
+               act_id: Optional[str] = None, timestamp: Optional[str] = None, **extra: Any) -> Dict[str, Any]:
+        record = {"timestamp": timestamp or datetime.now().isoformat(), "song_id": song_id, "act_id": act_id,
+                  "event_type": event_type, "description": description, "user": user, **extra}
+        return self.append_many([{k: v for k, v in record.items() if v is not None}])[0]
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Append events (grouped into their month partitions) and update the index."""
+        records = list(records)
+        if not records:
+            return []
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for record in sorted(records, key=lambda r: r.get("timestamp") or ""):
+            groups.setdefault(partition_of(record.get("timestamp")), []).append(record)
+        with self._locked():
+            index = self.index()
+            for name, group in groups.items():
+                payload = b"".join(dumps(r) + b"\n" for r in group)
+                with open(self._partition_path(name), "ab") as f:
+                    f.write(payload)
+                    size = f.tell()
+                self._note(index, name, group, size)
+                inc("bytes_written_total", len(payload), target="events")
+            self._write_index(index)
+        return records
+
+    # =========================================================================
+    # READING
+    # =========================================================================
+
+    @staticmethod
+    def _scan(path: Path, needle: Optional[bytes] = None) -> Iterator[Dict[str, Any]]:
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a write in progress
+                if needle is not None and needle not in line:
+                    continue
+                yield loads(line)
+
+    def partitions(self, start: WhenLike = None, end: WhenLike = None, song_id: Optional[str] = None,
+                   event_types: Optional[Iterable[str]] = None) -> List[str]:
+        """Partition names that can hold matching events, oldest first."""
+        index = self.index()
+        lo, hi = _bound(start), _bound(end, end=True)
+        names = sorted(index["partitions"])
+        if song_id is not None:
+            holding = set(index["songs"].get(song_id, []))
+            names = [n for n in names if n in holding]
+        if lo or hi:
+            names = [n for n in names if n != UNDATED and (not lo or n >= lo[:7]) and (not hi or n <= hi[:7])]
+        if event_types:
+            wanted = set(event_types)
+            names = [n for n in names if wanted & set(index["partitions"][n]["types"])]
+        return names
+
+    def query(self, start: WhenLike = None, end: WhenLike = None, song_id: Optional[str] = None,
+              event_types: Optional[Iterable[str]] = None, act_id: Optional[str] = None,
+              limit: Optional[int] = None, newest_first: bool = False) -> List[Dict[str, Any]]:
+        """Events matching every given filter, ordered by timestamp."""
+        types = set(event_types) if event_types else None
+        lo, hi = _bound(start), _bound(end, end=True)
+        needle = song_id.encode("utf-8") if song_id else None
+        names = self.partitions(start, end, song_id, types)
+        if newest_first:
+            names.reverse()
+        results: List[Dict[str, Any]] = []
+        with span("event_query") as s:
+            s.set(partitions=len(names))
+            for name in names:
+                matches = []
+                for record in self._scan(self._partition_path(name), needle):
+                    ts = record.get("timestamp") or ""
+                    if (song_id and record.get("song_id") != song_id) or (types and record.get("event_type") not in types) \
+                            or (act_id and record.get("act_id") != act_id) or (lo and ts < lo) or (hi and ts > hi):
+                        continue
+                    matches.append(record)
+                matches.sort(key=lambda r: r.get("timestamp") or "", reverse=newest_first)
+                results.extend(matches)
+                if limit and len(results) >= limit:
+                    return results[:limit]
+        return results
+
+    def recent(self, days: int = 7, limit: Optional[int] = None, **filters: Any) -> List[Dict[str, Any]]:
+        """Activity feed: the last `days` days, newest first."""
+        return self.query(start=datetime.now() - timedelta(days=days), limit=limit, newest_first=True, **filters)
+
+    def for_song(self, song_id: str) -> List[Dict[str, Any]]:
+        return self.query(song_id=song_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals straight from the index: events per partition and per type."""
+        index = self.index()
+        types: Dict[str, int] = {}
+        for meta in index["partitions"].values():
+            for event_type, count in meta["types"].items():
+                types[event_type] = types.get(event_type, 0) + count
+        return {
+            "events": sum(m["count"] for m in index["partitions"].values()),
+            "songs": len(index["songs"]),
+            "partitions": {name: index["partitions"][name]["count"] for name in sorted(index["partitions"])},
+            "types": dict(sorted(types.items(), key=lambda item: -item[1])),
+        }
+
+    # =========================================================================
+    # MIGRATION
+    # =========================================================================
+
+    def migrate(self, songs: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Move embedded song["events"] into the store, skipping events already there.
+
+        Songs are only stripped after the append succeeded, so a failed run
+        leaves the catalog untouched; a re-run after a crash doesn't duplicate.
+        """
+        pending = [(song, event_record(song, e)) for song in songs for e in song.get("events") or []]
+        if not pending:
+            return {"songs": 0, "events": 0, "duplicates": 0}
+        song_ids = {record["song_id"] for _, record in pending}
+        existing = set()
+        for name in sorted(self.index()["partitions"]):
+            for record in self._scan(self._partition_path(name)):
+                if record.get("song_id") in song_ids:
+                    existing.add(self._key(record))
+        fresh = [record for _, record in pending if self._key(record) not in existing]
+        with span("migrate_events") as s:
+            s.set(events=len(fresh))
+            self.append_many(fresh)
+        migrated = 0
+        for song in songs:
+            if "events" in song:
+                del song["events"]
+                migrated += 1
+        return {"songs": migrated, "events": len(fresh), "duplicates": len(pending) - len(fresh)}
+
+    @staticmethod
+    def _key(record: Dict[str, Any]) -> tuple:
+        return (record.get("song_id"), record.get("timestamp"), record.get("event_type"), record.get("description"))
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def _print_events(records: List[Dict[str, Any]]) -> None:
+    for r in records:
+        print(f"  {(r.get('timestamp') or '')[:19]:<19}  {r.get('song_id', ''):<16} {r.get('event_type', ''):<14} {r.get('description', '')}")
+    print(f"{len(records)} event(s)")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from catalog_manager import DATA_DIR
+
+    parser = argparse.ArgumentParser(description="Song event history.")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="move embedded song events out of the catalog")
+    sub.add_parser("stats")
+    sub.add_parser("reindex")
+    recent = sub.add_parser("recent")
+    recent.add_argument("--days", type=int, default=7)
+    recent.add_argument("--limit", type=int)
+    query = sub.add_parser("query")
+    query.add_argument("--song")
+    query.add_argument("--type", action="append")
+    query.add_argument("--act")
+    query.add_argument("--since", help="YYYY-MM-DD")
+    query.add_argument("--until", help="YYYY-MM-DD")
+    query.add_argument("--period", help="2026Q1, 2026-05 or 2026")
+    query.add_argument("--limit", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        from catalog_manager import CatalogManager
+        result = CatalogManager(args.data_dir).migrate_events()
+        print(f"📜 Moved {result['events']} event(s) from {result['songs']} song(s) into {args.data_dir / EVENTS_DIR}"
+              f" ({result['duplicates']} already there)")
+        return
+    store = EventStore(args.data_dir)
+    if args.command == "stats":
+        stats = store.stats()
+        print(f"{stats['events']:,} events for {stats['songs']:,} songs")
+        for name, count in stats["partitions"].items():
+            print(f"  {name:<10} {count:>8,}")
+        for event_type, count in stats["types"].items():
+            print(f"  {event_type:<16} {count:>8,}")
+    elif args.command == "reindex":
+        index = store.rebuild_index()
+        print(f"✅ Indexed {len(index['partitions'])} partition(s)")
+    elif args.command == "recent":
+        _print_events(store.recent(args.days, limit=args.limit))
+    else:
+        since, until = args.since, args.until
+        if args.period:
+            from royalties import period_bounds
+            since, until = period_bounds(args.period)
+        _print_events(store.query(since, until, song_id=args.song, event_types=args.type, act_id=args.act, limit=args.limit))
+
+
+if __name__ == "__main__":
+    main()
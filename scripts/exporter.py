@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Bulk Export
+=======================================
+Streams catalog extracts into exports/ for distributors, PROs and sync libraries.
+
+Usage:
+    python exporter.py csv --template distrokid --act FC
+    python exporter.py jsonl --status released --incremental
+    python exporter.py parquet --deployment Spotify
+
+Formats:
+    csv      One row per song, columns from a platform template (see TEMPLATES)
+    jsonl    One full song document per line
+    parquet  Template columns, written in fixed-size row groups (needs pyarrow)
+
+Rows are produced by a generator and written one at a time (Parquet one row
+group at a time), so memory stays flat regardless of catalog size. Files are
+written to a temp name and renamed into place, so a failed export never leaves
+a half-written extract behind.
+"""
+
+import os
+import re
+import csv
+import json
+import argparse
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Callable, Iterable, Iterator, Tuple
+
+from catalog_manager import CatalogManager, EXPORTS_DIR, ACT_IDS
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+EXPORT_STATE_PATH = EXPORTS_DIR / ".export_state.json"
+PARQUET_ROW_GROUP = 1024
+FORMAT_EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+
+
+def _get(song: Dict[str, Any], path: str, default: Any = "") -> Any:
+    """Read a dotted path (e.g. 'registration.isrc') from a song dict."""
+    value: Any = song
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return default
+        value = value.get(key)
+        if value is None:
+            return default
+    return value
+
+
+def _field(path: str) -> Callable[[Dict[str, Any]], Any]:
+    return lambda song: _get(song, path)
+
+
+def _joined(path: str, sep: str = "; ") -> Callable[[Dict[str, Any]], str]:
+    return lambda song: sep.join(str(v) for v in (_get(song, path, []) or []))
+
+
+def _writers(song: Dict[str, Any]) -> str:
+    return "; ".join(f"{w.get('writer_id', '?')} ({w.get('percentage', 0)}%)" for w in song.get("writers", []) or [])
+
+
+def _date(path: str) -> Callable[[Dict[str, Any]], str]:
+    return lambda song: str(_get(song, path))[:10]
+
+
+# Column layouts per destination: (header, extractor)
+TEMPLATES: Dict[str, List[Tuple[str, Callable[[Dict[str, Any]], Any]]]] = {
+    "catalog": [
+        ("Song ID", _field("song_id")),
+        ("Code", _field("legacy_code")),
+        ("Title", _field("title")),
+        ("Artist", _field("artist")),
+        ("Act", _field("act_id")),
+        ("Status", _field("status")),
+        ("Genre", _field("musical_info.genre")),
+        ("BPM", _field("musical_info.bpm")),
+        ("Duration (s)", _field("musical_info.duration_seconds")),
+        ("ISRC", _field("registration.isrc")),
+        ("ISWC", _field("registration.iswc")),
+        ("Created", _date("dates.created")),
+        ("Last Modified", _field("dates.last_modified")),
+    ],
+    "distrokid": [
+        ("Artist Name", _field("artist")),
+        ("Release Title", _field("album")),
+        ("Track Title", _field("title")),
+        ("ISRC", _field("registration.isrc")),
+        ("Songwriters", _writers),
+        ("Primary Genre", _field("musical_info.genre")),
+        ("Explicit", lambda s: "Yes" if _get(s, "sync_metadata.explicit", False) else "No"),
+        ("Instrumental", lambda s: "Yes" if _get(s, "musical_info.instrumental", False) else "No"),
+        ("Release Date", _date("dates.released")),
+        ("Cover", lambda s: "Yes" if s.get("is_cover") else "No"),
+        ("Original Song", _field("cover_of")),
+    ],
+    "pro": [
+        ("Work Title", _field("title")),
+        ("Alternate Titles", _joined("alt_titles")),
+        ("ISWC", _field("registration.iswc")),
+        ("PRO Work ID", _field("registration.pro_work_id")),
+        ("Writers (Share)", _writers),
+        ("Publisher", _field("rights.publisher")),
+        ("Performer", _field("artist")),
+        ("ISRC", _field("registration.isrc")),
+        ("Duration (s)", _field("musical_info.duration_seconds")),
+        ("Copyright Reg", _field("registration.copyright_reg")),
+        ("Registered With", _joined("registration.registered_with")),
+    ],
+    "sync": [
+        ("Song ID", _field("song_id")),
+        ("Title", _field("title")),
+        ("Artist", _field("artist")),
+        ("Genre", _field("musical_info.genre")),
+        ("BPM", _field("musical_info.bpm")),
+        ("Key", _field("musical_info.key")),
+        ("Moods", _joined("sync_metadata.moods")),
+        ("Themes", _joined("sync_metadata.themes")),
+        ("Keywords", _joined("sync_metadata.keywords")),
+        ("One-Stop", lambda s: "Yes" if _get(s, "sync_metadata.one_stop", False) else "No"),
+        ("Stems", lambda s: "Yes" if _get(s, "sync_checklist.stems_available", False) else "No"),
+        ("Instrumental Version", lambda s: "Yes" if _get(s, "sync_checklist.instrumental_available", False) else "No"),
+        ("Sync Status", _field("sync_checklist.sync_status")),
+    ],
+}
+
+
+# =============================================================================
+# FILTERING
+# =============================================================================
+
+def song_modified_at(song: Dict[str, Any]) -> str:
+    """ISO timestamp of a song's last change (falls back to creation date)."""
+    dates = song.get("dates", {}) or {}
+    return str(dates.get("last_modified") or dates.get("created") or "")
+
+
+def parse_moment(value: Any) -> Optional[datetime]:
+    """An ISO date or timestamp as a naive datetime; a date-only value is the end of that day
+    (so a song created "2026-01-25" is newer than a 12:00 cursor on that day). None if unparseable."""
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        if len(text) <= 10:
+            return datetime.combine(date.fromisoformat(text), time.max)
+        return datetime.fromisoformat(text).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def iter_filtered_songs(songs: Iterable[Dict[str, Any]], act: Optional[str] = None, status: Optional[str] = None,
+                        deployment: Optional[str] = None, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Lazily yield songs matching every given filter.
+
+    act accepts either an act_id or a shortcode alias (FC, PB, BS).
+    deployment matches a platform name in any deployments list.
+    since keeps songs whose last_modified (or created) date is newer; dates are
+    compared as datetimes, and songs with an unreadable date are kept.
+    """
+    since_at = parse_moment(since) if since else None
+    act_id = ACT_IDS.get(act.upper(), act.upper()) if act else None
+    status = status.lower() if status else None
+    platform = deployment.casefold() if deployment else None
+    for song in songs:
+        if act_id and song.get("act_id") != act_id:
+            continue
+        if status and song.get("status") != status:
+            continue
+        if platform:
+            deps = song.get("deployments", {}) or {}
+            if not any(p.casefold() == platform for lst in deps.values() for p in (lst or [])):
+                continue
+        if since_at:
+            modified = parse_moment(song_modified_at(song))
+            if modified is not None and modified <= since_at:
+                continue
+        yield song
+
+
+# =============================================================================
+# WRITERS
+# =============================================================================
+
+def _template_row(song: Dict[str, Any], columns) -> List[Any]:
+    return [extract(song) for _, extract in columns]
+
+
+def _write_csv(path: Path, songs: Iterator[Dict[str, Any]], columns) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([header for header, _ in columns])
+        for song in songs:
+            writer.writerow(_template_row(song, columns))
+            count += 1
+    return count
+
+
+def _write_jsonl(path: Path, songs: Iterator[Dict[str, Any]], columns=None) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for song in songs:
+            f.write(json.dumps(song, default=str, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def _write_parquet(path: Path, songs: Iterator[Dict[str, Any]], columns) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow: pip install pyarrow")
+
+    headers = [header for header, _ in columns]
+    schema = pa.schema([(h, pa.string()) for h in headers])
+    count = 0
+    with pq.ParquetWriter(str(path), schema) as writer:
+        batch: List[List[Any]] = []
+
+        def flush():
+            cols = list(zip(*batch))
+            arrays = [pa.array([None if v in ("", None) else str(v) for v in col], type=pa.string()) for col in cols]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            batch.clear()
+
+        for song in songs:
+            batch.append(_template_row(song, columns))
+            count += 1
+            if len(batch) >= PARQUET_ROW_GROUP:
+                flush()
+        if batch:
+            flush()
+    return count
+
+
+WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+# =============================================================================
+# EXPORT STATE (incremental mode)
+# =============================================================================
+
+def _load_state() -> Dict[str, str]:
+    if EXPORT_STATE_PATH.exists():
+        with open(EXPORT_STATE_PATH, "r") as f:
+            return json.load(f)
+    return {}
+
+
+def _save_state(state: Dict[str, str]) -> None:
+    EXPORT_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = EXPORT_STATE_PATH.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, EXPORT_STATE_PATH)
+
+
+def export_profile_key(fmt: str, template: str, act: Optional[str], status: Optional[str], deployment: Optional[str]) -> str:
+    """Key identifying an export profile, so each profile tracks its own cursor."""
+    return "|".join([fmt, template, act or "*", status or "*", deployment or "*"])
+
+
+def export_path(output_dir: Path, label: str, filters: Iterable[Optional[str]], ext: str) -> Path:
+    """A new file name carrying the profile's filters, e.g. distrokid_FROZEN_CLOUD_released_delta_20260301_101500.csv.
+    Two exports in the same second get -2, -3, ... rather than overwriting each other."""
+    parts = [label] + [re.sub(r"[^A-Za-z0-9_]+", "-", f).strip("-") for f in filters if f]
+    stem = f"{'_'.join(p for p in parts if p)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    path, n = output_dir / f"{stem}{ext}", 1
+    while path.exists() or path.with_name(path.name + ".tmp").exists():
+        n += 1
+        path = output_dir / f"{stem}-{n}{ext}"
+    return path
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def export_songs(songs: Iterable[Dict[str, Any]], fmt: str = "csv", template: str = "catalog",
+                 act: Optional[str] = None, status: Optional[str] = None, deployment: Optional[str] = None,
+                 incremental: bool = False, output_dir: Path = EXPORTS_DIR) -> Dict[str, Any]:
+    """Stream matching songs into a new file under output_dir.
+
+    With incremental=True only songs changed since the previous successful
+    export of the same profile are written, and the profile cursor advances
+    once the file is safely in place.
+    """
+    fmt = fmt.lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(WRITERS)}")
+    if template not in TEMPLATES:
+        raise ValueError(f"Unknown template '{template}'. Choose from: {', '.join(TEMPLATES)}")
+
+    started = datetime.now().isoformat()
+    key = export_profile_key(fmt, template, act, status, deployment)
+    state = _load_state() if incremental else {}
+    since = state.get(key) if incremental else None
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    label = template if fmt != "jsonl" else "songs"
+    path = export_path(output_dir, label, [act, status, deployment, "delta" if since else None], FORMAT_EXTENSIONS[fmt])
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    rows = iter_filtered_songs(songs, act=act, status=status, deployment=deployment, since=since)
+    try:
+        count = WRITERS[fmt](tmp_path, rows, TEMPLATES[template])
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    if incremental:
+        state = _load_state()
+        state[key] = started
+        _save_state(state)
+
+    return {"path": str(path), "format": fmt, "template": template, "rows": count, "since": since}
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export the Ridgemont catalog.")
+    parser.add_argument("format", choices=sorted(WRITERS))
+    parser.add_argument("--template", default="catalog", choices=sorted(TEMPLATES))
+    parser.add_argument("--act", help="act_id or registered alias (FC, PB, BS, ...)")
+    parser.add_argument("--status")
+    parser.add_argument("--deployment", help="platform name, e.g. Spotify or DistroKid")
+    parser.add_argument("--incremental", action="store_true", help="only songs changed since the last export of this profile")
+    args = parser.parse_args(argv)
+
+    result = CatalogManager().export_catalog(args.format, template=args.template, act=args.act, status=args.status,
+                                             deployment=args.deployment, incremental=args.incremental)
+    print(f"📤 Exported {result['rows']} songs → {result['path']}")
+
+
+if __name__ == "__main__":
+    main()
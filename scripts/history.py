@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Catalog History
+===========================================
+Point-in-time history and per-song diffs over the snapshots in backups/.
+
+Usage:
+    python history.py index                                  # index new backups
+    python history.py list
+    python history.py diff 20260125_101601 20260125_123402   # snapshot names or timestamps
+    python history.py asof "2026-01-25 12:00" --out /tmp/catalog_then.json
+    python history.py song RS-2026-0042                      # versions of one song
+    python history.py field RS-2026-0042 registration.isrc   # when did the ISRC change?
+
+Index (backups/.history/):
+    songs.jsonl       every distinct song version once (content-addressed, append-only)
+    snapshots.jsonl   one line per backup: the songs whose hash changed since
+                      the previous backup (with their offset in songs.jsonl)
+                      and the songs that disappeared
+
+Each song is hashed on its encoded bytes; only songs whose hash differs are
+stored, diffed or even decoded again, so hundreds of snapshots of a mostly
+unchanged catalog cost little more than one. Top-level keys other than
+"songs" (albums, ...) are versioned the same way under "@<key>".
+
+Once created, the index is kept up to date by CatalogManager before old
+backups are rotated out, so history outlives the 10-backup retention.
+"""
+
+import argparse
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Union
+
+from codec import dumps, loads, load_file, write_bytes
+from metrics import span
+
+
+HISTORY_DIR = ".history"
+BLOBS_FILE = "songs.jsonl"
+SNAPSHOTS_FILE = "snapshots.jsonl"
+BACKUP_PATTERN = "catalog_backup_*.json"
+MISSING = object()
+Entry = List[Any]  # [hash, offset, length]
+RefLike = Union[str, datetime, None]
+
+
+def snapshot_time(path: Path) -> datetime:
+    """catalog_backup_20260125_101601.json -> 2026-01-25 10:16:01 (file mtime if the name has no stamp)."""
+    stamp = path.stem.replace("catalog_backup_", "")
+    try:
+        return datetime.strptime(stamp, "%Y%m%d_%H%M%S")
+    except ValueError:
+        return datetime.fromtimestamp(path.stat().st_mtime)
+
+
+def entities(catalog: Dict[str, Any]) -> Dict[str, Any]:
+    """song_id -> song, plus "@albums" etc. for the other top-level keys."""
+    out = {f"@{key}": value for key, value in catalog.items() if key != "songs"}
+    for i, song in enumerate(catalog.get("songs", [])):
+        out[song.get("song_id") or f"#{i}"] = song
+    return out
+
+
+def get_path(doc: Any, path: str, default: Any = None) -> Any:
+    """Dotted lookup: 'registration.isrc', 'writers.0.percentage'."""
+    value = doc
+    for key in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(key, MISSING)
+        elif isinstance(value, list) and key.lstrip("-").isdigit() and -len(value) <= int(key) < len(value):
+            value = value[int(key)]
+        else:
+            value = MISSING
+        if value is MISSING:
+            return default
+    return value
+
+
+def diff_docs(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Structural differences as [{"path", "old", "new"}]; absent values are None."""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in list(old) + [k for k in new if k not in old]:
+            changes += diff_docs(old.get(key), new.get(key), f"{path}.{key}" if path else str(key))
+        return changes
+    if isinstance(old, list) and isinstance(new, list):
+        changes = []
+        for i in range(max(len(old), len(new))):
+            changes += diff_docs(old[i] if i < len(old) else None, new[i] if i < len(new) else None, f"{path}.{i}" if path else str(i))
+        return changes
+    return [{"path": path, "old": old, "new": new}]
+
+
+class CatalogHistory:
+    """Song-level version index over backups/catalog_backup_*.json."""
+
+    def __init__(self, backups_dir: Path, history_dir: Optional[Path] = None):
+        self.backups_dir = Path(backups_dir)
+        self.root = Path(history_dir) if history_dir else self.backups_dir / HISTORY_DIR
+        self.blobs_path = self.root / BLOBS_FILE
+        self.snapshots_path = self.root / SNAPSHOTS_FILE
+        self._snapshots: Optional[List[Dict[str, Any]]] = None
+        self._blob_cache: Dict[str, Any] = {}
+
+    def exists(self) -> bool:
+        return self.snapshots_path.exists()
+
+    # =========================================================================
+    # INDEXING
+    # =========================================================================
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """Indexed snapshots, oldest first: {"name", "taken", "songs", "changed", "removed"}."""
+        if self._snapshots is None:
+            self._snapshots = []
+            if self.snapshots_path.exists():
+                with open(self.snapshots_path, "rb") as f:
+                    self._snapshots = [loads(line) for line in f if line.endswith(b"\n")]
+        return self._snapshots
+
+    def sync(self) -> List[str]:
+        """Index backups newer than the last indexed one. Returns their names."""
+        indexed = {s["name"] for s in self.snapshots()}
+        last = self.snapshots()[-1]["name"] if self.snapshots() else ""
+        pending = [p for p in sorted(self.backups_dir.glob(BACKUP_PATTERN)) if p.stem not in indexed and p.stem > last]
+        if not pending:
+            return []
+        self.root.mkdir(parents=True, exist_ok=True)
+        state = self.state_at(None)
+        known = {entry[0]: entry for s in self.snapshots() for entry in s["changed"].values()}
+        added = []
+        with span("history_sync") as s, open(self.blobs_path, "ab") as blobs, open(self.snapshots_path, "ab") as log:
+            s.set(snapshots=len(pending))
+            blobs.seek(0, 2)
+            for path in pending:
+                current = entities(load_file(path))
+                changed: Dict[str, Entry] = {}
+                for entity_id, doc in current.items():
+                    payload = dumps(doc)
+                    digest = hashlib.blake2b(payload, digest_size=12).hexdigest()
+                    previous = state.get(entity_id)
+                    if previous is not None and previous[0] == digest:
+                        continue
+                    entry = known.get(digest)
+                    if entry is None:
+                        entry = [digest, blobs.tell(), len(payload)]
+                        blobs.write(payload + b"\n")
+                        known[digest] = entry
+                    changed[entity_id] = entry
+                removed = [entity_id for entity_id in state if entity_id not in current]
+                snapshot = {"name": path.stem, "taken": snapshot_time(path).isoformat(),
+                            "songs": sum(1 for k in current if not k.startswith("@")), "changed": changed, "removed": removed}
+                blobs.flush()
+                log.write(dumps(snapshot) + b"\n")
+                self.snapshots().append(snapshot)
+                for entity_id in removed:
+                    del state[entity_id]
+                state.update(changed)
+                added.append(path.stem)
+        return added
+
+    def rebuild(self) -> List[str]:
+        """Drop the index and re-index every backup still on disk."""
+        for path in (self.blobs_path, self.snapshots_path):
+            if path.exists():
+                path.unlink()
+        self._snapshots, self._blob_cache = None, {}
+        return self.sync()
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def resolve(self, ref: RefLike) -> int:
+        """Snapshot position for a name ('catalog_backup_...' or '20260125_101601'), or the
+        last snapshot taken at or before a timestamp; None = latest."""
+        snaps = self.snapshots()
+        if not snaps:
+            raise LookupError("No indexed snapshots - run 'python history.py index' first")
+        if ref is None:
+            return len(snaps) - 1
+        if isinstance(ref, str):
+            for i, s in enumerate(snaps):
+                if s["name"] == ref or s["name"].endswith(ref):
+                    return i
+            ref = datetime.fromisoformat(ref.strip())
+        when = ref.isoformat()
+        position = -1
+        for i, s in enumerate(snaps):
+            if s["taken"] <= when:
+                position = i
+        if position < 0:
+            raise LookupError(f"No snapshot at or before {when}")
+        return position
+
+    def state_at(self, ref: RefLike) -> Dict[str, Entry]:
+        """entity_id -> [hash, offset, length] as of a snapshot (folding the deltas)."""
+        snaps = self.snapshots()
+        if not snaps:
+            return {}
+        state: Dict[str, Entry] = {}
+        for s in snaps[:self.resolve(ref) + 1]:
+            for entity_id in s["removed"]:
+                state.pop(entity_id, None)
+            state.update(s["changed"])
+        return state
+
+    def _blob(self, entry: Entry) -> Any:
+        digest, offset, length = entry
+        if digest not in self._blob_cache:
+            with open(self.blobs_path, "rb") as f:
+                f.seek(offset)
+                self._blob_cache[digest] = loads(f.read(length))
+            if len(self._blob_cache) > 4096:
+                self._blob_cache.pop(next(iter(self._blob_cache)))
+        return self._blob_cache[digest]
+
+    def catalog_as_of(self, ref: RefLike) -> Dict[str, Any]:
+        """The whole catalog document as it was in a snapshot / at a time."""
+        state = self.state_at(ref)
+        catalog: Dict[str, Any] = {"songs": []}
+        with open(self.blobs_path, "rb") as f:
+            for entity_id, (digest, offset, length) in state.items():
+                f.seek(offset)
+                doc = loads(f.read(length))
+                if entity_id.startswith("@"):
+                    catalog[entity_id[1:]] = doc
+                else:
+                    catalog["songs"].append(doc)
+        return catalog
+
+    def song_as_of(self, song_id: str, ref: RefLike) -> Optional[Dict[str, Any]]:
+        entry = self.state_at(ref).get(song_id)
+        return self._blob(entry) if entry else None
+
+    def diff(self, a: RefLike, b: RefLike = None) -> Dict[str, Any]:
+        """Per-song structural diff between two snapshots; only songs whose hash differs are decoded."""
+        old, new = self.state_at(a), self.state_at(b)
+        changed = {}
+        for entity_id, entry in new.items():
+            before = old.get(entity_id)
+            if before is not None and before[0] != entry[0]:
+                changed[entity_id] = diff_docs(self._blob(before), self._blob(entry))
+        return {
+            "from": self.snapshots()[self.resolve(a)]["name"],
+            "to": self.snapshots()[self.resolve(b)]["name"],
+            "added": sorted(k for k in new if k not in old),
+            "removed": sorted(k for k in old if k not in new),
+            "changed": changed,
+        }
+
+    def song_versions(self, song_id: str) -> List[Dict[str, Any]]:
+        """Snapshots in which a song was added, changed or removed."""
+        versions = []
+        for s in self.snapshots():
+            if song_id in s["changed"]:
+                versions.append({"snapshot": s["name"], "taken": s["taken"], "hash": s["changed"][song_id][0],
+                                 "op": "changed" if versions and versions[-1]["op"] != "removed" else "added"})
+            elif song_id in s["removed"]:
+                versions.append({"snapshot": s["name"], "taken": s["taken"], "hash": None, "op": "removed"})
+        return versions
+
+    def field_history(self, song_id: str, field: str) -> List[Dict[str, Any]]:
+        """Each value a field took over time, e.g. field_history(sid, "registration.isrc")."""
+        history, last = [], MISSING
+        for s in self.snapshots():
+            if song_id in s["changed"]:
+                value = get_path(self._blob(s["changed"][song_id]), field)
+            elif song_id in s["removed"]:
+                value = None
+            else:
+                continue
+            if value != last:
+                history.append({"snapshot": s["name"], "taken": s["taken"], "value": value})
+                last = value
+        return history
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from catalog_manager import BACKUPS_DIR
+
+    parser = argparse.ArgumentParser(description="Catalog history over backups/.")
+    parser.add_argument("--backups-dir", type=Path, default=BACKUPS_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    index = sub.add_parser("index")
+    index.add_argument("--rebuild", action="store_true")
+    sub.add_parser("list")
+    diff = sub.add_parser("diff")
+    diff.add_argument("a")
+    diff.add_argument("b", nargs="?")
+    asof = sub.add_parser("asof")
+    asof.add_argument("when")
+    asof.add_argument("--out", type=Path)
+    song = sub.add_parser("song")
+    song.add_argument("song_id")
+    field = sub.add_parser("field")
+    field.add_argument("song_id")
+    field.add_argument("path", help="dotted field path, e.g. registration.isrc")
+    args = parser.parse_args(argv)
+
+    history = CatalogHistory(args.backups_dir)
+    if args.command == "index":
+        names = history.rebuild() if args.rebuild else history.sync()
+        print(f"🗂️ Indexed {len(names)} new snapshot(s); {len(history.snapshots())} total")
+        return
+    history.sync()
+    if args.command == "list":
+        for s in history.snapshots():
+            print(f"  {s['name']}  {s['taken'][:19]}  {s['songs']:>6} songs  {len(s['changed']):>6} changed  {len(s['removed']):>4} removed")
+    elif args.command == "diff":
+        result = history.diff(args.a, args.b)
+        print(f"{result['from']} → {result['to']}")
+        for song_id in result["added"]:
+            print(f"  + {song_id}")
+        for song_id in result["removed"]:
+            print(f"  - {song_id}")
+        for song_id, changes in result["changed"].items():
+            print(f"  ~ {song_id}")
+            for c in changes:
+                print(f"      {c['path']}: {c['old']!r} → {c['new']!r}")
+    elif args.command == "asof":
+        catalog = history.catalog_as_of(args.when)
+        if args.out:
+            write_bytes(args.out, dumps(catalog, pretty=True))
+            print(f"✅ {len(catalog['songs'])} songs → {args.out}")
+        else:
+            print(dumps(catalog, pretty=True).decode("utf-8"))
+    elif args.command == "song":
+        for v in history.song_versions(args.song_id):
+            print(f"  {v['taken'][:19]}  {v['op']:<8} {v['snapshot']}")
+    else:
+        for v in history.field_history(args.song_id, args.path):
+            print(f"  {v['taken'][:19]}  {v['value']!r}  ({v['snapshot']})")
+
+
+if __name__ == "__main__":
+    main()
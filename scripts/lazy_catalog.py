@@ -0,0 +1,190 @@
+"""
+Ridgemont Catalog Manager - Lazy Catalog
+========================================
+Two-tier view of catalog.json for fast startup on big catalogs.
+
+Tier 1 - SongSummary records (__slots__): id, title, artist, act, status and
+         legacy code for every song, loaded eagerly from a compact sidecar.
+Tier 2 - The full song document (events, rights.licenses, revenue.expenses,
+         sync_checklist, ...) read on demand from a JSON-lines sidecar
+         through a byte-offset index.
+
+Sidecars live in data/.cache/ and are stamped with the mtime and size of the
+current catalog file (catalog.json or the codec working store). When the
+stamp doesn't match, they are rebuilt from one full parse;
+CatalogManager.save_data refreshes them from memory once they exist, so the
+full parse only happens when the catalog was edited outside the manager.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator
+
+from codec import dumps, loads, write_bytes, catalog_source, read_catalog
+
+
+CACHE_DIRNAME = ".cache"
+SUMMARY_FILE = "catalog.summary.json"
+DETAILS_FILE = "catalog.details.jsonl"
+SUMMARY_FIELDS = ("song_id", "title", "artist", "act_id", "status", "legacy_code")
+FORMAT_VERSION = 1
+
+
+class SongSummary:
+    """Compact per-song record; the full document is fetched via LazyCatalog."""
+
+    __slots__ = SUMMARY_FIELDS + ("offset", "length")
+
+    def __init__(self, song_id: str, title: str, artist: str, act_id: str, status: str, legacy_code: str,
+                 offset: int = -1, length: int = 0):
+        self.song_id = song_id
+        self.title = title
+        self.artist = artist
+        self.act_id = act_id
+        self.status = status
+        self.legacy_code = legacy_code
+        self.offset = offset
+        self.length = length
+
+    @classmethod
+    def from_song(cls, song: Dict[str, Any], offset: int = -1, length: int = 0) -> "SongSummary":
+        return cls(song.get("song_id", ""), song.get("title", ""), song.get("artist", "") or "",
+                   song.get("act_id", "") or "", song.get("status", "") or "", song.get("legacy_code", "") or "",
+                   offset, length)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in SUMMARY_FIELDS}
+
+    def __repr__(self) -> str:
+        return f"SongSummary({self.song_id!r}, {self.title!r})"
+
+
+def file_signature(path: Path) -> Optional[str]:
+    """mtime + size stamp for a file (None if missing)."""
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}-{st.st_size}"
+
+
+def sidecars_exist(data_dir: Path) -> bool:
+    cache_dir = Path(data_dir) / CACHE_DIRNAME
+    return (cache_dir / SUMMARY_FILE).exists() and (cache_dir / DETAILS_FILE).exists()
+
+
+class LazyCatalog:
+    """Summaries in memory, full song documents on demand."""
+
+    DETAIL_CACHE_SIZE = 256
+
+    def __init__(self, data_dir: Path, autoload: bool = True):
+        self.data_dir = Path(data_dir)
+        self.cache_dir = self.data_dir / CACHE_DIRNAME
+        self.summary_path = self.cache_dir / SUMMARY_FILE
+        self.details_path = self.cache_dir / DETAILS_FILE
+        self.summaries: List[SongSummary] = []
+        self.by_id: Dict[str, SongSummary] = {}
+        self._details: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._handle = None
+        if autoload:
+            self.load()
+
+    # =========================================================================
+    # SIDECARS
+    # =========================================================================
+
+    def load(self) -> None:
+        """Load summaries from the sidecar, rebuilding it if the catalog moved on."""
+        signature = file_signature(catalog_source(self.data_dir))
+        if signature is None:
+            self._set([])
+            return
+        if self.summary_path.exists() and self.details_path.exists():
+            try:
+                with open(self.summary_path, "rb") as f:
+                    doc = loads(f.read())
+                if doc.get("version") == FORMAT_VERSION and doc.get("signature") == signature:
+                    self._set([SongSummary(*row) for row in doc["rows"]])
+                    return
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        self.refresh(read_catalog(self.data_dir))
+
+    def refresh(self, catalog: Dict[str, Any]) -> None:
+        """Rewrite both sidecars from an in-memory catalog (matching the catalog file on disk)."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        summaries = []
+        offset = 0
+        details_tmp = self.details_path.with_name(self.details_path.name + ".tmp")
+        with open(details_tmp, "wb") as f:
+            for song in catalog.get("songs", []):
+                line = dumps(song) + b"\n"
+                f.write(line)
+                summaries.append(SongSummary.from_song(song, offset, len(line)))
+                offset += len(line)
+        self._close()
+        os.replace(details_tmp, self.details_path)
+
+        doc = {
+            "version": FORMAT_VERSION,
+            "signature": file_signature(catalog_source(self.data_dir)),
+            "fields": list(SongSummary.__slots__),
+            "rows": [[getattr(s, name) for name in SongSummary.__slots__] for s in summaries],
+        }
+        write_bytes(self.summary_path, dumps(doc))
+        self._set(summaries)
+
+    def _set(self, summaries: List[SongSummary]) -> None:
+        self.summaries = summaries
+        self.by_id = {s.song_id: s for s in summaries}
+        self._details.clear()
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._handle:
+                self._handle.close()
+                self._handle = None
+
+    # =========================================================================
+    # ACCESS
+    # =========================================================================
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+    def __iter__(self) -> Iterator[SongSummary]:
+        return iter(self.summaries)
+
+    def get(self, song_id: str) -> Optional[Dict[str, Any]]:
+        """Full song document, read from the offset index (small LRU in front)."""
+        summary = self.by_id.get(song_id)
+        if summary is None or summary.offset < 0:
+            return None
+        with self._lock:
+            cached = self._details.get(song_id)
+            if cached is not None:
+                self._details.move_to_end(song_id)
+                return cached
+            if self._handle is None:
+                self._handle = open(self.details_path, "rb")
+            self._handle.seek(summary.offset)
+            song = loads(self._handle.read(summary.length))
+            self._details[song_id] = song
+            if len(self._details) > self.DETAIL_CACHE_SIZE:
+                self._details.popitem(last=False)
+            return song
+
+    def iter_songs(self) -> Iterator[Dict[str, Any]]:
+        """Stream every full document in catalog order without holding them all."""
+        if not self.details_path.exists():
+            return
+        with open(self.details_path, "rb") as f:
+            for line in f:
+                yield loads(line)
+
+    def close(self) -> None:
+        self._close()
@@ -0,0 +1,296 @@
+"""
+Ridgemont Catalog Manager - Instrumentation
+===========================================
+In-process timing spans, counters and a Prometheus text exposition.
+
+    from metrics import span, inc
+
+    with span("save_data"):
+        ...
+    inc("bytes_written_total", 2048, target="catalog.json")
+
+Every span records into the histogram ridgemont_operation_duration_seconds
+(labelled by operation), bumps ridgemont_operation_errors_total if the
+block raises, and emits one structured JSON log line on the "ridgemont"
+logger.
+
+Exposure:
+    render_prometheus()              Prometheus text format as a string
+    flush()                          writes it to RIDGEMONT_METRICS_FILE (if set)
+    start_metrics_server(port)       serves GET /metrics from a daemon thread
+                                     (RIDGEMONT_METRICS_PORT for the watcher)
+    configure_logging()              JSON log lines on stderr (RIDGEMONT_LOG_LEVEL)
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+import functools
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+
+PREFIX = "ridgemont_"
+DURATION_METRIC = "operation_duration_seconds"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_FILE_ENV = "RIDGEMONT_METRICS_FILE"
+METRICS_PORT_ENV = "RIDGEMONT_METRICS_PORT"
+
+logger = logging.getLogger("ridgemont")
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by (name, labels)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, text: str) -> None:
+        self._help[name] = text
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record one histogram sample (buckets..., sum, count)."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def value(self, name: str, **labels: Any) -> float:
+        """Current counter value (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def summary(self, name: str = DURATION_METRIC) -> Dict[str, Dict[str, float]]:
+        """{label string: {count, sum_seconds, mean_ms}} for a histogram."""
+        with self._lock:
+            series = {k: list(v) for k, v in self._histograms.get(name, {}).items()}
+        return {
+            ",".join(f"{k}={v}" for k, v in key): {
+                "count": state[-1], "sum_seconds": round(state[-2], 6),
+                "mean_ms": round(state[-2] / state[-1] * 1000, 3) if state[-1] else 0.0,
+            } for key, state in series.items()
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = PREFIX + name
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{full}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                full = PREFIX + name
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} histogram")
+                for key, state in sorted(series.items()):
+                    for bound, count in zip(self.buckets, state):
+                        lines.append(f"{full}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {count:g}")
+                    lines.append(f"{full}_bucket{_format_labels(key, ('le', '+Inf'))} {state[-1]:g}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {state[-2]:.6f}")
+                    lines.append(f"{full}_count{_format_labels(key)} {state[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe(DURATION_METRIC, "Duration of instrumented operations.")
+REGISTRY.describe("operation_errors_total", "Instrumented operations that raised.")
+REGISTRY.describe("bytes_written_total", "Bytes written to local files or uploaded.")
+REGISTRY.describe("r2_uploads_total", "R2 uploads by result.")
+REGISTRY.describe("r2_retries_total", "Retry attempts reported by botocore.")
+REGISTRY.describe("r2_errors_total", "R2 request failures by kind (transient/error) and operation.")
+REGISTRY.describe("r2_reconcile_total", "R2 reconciliation repairs by action and result.")
+REGISTRY.describe("read_api_errors_total", "Read API requests that failed with a 500, by endpoint.")
+REGISTRY.describe("cli_commands_total", "Shortcodes run from the command line by mode (local/daemon) and result.")
+REGISTRY.describe("files_processed_total", "Watcher files processed by result.")
+
+
+def inc(name: str, value: float = 1, **labels: Any) -> None:
+    REGISTRY.inc(name, value, **labels)
+
+
+def observe(operation: str, seconds: float, **labels: Any) -> None:
+    """Record a duration measured by the caller (for code that can't use span)."""
+    REGISTRY.observe(DURATION_METRIC, seconds, operation=operation, **labels)
+    _log(operation, seconds, "ok", labels)
+
+
+def _log(operation: str, seconds: float, status: str, labels: Dict[str, Any], error: Optional[str] = None) -> None:
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    record = {"event": "span", "operation": operation, "duration_ms": round(seconds * 1000, 3), "status": status, **labels}
+    if error:
+        record["error"] = error
+    logger.info(json.dumps(record, default=str))
+
+
+# =============================================================================
+# SPANS
+# =============================================================================
+
+class span:
+    """Time a block (or, used as a decorator, a function) as an operation.
+
+    Extra attributes can be attached while the span is open via set(),
+    e.g. bytes written, and are emitted in the structured log line.
+    """
+
+    def __init__(self, operation: str, **labels: Any):
+        self.operation = operation
+        self.labels = labels
+        self.attributes: Dict[str, Any] = {}
+        self.start = 0.0
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        seconds = time.perf_counter() - self.start
+        REGISTRY.observe(DURATION_METRIC, seconds, operation=self.operation, **self.labels)
+        if exc_type is not None:
+            REGISTRY.inc("operation_errors_total", operation=self.operation, **self.labels)
+            _log(self.operation, seconds, "error", {**self.labels, **self.attributes}, error=repr(exc))
+        else:
+            _log(self.operation, seconds, "ok", {**self.labels, **self.attributes})
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(self.operation, **self.labels):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def record_file_write(path: Path, target: Optional[str] = None) -> int:
+    """Count the size of a freshly written file into bytes_written_total."""
+    try:
+        size = Path(path).stat().st_size
+    except OSError:
+        return 0
+    inc("bytes_written_total", size, target=target or Path(path).name)
+    return size
+
+
+# =============================================================================
+# EXPOSURE
+# =============================================================================
+
+def render_prometheus() -> str:
+    return REGISTRY.render_prometheus()
+
+
+def flush(path: Optional[Path] = None) -> Optional[Path]:
+    """Write the exposition to path (or RIDGEMONT_METRICS_FILE). No-op if neither is set."""
+    target = path or os.getenv(METRICS_FILE_ENV)
+    if not target:
+        return None
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, target)
+    return target
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = "127.0.0.1") -> Optional[Any]:
+    """Serve /metrics on a daemon thread. Port defaults to RIDGEMONT_METRICS_PORT."""
+    port = port if port is not None else int(os.getenv(METRICS_PORT_ENV, "0") or 0)
+    if not port:
+        return None
+    # http.server pulls in email/ssl/socket (~35 ms): only import it when serving
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="ridgemont-metrics", daemon=True).start()
+    return server
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            payload = {"message": message}
+        payload = {"ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"), "level": record.levelname, **payload}
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """Emit the structured span log on stderr (level from RIDGEMONT_LOG_LEVEL, default WARNING)."""
+    level = (level or os.getenv("RIDGEMONT_LOG_LEVEL", "WARNING")).upper()
+    if not any(isinstance(h.formatter, _JsonFormatter) for h in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(_JsonFormatter())
+        logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
@@ -0,0 +1,323 @@
+"""
+Ridgemont Catalog Manager - Domain Model
+========================================
+Compact __slots__ records for songs and their nested parts, mapped 1:1 onto
+the catalog.json layout.
+
+    song = Song.from_dict(catalog["songs"][0])
+    song.status, song.writers[0].percentage, song.licenses[-1].fee
+    catalog["songs"][0] = song.to_dict()
+
+    song = new_song("RS-2026-0042", "Title", "FROZEN_CLOUD", "Frozen Cloud")
+
+Keys the model doesn't know about are kept in .extra and written back,
+top-level keys missing from a document stay missing on the way out, and a
+document whose keys aren't in FIELDS order keeps its own order, so a
+from_dict/to_dict round trip reproduces the original JSON. rights.licenses
+and revenue.expenses are lifted onto Song.licenses / Song.expenses and put
+back where they were.
+
+new_song() is the single factory for fresh catalog entries; both
+CatalogManager.add_song and the watcher's create_song_entry build on it.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+
+STATUSES = ("idea", "demo", "mixing", "mastered", "copyright", "released")
+LEGACY_STATUSES = {"finished": "mastered"}
+# Statuses whose audio is published to the website (tracks.json)
+PUBLISHED_STATUSES = frozenset({"mastered", "finished", "released"})
+DEPLOYMENT_KEYS = ("distribution", "sync_libraries", "streaming")
+DEFAULT_OWNER = "Ridgemont Studio"
+
+_NO_KEYS = frozenset()
+
+
+def _in_order(out: Dict[str, Any], keys: Tuple[str, ...]) -> Dict[str, Any]:
+    """out with keys first, in the source document's order, then any keys added since."""
+    ordered = {k: out.pop(k) for k in keys if k in out}
+    ordered.update(out)
+    return ordered
+
+
+def normalize_status(status: Optional[str]) -> str:
+    """Map legacy statuses ("finished") onto the app's status list."""
+    status = (status or "").strip().lower()
+    return LEGACY_STATUSES.get(status, status)
+
+
+# =============================================================================
+# RECORD BASE
+# =============================================================================
+
+class Record:
+    """Slots-backed record: FIELDS in order, unknown keys in .extra.
+
+    _order holds the source document's key order when it differs from FIELDS.
+    """
+
+    FIELDS: Tuple[str, ...] = ()
+    __slots__ = ("extra", "_absent", "_order")
+
+    def __init__(self, **values: Any):
+        for name in self.FIELDS:
+            setattr(self, name, values.pop(name, None))
+        self.extra = values
+        self._absent = _NO_KEYS
+        self._order = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._KEYS = frozenset(cls.FIELDS)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        obj = cls.__new__(cls)
+        get = data.get
+        for name in cls.FIELDS:
+            setattr(obj, name, get(name))
+        keys = tuple(data)
+        if keys == cls.FIELDS:
+            # Fast path: exactly the known schema, in order
+            obj.extra = {}
+            obj._absent = _NO_KEYS
+            obj._order = None
+        else:
+            obj.extra = {k: v for k, v in data.items() if k not in cls._KEYS}
+            absent = cls._KEYS.difference(data)
+            obj._absent = frozenset(absent) if absent else _NO_KEYS
+            obj._order = keys
+        return obj
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {}
+        absent = self._absent
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is None and name in absent:
+                continue
+            out[name] = value
+        if self.extra:
+            out.update(self.extra)
+        return _in_order(out, self._order) if self._order else out
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        shown = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.FIELDS[:3])
+        return f"{type(self).__name__}({shown})"
+
+
+class WriterSplit(Record):
+    FIELDS = ("writer_id", "percentage")
+    __slots__ = FIELDS
+
+
+class License(Record):
+    FIELDS = ("license_id", "type", "licensee", "territory", "start_date", "end_date", "exclusive", "fee", "notes", "created")
+    __slots__ = FIELDS
+
+
+class Expense(Record):
+    FIELDS = ("date", "amount", "category")
+    __slots__ = FIELDS
+
+
+class Event(Record):
+    FIELDS = ("timestamp", "event_type", "description", "user")
+    __slots__ = FIELDS
+
+
+class Deployment(Record):
+    FIELDS = DEPLOYMENT_KEYS
+    __slots__ = FIELDS
+
+    def platforms(self) -> List[str]:
+        return [p for key in DEPLOYMENT_KEYS for p in (getattr(self, key) or [])]
+
+
+# =============================================================================
+# SONG
+# =============================================================================
+
+class _RecordList:
+    """List of records stored as the raw JSON dicts until first accessed.
+
+    Loading and saving a song never pays for its (often long) event or
+    license lists unless code actually reads them.
+    """
+
+    def __init__(self, record_cls):
+        self.record_cls = record_cls
+
+    def __set_name__(self, owner, name):
+        self.slot = getattr(owner, "_" + name)
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        items = self.slot.__get__(obj, owner)
+        if items and type(items[0]) is dict:
+            items = [self.record_cls.from_dict(i) for i in items]
+            self.slot.__set__(obj, items)
+        return items
+
+    def __set__(self, obj, items):
+        self.slot.__set__(obj, items)
+
+    def dump(self, obj) -> Optional[List[Dict[str, Any]]]:
+        items = self.slot.__get__(obj, type(obj))
+        if not items or type(items[0]) is dict:
+            return items  # never touched: still the original JSON list
+        return [i.to_dict() for i in items]
+
+
+SONG_FIELDS = ("song_id", "title", "alt_titles", "act_id", "artist", "album", "writers", "legacy_code",
+               "musical_info", "sync_metadata", "status", "dates", "registration", "rights", "revenue",
+               "links", "events", "notes", "sync_checklist", "deployments")
+SONG_LISTS = ("writers", "events", "licenses", "expenses")
+_SONG_LIST_SET = frozenset(SONG_LISTS)
+
+
+class Song(Record):
+    """One catalog entry. licenses/expenses live under rights/revenue in JSON.
+
+    _nested holds the original key order of rights/revenue, so the lifted
+    lists go back in their old position.
+    """
+
+    FIELDS = SONG_FIELDS
+    LISTS = SONG_LISTS
+    __slots__ = tuple(n for n in SONG_FIELDS if n not in SONG_LISTS) + tuple("_" + n for n in SONG_LISTS) + ("_nested",)
+
+    writers = _RecordList(WriterSplit)
+    events = _RecordList(Event)
+    licenses = _RecordList(License)
+    expenses = _RecordList(Expense)
+
+    def __init__(self, licenses: Optional[List[License]] = None, expenses: Optional[List[Expense]] = None, **values: Any):
+        super().__init__(**values)
+        self.licenses = licenses
+        self.expenses = expenses
+        self._nested = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Song":
+        song = super().from_dict(data)
+        if song.deployments is not None:
+            song.deployments = Deployment.from_dict(song.deployments)
+        song.licenses = song.expenses = song._nested = None
+        if isinstance(song.rights, dict) and "licenses" in song.rights:
+            song._nested = {"rights": tuple(song.rights)}
+            song.rights = dict(song.rights)
+            song.licenses = song.rights.pop("licenses")
+        if isinstance(song.revenue, dict) and "expenses" in song.revenue:
+            song._nested = {**(song._nested or {}), "revenue": tuple(song.revenue)}
+            song.revenue = dict(song.revenue)
+            song.expenses = song.revenue.pop("expenses")
+        return song
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {}
+        absent = self._absent
+        cls = type(self)
+        for name in self.FIELDS:
+            if name in _SONG_LIST_SET:
+                value = getattr(cls, name).dump(self)
+            else:
+                value = getattr(self, name)
+            if value is None and name in absent:
+                continue
+            out[name] = value
+        if self.extra:
+            out.update(self.extra)
+        if self.deployments is not None:
+            out["deployments"] = self.deployments.to_dict()
+        nested = self._nested or {}
+        licenses = cls.licenses.dump(self)
+        if licenses is not None:
+            out["rights"] = _in_order({**(self.rights or {}), "licenses": licenses}, nested.get("rights", ()))
+        expenses = cls.expenses.dump(self)
+        if expenses is not None:
+            out["revenue"] = _in_order({**(self.revenue or {}), "expenses": expenses}, nested.get("revenue", ()))
+        return _in_order(out, self._order) if self._order else out
+
+    def add_event(self, event_type: str, description: str, user: str = "System", when: Optional[datetime] = None) -> Event:
+        event = Event(timestamp=(when or datetime.now()).isoformat(), event_type=event_type, description=description, user=user)
+        if self.events is None:
+            self.events = []
+        self.events.append(event)
+        return event
+
+    def platforms(self) -> List[str]:
+        return self.deployments.platforms() if self.deployments else []
+
+
+def load_songs(catalog: Dict[str, Any]) -> List[Song]:
+    return [Song.from_dict(s) for s in catalog.get("songs", [])]
+
+
+def dump_songs(songs: Iterable[Song]) -> List[Dict[str, Any]]:
+    return [s.to_dict() for s in songs]
+
+
+# =============================================================================
+# FACTORY
+# =============================================================================
+
+def new_song(song_id: str, title: str, act_id: str, artist: str, status: str = "idea", legacy_code: str = "",
+             writers: Optional[List[Dict[str, Any]]] = None, album: str = "Unknown Album",
+             musical_info: Optional[Dict[str, Any]] = None, deployments: Optional[Dict[str, List[str]]] = None,
+             r2_path: Optional[str] = None, created_by: str = "System", description: str = "Created",
+             now: Optional[datetime] = None) -> Song:
+    """A fully populated entry in the current catalog.json schema."""
+    now = now or datetime.now()
+    stamp = now.isoformat()
+    status = normalize_status(status) or "idea"
+    reached = STATUSES.index(status) if status in STATUSES else 0
+    song = Song(
+        song_id=song_id,
+        title=title,
+        alt_titles=[],
+        act_id=act_id,
+        artist=artist,
+        album=album,
+        writers=[WriterSplit.from_dict(w) for w in writers or []],
+        legacy_code=legacy_code or "",
+        musical_info={
+            "genre": "Unknown", "subgenre": "", "bpm": None, "key": None,
+            "time_signature": "4/4", "duration_seconds": None, "instrumental": False,
+            **(musical_info or {}),
+        },
+        sync_metadata={
+            "moods": [], "themes": [], "keywords": [], "similar_artists": [],
+            "use_cases": [], "explicit": False, "one_stop": True,
+        },
+        status=status,
+        dates={
+            "created": now.strftime("%Y-%m-%d"),  # date-only, like the rest of the catalog
+            "demo_completed": stamp if reached >= STATUSES.index("demo") else None,
+            "mastered": stamp if reached >= STATUSES.index("mastered") else None,
+            "released": None,
+            "last_modified": stamp,
+        },
+        registration={"isrc": None, "iswc": None, "pro_work_id": None, "copyright_reg": None, "registered_with": []},
+        rights={"master_owner": DEFAULT_OWNER, "publisher": DEFAULT_OWNER, "territories": ["Worldwide"], "restrictions": []},
+        revenue={"total_earned": 0},
+        links={"r2_path": r2_path} if r2_path else {},
+        events=[],
+        notes="",
+        sync_checklist={
+            "sync_status": "available", "master_cleared": True, "publishing_cleared": True,
+            "one_stop_available": True, "stems_available": False, "instrumental_available": False,
+            "sync_rep_assigned": None, "pitch_deck_ready": False,
+        },
+        deployments=Deployment(**{key: list((deployments or {}).get(key, [])) for key in DEPLOYMENT_KEYS}),
+        licenses=[],
+        expenses=[],
+    )
+    song.add_event("created", description, user=created_by, when=now)
+    return song
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Pitch Campaigns
+===========================================
+Renders pitch decks for one song (or a shortlist) across many supervisors.
+
+Usage:
+    python pitch_campaign.py "Down The Road" --supervisors "Sarah Chen" "Alex Kim"
+    python pitch_campaign.py "Down The Road" "The Journey" --all-supervisors
+
+How it stays fast:
+- The deck HTML comes from a template compiled once at import time.
+- Files are written from a thread pool.
+- Every pitch-history entry is appended to the pitch log in a single write,
+  and pairs already pitched are skipped with O(1) lookups.
+- A manifest of content hashes (song + supervisor fields the deck shows)
+  lets unchanged decks be skipped entirely on re-runs.
+"""
+
+import os
+import json
+import hashlib
+import argparse
+from html import escape
+from string import Template
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
+
+from catalog_manager import CatalogManager, PITCH_DECKS_DIR, USER_MAC_ROOT
+
+
+# =============================================================================
+# TEMPLATE
+# =============================================================================
+
+# Bump when the markup changes so cached decks are re-rendered.
+TEMPLATE_VERSION = "1"
+
+PITCH_TEMPLATE = Template("""<html><body style="font-family:sans-serif; padding:40px; background:#f4f4f4;">
+        <div style="max-width:600px; margin:auto; background:white; padding:30px; border-radius:10px; box-shadow:0 2px 10px rgba(0,0,0,0.1);">
+            <h1 style="color:#333;">$title</h1>
+            <p style="color:#666;">Prepared exclusively for <strong>$supervisor</strong></p>
+            <hr>
+            <p><strong>Artist:</strong> $artist</p>
+            <p><strong>BPM:</strong> $bpm</p>
+            <p><strong>Moods:</strong> $moods</p>
+            <div style="background:#e8f0fe; padding:15px; border-radius:5px; margin-top:20px;">
+                <strong>✅ Sync Status:</strong> One-Stop | Mastered | Stems Available
+            </div>
+            <p style="margin-top:30px; font-size:12px; color:#999;">&copy; 2026 Ridgemont Studio</p>
+        </div></body></html>""")
+
+MANIFEST_PATH = PITCH_DECKS_DIR / ".manifest.json"
+DEFAULT_WORKERS = 8
+
+
+def pitch_deck_filename(song: Dict[str, Any], supervisor: Dict[str, Any]) -> str:
+    return f"pitch_{song['song_id']}_{supervisor['name'].replace(' ', '')}.html"
+
+
+def deck_context(song: Dict[str, Any], supervisor: Dict[str, Any]) -> Dict[str, str]:
+    """The exact values a deck displays (already HTML-escaped)."""
+    return {
+        "title": escape(song["title"]),
+        "supervisor": escape(supervisor["name"]),
+        "artist": escape(song["act_id"].replace("_", " ")),
+        "bpm": escape(str(song.get("musical_info", {}).get("bpm") or "N/A")),
+        "moods": escape(", ".join(song.get("sync_metadata", {}).get("moods", []))),
+    }
+
+
+def render_pitch_html(song: Dict[str, Any], supervisor: Dict[str, Any]) -> str:
+    return PITCH_TEMPLATE.substitute(deck_context(song, supervisor))
+
+
+def deck_fingerprint(context: Dict[str, str]) -> str:
+    """Content hash of a deck's inputs plus the template version."""
+    payload = json.dumps([TEMPLATE_VERSION, context], sort_keys=True).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def deck_uri(filename: str) -> str:
+    """Clickable link on the user's Mac for a deck file."""
+    return (USER_MAC_ROOT / "pitch_decks" / filename).as_uri()
+
+
+# =============================================================================
+# MANIFEST
+# =============================================================================
+
+def _load_manifest() -> Dict[str, str]:
+    if MANIFEST_PATH.exists():
+        try:
+            with open(MANIFEST_PATH, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    return {}
+
+
+def _save_manifest(manifest: Dict[str, str]) -> None:
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def _write_deck(path: Path, html: str) -> None:
+    with open(path, "w") as f:
+        f.write(html)
+
+
+# =============================================================================
+# CAMPAIGN
+# =============================================================================
+
+def run_campaign(manager: CatalogManager, song_titles: List[str], supervisor_names: List[str],
+                 project: str = "General Pitch", max_workers: int = DEFAULT_WORKERS,
+                 force: bool = False, skip_pitched: bool = True, check_rights: bool = True) -> Dict[str, Any]:
+    """Generate decks for every song × supervisor pair and log the pitches.
+
+    Unknown supervisors are created as new contacts. Songs that cannot be
+    found are reported in 'missing_songs' and skipped. With skip_pitched,
+    pairs already in the supervisor's pitch history are left out. With
+    check_rights, songs under an exclusive license in force today are
+    reported in 'exclusive_songs' and not pitched. All history entries are
+    appended to the pitch log in one write at the end.
+    """
+    store = manager.supervisor_store
+    songs, missing, exclusive = [], [], []
+    rights = manager.rights_index() if check_rights else None
+    for title in song_titles:
+        song = manager.find_song_by_title(title)
+        if not song: missing.append(title)
+        elif rights and rights.exclusively_licensed(song["song_id"]): exclusive.append(song["title"])
+        else: songs.append(song)
+
+    supervisors, created = [], []
+    for name in dict.fromkeys(n.strip() for n in supervisor_names if n.strip()):
+        supervisor, is_new = manager.get_or_create_supervisor(name)
+        supervisors.append(supervisor)
+        if is_new: created.append(name)
+
+    PITCH_DECKS_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {} if force else _load_manifest()
+
+    jobs: List[Tuple[Path, str]] = []
+    entries: List[Dict[str, Any]] = []
+    decks, skipped, already = [], 0, 0
+    for song in songs:
+        for supervisor in supervisors:
+            if skip_pitched and store.was_pitched(supervisor["id"], song):
+                already += 1
+                continue
+            filename = pitch_deck_filename(song, supervisor)
+            path = PITCH_DECKS_DIR / filename
+            context = deck_context(song, supervisor)
+            fingerprint = deck_fingerprint(context)
+            if manifest.get(filename) == fingerprint and path.exists():
+                skipped += 1
+            else:
+                jobs.append((path, PITCH_TEMPLATE.substitute(context)))
+                manifest[filename] = fingerprint
+            decks.append(deck_uri(filename))
+            entries.append({"supervisor_id": supervisor["id"], "song_id": song["song_id"], "song": song["title"], "project": project})
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(lambda job: _write_deck(*job), jobs))
+
+    logged = store.log_pitches(entries)
+    manager.save_supervisors()
+    if jobs:
+        _save_manifest(manifest)
+
+    return {
+        "songs": [s["title"] for s in songs],
+        "missing_songs": missing,
+        "exclusive_songs": exclusive,
+        "supervisors": len(supervisors),
+        "new_supervisors": created,
+        "rendered": len(jobs),
+        "skipped": skipped,
+        "already_pitched": already,
+        "logged": logged,
+        "decks": decks,
+    }
+
+
+def format_campaign_summary(result: Dict[str, Any]) -> str:
+    lines = [
+        f"🚀 **Pitch Campaign:** {len(result['songs'])} song(s) × {result['supervisors']} supervisor(s)",
+        f"📄 Decks rendered: {result['rendered']} | unchanged: {result['skipped']}",
+    ]
+    if result["already_pitched"]:
+        lines.append(f"⏭️ Already pitched (skipped): {result['already_pitched']}")
+    if result["new_supervisors"]:
+        lines.append(f"👤 New contacts: {', '.join(result['new_supervisors'])}")
+    if result["missing_songs"]:
+        lines.append(f"⚠️ Not found: {', '.join(result['missing_songs'])}")
+    if result.get("exclusive_songs"):
+        lines.append(f"⛔ Exclusively licensed (not pitched): {', '.join(result['exclusive_songs'])}")
+    if result.get("logged"):
+        lines.append(f"✅ **Logged:** {result['logged']} pitch(es) added to supervisor history.")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a pitch campaign.")
+    parser.add_argument("songs", nargs="+", help="song titles")
+    parser.add_argument("--supervisors", nargs="*", default=[])
+    parser.add_argument("--all-supervisors", action="store_true", help="pitch every known supervisor")
+    parser.add_argument("--project", default="General Pitch")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--force", action="store_true", help="re-render decks even if unchanged")
+    parser.add_argument("--repitch", action="store_true", help="include songs already pitched to a supervisor")
+    parser.add_argument("--ignore-rights", action="store_true", help="pitch songs even if exclusively licensed")
+    args = parser.parse_args(argv)
+
+    manager = CatalogManager()
+    names = list(args.supervisors)
+    if args.all_supervisors:
+        names += [s["name"] for s in manager.supervisors["supervisors"]]
+    result = run_campaign(manager, args.songs, names, project=args.project, max_workers=args.workers,
+                          force=args.force, skip_pitched=not args.repitch, check_rights=not args.ignore_rights)
+    print(format_campaign_summary(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Portal Projections
+==============================================
+Per-act, field-limited catalog files for the artist portals, instead of
+copying the whole data/catalog.json (every act's songs, licenses, fees and
+revenue) into each portal repo.
+
+Usage:
+    python projections.py                      # rebuild acts changed since last run
+    python projections.py --full               # rebuild every act
+    python projections.py --portal-root ~/Cowork   # also copy into <repo>/data/catalog.json
+
+Output: projections/<ACT_ID>.json, minified, same {"songs", "albums"} shape as
+catalog.json but only with PUBLIC_SONG_FIELDS. Licenses, fees, revenue,
+writer splits, events and notes never leave the manager.
+
+Which acts to rebuild comes from the change feed (consumer "projections"):
+only acts with song/album/license changes since the last run (a song that
+moved counts for both acts). If
+catalog.json changed without going through the feed (hand edit, git pull),
+every act is re-projected, and acts whose output bytes are unchanged are
+still not rewritten. Projections of acts left with no songs or albums are
+deleted. A run limited with --act leaves the feed cursor where it was, so
+the other acts' pending changes are picked up next time.
+"""
+
+import zlib
+import shutil
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Set
+
+from codec import dumps, loads, write_bytes
+from change_feed import ChangeFeed
+from metrics import span, record_file_write
+
+
+FEED_CONSUMER = "projections"
+STATE_FILE = ".state.json"
+PORTAL_REPOS = {
+    "FROZEN_CLOUD": "frozen-cloud-portal",
+    "PARK_BELLEVUE": "park-bellevue-portal",
+}
+PUBLIC_SONG_FIELDS = ("song_id", "title", "alt_titles", "act_id", "artist", "album", "legacy_code",
+                      "musical_info", "sync_metadata", "status", "links", "deployments")
+PUBLIC_DATES = ("created", "released")
+PUBLIC_REGISTRATION = ("isrc", "iswc")
+PUBLIC_RIGHTS = ("territories", "restrictions")
+PUBLIC_CHECKLIST = ("sync_status", "one_stop_available", "stems_available", "instrumental_available")
+PUBLIC_ALBUM_FIELDS = ("album_id", "title", "artist", "act_id", "release_date", "status", "tracks", "artwork")
+
+
+def _pick(doc: Optional[Dict[str, Any]], keys: Iterable[str]) -> Dict[str, Any]:
+    doc = doc or {}
+    return {k: doc[k] for k in keys if k in doc}
+
+
+def project_song(song: Dict[str, Any]) -> Dict[str, Any]:
+    """The portal-safe view of one song."""
+    out = _pick(song, PUBLIC_SONG_FIELDS)
+    out["dates"] = _pick(song.get("dates"), PUBLIC_DATES)
+    out["registration"] = _pick(song.get("registration"), PUBLIC_REGISTRATION)
+    out["rights"] = _pick(song.get("rights"), PUBLIC_RIGHTS)
+    out["sync_checklist"] = _pick(song.get("sync_checklist"), PUBLIC_CHECKLIST)
+    return out
+
+
+def project_act(act_id: str, songs: Iterable[Dict[str, Any]], albums: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """One portal's catalog from that act's songs and albums."""
+    return {
+        "act_id": act_id,
+        "songs": [project_song(s) for s in songs],
+        "albums": [_pick(a, PUBLIC_ALBUM_FIELDS) for a in albums],
+    }
+
+
+def _group_by_act(items: Iterable[Dict[str, Any]], acts: Set[str]) -> Dict[str, List[Dict[str, Any]]]:
+    groups: Dict[str, List[Dict[str, Any]]] = {act: [] for act in acts}
+    for item in items:
+        group = groups.get(item.get("act_id"))
+        if group is not None:
+            group.append(item)
+    return groups
+
+
+class ProjectionBuilder:
+    """Writes projections/<ACT>.json, touching only acts that changed."""
+
+    def __init__(self, out_dir: Path, feed: Optional[ChangeFeed] = None):
+        self.out_dir = Path(out_dir)
+        self.state_path = self.out_dir / STATE_FILE
+        self.feed = feed
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, "rb") as f:
+                    return loads(f.read())
+            except ValueError:
+                pass
+        return {"signature": None, "acts": {}}
+
+    def changed_acts(self, state: Dict[str, Any], signature: Optional[str]) -> Optional[Set[str]]:
+        """Acts touched since the last build, or None when every act must be checked."""
+        if self.feed is None or state.get("signature") is None:
+            return None
+        acts = set()
+        last_signature = state.get("signature")
+        for record in self.feed.read(self.feed.cursor(FEED_CONSUMER), entities=("song", "album", "license")):
+            if not record.get("act_id"):
+                return None
+            acts.add(record["act_id"])
+            if record.get("from_act_id"):
+                acts.add(record["from_act_id"])
+        if not acts and signature != last_signature:
+            return None  # catalog changed outside the feed
+        return acts
+
+    def build(self, catalog: Dict[str, Any], acts: Optional[Iterable[str]] = None, full: bool = False,
+              signature: Optional[str] = None) -> Dict[str, Any]:
+        """Rebuild projections. acts limits the run; full ignores the change feed."""
+        with span("build_projections") as s:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            state = self._load_state()
+            head = self.feed.last_seq() if self.feed else 0
+            every_act = sorted({item.get("act_id") for key in ("songs", "albums") for item in catalog.get(key, []) if item.get("act_id")})
+            todo = set(acts) if acts else set(every_act)
+            if not full and not acts:
+                changed = self.changed_acts(state, signature)
+                if changed is not None:
+                    todo &= changed
+            songs = _group_by_act(catalog.get("songs", []), todo)
+            albums = _group_by_act(catalog.get("albums", []), todo)
+            written, unchanged, sizes = [], [], {}
+            for act_id in sorted(todo):
+                payload = dumps(project_act(act_id, songs[act_id], albums[act_id]))
+                fingerprint = f"{zlib.crc32(payload):08x}-{len(payload)}"
+                path = self.out_dir / f"{act_id}.json"
+                sizes[act_id] = len(payload)
+                if state["acts"].get(act_id) == fingerprint and path.exists():
+                    unchanged.append(act_id)
+                    continue
+                write_bytes(path, payload)
+                record_file_write(path, "projection")
+                state["acts"][act_id] = fingerprint
+                written.append(act_id)
+            removed = [] if acts else self._remove_stale(state, set(every_act))
+            if not acts:  # a partial run must not consume other acts' changes
+                state["signature"] = signature
+            write_bytes(self.state_path, dumps(state))
+            if self.feed and not acts:
+                self.feed.commit(FEED_CONSUMER, head)
+            s.set(written=len(written), checked=len(todo), removed=len(removed))
+        return {"out_dir": str(self.out_dir), "written": written, "unchanged": unchanged,
+                "skipped": sorted(set(every_act) - todo), "removed": removed, "bytes": sizes}
+
+    def _remove_stale(self, state: Dict[str, Any], live: Set[str]) -> List[str]:
+        """Delete projections of acts that no longer have songs or albums."""
+        stale = (set(state["acts"]) | {p.stem for p in self.out_dir.glob("*.json") if p.name != STATE_FILE}) - live
+        for act_id in sorted(stale):
+            (self.out_dir / f"{act_id}.json").unlink(missing_ok=True)
+            state["acts"].pop(act_id, None)
+        return sorted(stale)
+
+    def sync_portals(self, portal_root: Path, acts: Optional[Iterable[str]] = None) -> List[str]:
+        """Copy projections into <portal_root>/<portal repo>/data/catalog.json.
+
+        acts: only these (e.g. the ones just rewritten); portals with no
+        catalog.json yet are always filled.
+        """
+        copied = []
+        for act_id, repo in PORTAL_REPOS.items():
+            source = self.out_dir / f"{act_id}.json"
+            target = Path(portal_root) / repo / "data" / "catalog.json"
+            if not source.exists() or not target.parent.exists():
+                continue
+            if acts is not None and act_id not in acts and target.exists():
+                continue
+            shutil.copyfile(source, target)
+            copied.append(str(target))
+        return copied
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from catalog_manager import CatalogManager
+
+    parser = argparse.ArgumentParser(description="Build per-act portal catalog projections.")
+    parser.add_argument("--full", action="store_true", help="rebuild every act")
+    parser.add_argument("--act", action="append", help="limit to these act IDs")
+    parser.add_argument("--portal-root", type=Path, help="folder holding the portal repos to copy into")
+    args = parser.parse_args(argv)
+
+    manager = CatalogManager()
+    result = manager.build_portal_projections(full=args.full, acts=args.act)
+    for act_id in result["written"]:
+        print(f"  ✏️  {act_id:<16} {result['bytes'][act_id]:>10,} bytes")
+    for act_id in result["unchanged"]:
+        print(f"  ✓  {act_id:<16} unchanged")
+    for act_id in result["removed"]:
+        print(f"  🗑️  {act_id:<16} removed (no songs left)")
+    if result["skipped"]:
+        print(f"  ⏭️  no changes: {', '.join(result['skipped'])}")
+    if args.portal_root:
+        builder = ProjectionBuilder(Path(result["out_dir"]))
+        for target in builder.sync_portals(args.portal_root, result["written"]):
+            print(f"  📤 {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - R2 Reconciliation
+=============================================
+Checks that every song's links.r2_path exists in the bucket, finds objects
+no song points at, and repairs both in parallel.
+
+Usage:
+    python r2_reconcile.py                                  # report only
+    python r2_reconcile.py --repair                         # re-upload missing masters from Completed/
+    python r2_reconcile.py --repair --orphans quarantine    # ...and move orphans under _quarantine/
+    python r2_reconcile.py --orphans delete --workers 16
+    python r2_reconcile.py --local-bucket /tmp/bucket --repair   # a plain folder as the bucket
+    python r2_reconcile.py --miniflare ../.wrangler/state        # wrangler dev's local R2 (read-only)
+
+The bucket is listed once with paginated list_objects_v2 (1000 keys per
+request) and diffed against the catalog in memory, instead of one HEAD per
+song. Missing masters are matched to Completed/ by file name (ignoring the
+watcher's -YYYYMMDD / _YYYYMMDD_HHMMSS duplicate suffixes) and uploaded from
+a thread pool; orphans are deleted in 1000-key batches or copied to
+_quarantine/<date>/ first. Keys the site itself manages (tracks.json) and
+anything already in quarantine are never treated as orphans; renditions
+(links.preview_path, ...) and package files (instrumental_path, stems,
+versions) count as referenced, and missing ones are reported rather than
+re-uploaded (re-render with renditions.py / re-drop the song folder).
+
+Point R2_ENDPOINT_URL at any S3-compatible server (MinIO, moto) to run the
+full repair path locally.
+"""
+
+import re
+import sys
+import shutil
+import sqlite3
+import argparse
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from metrics import span, inc
+
+
+QUARANTINE_PREFIX = "_quarantine/"
+MANAGED_KEYS = {"tracks.json"}
+AUDIO_TYPES = {".mp3": "audio/mpeg", ".wav": "audio/wav"}
+DEFAULT_WORKERS = 8
+DUPLICATE_SUFFIX = re.compile(r"(-\d{8}|_\d{8}_\d{6})$")
+
+
+# =============================================================================
+# LOCAL STAND-INS
+# =============================================================================
+
+class LocalBucket:
+    """A folder used as a bucket: key = path relative to root. Same methods as R2Client."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.bucket_name = str(self.root)
+
+    def list_keys(self, prefix: str = "") -> Dict[str, int]:
+        if not self.root.exists():
+            return {}
+        keys = {p.relative_to(self.root).as_posix(): p.stat().st_size for p in self.root.rglob("*") if p.is_file()}
+        return {k: size for k, size in keys.items() if k.startswith(prefix)}
+
+    def upload_file(self, local_path: Path, r2_key: str, content_type: str = None) -> bool:
+        target = self.root / r2_key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(local_path, target)
+        return True
+
+    def copy_key(self, source_key: str, target_key: str) -> bool:
+        return self.upload_file(self.root / source_key, target_key)
+
+    def delete_keys(self, keys: List[str]) -> int:
+        deleted = 0
+        for key in keys:
+            path = self.root / key
+            if path.exists():
+                path.unlink()
+                deleted += 1
+        return deleted
+
+
+class MiniflareBucket:
+    """Read-only view of wrangler dev's local R2 state (.wrangler/state/v3/r2/*/*.sqlite); report only."""
+
+    def __init__(self, state_dir: Path):
+        self.bucket_name = str(state_dir)
+        self.databases = sorted(Path(state_dir).glob("**/r2/miniflare-R2BucketObject/*.sqlite"))
+
+    def list_keys(self, prefix: str = "") -> Dict[str, int]:
+        keys = {}
+        for db in self.databases:
+            with sqlite3.connect(f"file:{db}?mode=ro", uri=True) as conn:
+                rows = conn.execute("SELECT key, size FROM _mf_objects WHERE key >= ? ORDER BY key", (prefix,))
+                keys.update((key, size) for key, size in rows if key.startswith(prefix))
+        return keys
+
+
+# =============================================================================
+# DIFF
+# =============================================================================
+
+def expected_keys(songs: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """r2_path -> song, for every song that has one."""
+    return {(song.get("links") or {}).get("r2_path"): song for song in songs if (song.get("links") or {}).get("r2_path")}
+
+
+LINKED_PATHS = ("preview_path", "clip_path", "peaks_path", "instrumental_path")
+LINKED_LISTS = ("stems", "versions")
+
+
+def linked_keys(songs: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Renditions and package files -> song (not re-uploadable from a master in Completed/)."""
+    keys = {}
+    for song in songs:
+        links = song.get("links") or {}
+        for field in LINKED_PATHS:
+            if links.get(field):
+                keys[links[field]] = song
+        for field in LINKED_LISTS:
+            for key in links.get(field) or []:
+                keys[key] = song
+    return keys
+
+
+def diff_bucket(expected: Dict[str, Dict[str, Any]], present: Dict[str, int]) -> Tuple[List[str], List[str]]:
+    """(missing keys, orphaned keys), both sorted."""
+    missing = sorted(key for key in expected if key not in present)
+    orphans = sorted(key for key in present
+                     if key not in expected and key not in MANAGED_KEYS and not key.startswith(QUARANTINE_PREFIX))
+    return missing, orphans
+
+
+def _master_name(name: str) -> str:
+    path = Path(name)
+    return (DUPLICATE_SUFFIX.sub("", path.stem) + path.suffix).lower()
+
+
+def index_masters(folder: Path) -> Dict[str, Path]:
+    """Completed/ audio by normalized file name (newest file wins)."""
+    masters: Dict[str, Path] = {}
+    if not folder.exists():
+        return masters
+    files = [p for p in folder.rglob("*") if p.suffix.lower() in AUDIO_TYPES and p.is_file()]
+    for path in sorted(files, key=lambda p: p.stat().st_mtime):
+        masters[path.name.lower()] = path
+        masters.setdefault(_master_name(path.name), path)
+    return masters
+
+
+def find_master(key: str, masters: Dict[str, Path]) -> Optional[Path]:
+    name = key.rsplit("/", 1)[-1]
+    return masters.get(name.lower()) or masters.get(_master_name(name))
+
+
+# =============================================================================
+# REPAIR
+# =============================================================================
+
+def _upload(bucket: Any, key: str, path: Path) -> Tuple[str, bool]:
+    ok = bucket.upload_file(path, key, AUDIO_TYPES.get(path.suffix.lower()))
+    inc("r2_reconcile_total", action="reupload", result="ok" if ok else "error")
+    return key, ok
+
+
+def _quarantine(bucket: Any, key: str, prefix: str) -> Tuple[str, bool]:
+    ok = bucket.copy_key(key, prefix + key)
+    inc("r2_reconcile_total", action="quarantine", result="ok" if ok else "error")
+    return key, ok
+
+
+def reconcile(bucket: Any, songs: List[Dict[str, Any]], completed: Path, repair: bool = False,
+              orphans: Optional[str] = None, workers: int = DEFAULT_WORKERS, prefix: str = "") -> Dict[str, Any]:
+    """List, diff and (optionally) repair. orphans: None (report), 'delete' or 'quarantine'."""
+    if orphans not in (None, "delete", "quarantine"):
+        raise ValueError(f"orphans must be 'delete' or 'quarantine', not {orphans!r}")
+    with span("r2_reconcile.list"):
+        present = bucket.list_keys(prefix)
+    expected = {k: s for k, s in expected_keys(songs).items() if k.startswith(prefix)}
+    derived = {k: s for k, s in linked_keys(songs).items() if k.startswith(prefix)}
+    missing, orphaned = diff_bucket({**derived, **expected}, present)
+    stale = [k for k in missing if k not in expected]
+    missing = [k for k in missing if k in expected]
+    report: Dict[str, Any] = {
+        "bucket": bucket.bucket_name,
+        "objects": len(present),
+        "expected": len(expected),
+        "missing": [{"key": k, "song_id": expected[k].get("song_id"), "title": expected[k].get("title", "")} for k in missing],
+        "orphans": [{"key": k, "size": present[k]} for k in orphaned],
+        "missing_linked": [{"key": k, "song_id": derived[k].get("song_id")} for k in stale],
+        "reuploaded": [], "no_master": [], "failed": [], "orphans_removed": [], "orphans_deleted": 0,
+    }
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        if repair and missing:
+            masters = index_masters(completed)
+            jobs = []
+            for key in missing:
+                path = find_master(key, masters)
+                if path is None:
+                    report["no_master"].append(key)
+                else:
+                    jobs.append((key, path))
+            with span("r2_reconcile.reupload") as s:
+                s.set(files=len(jobs))
+                for key, ok in pool.map(lambda job: _upload(bucket, *job), jobs):
+                    report["reuploaded" if ok else "failed"].append(key)
+
+        if orphans and orphaned:
+            doomed = orphaned
+            if orphans == "quarantine":
+                target = f"{QUARANTINE_PREFIX}{datetime.now():%Y%m%d}/"
+                with span("r2_reconcile.quarantine") as s:
+                    s.set(files=len(orphaned))
+                    copied = list(pool.map(lambda key: _quarantine(bucket, key, target), orphaned))
+                doomed = [key for key, ok in copied if ok]
+                report["failed"] += [key for key, ok in copied if not ok]
+            with span("r2_reconcile.delete") as s:
+                s.set(files=len(doomed))
+                deleted = bucket.delete_keys(doomed)
+            inc("r2_reconcile_total", deleted, action="delete", result="ok")
+            report["orphans_removed"], report["orphans_deleted"] = doomed, deleted
+    return report
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from catalog_manager import CatalogManager
+
+    parser = argparse.ArgumentParser(description="Diff the R2 bucket against the catalog and repair it.")
+    parser.add_argument("--repair", action="store_true", help="re-upload missing masters from the Completed folder")
+    parser.add_argument("--orphans", choices=["delete", "quarantine"], help="what to do with objects no song references")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--prefix", default="", help="only reconcile keys under this prefix")
+    parser.add_argument("--completed", type=Path, help="folder holding uploaded masters (default: the watcher's Completed/)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--local-bucket", type=Path, help="use a local folder as the bucket")
+    source.add_argument("--miniflare", type=Path, help="read wrangler dev's .wrangler/state (report only)")
+    args = parser.parse_args(argv)
+    if args.miniflare and (args.repair or args.orphans):
+        parser.error("--miniflare is read-only; use --local-bucket or R2_ENDPOINT_URL with --repair/--orphans")
+
+    from watch_and_upload import COMPLETED_FOLDER, R2Error, get_r2_client
+    if args.local_bucket:
+        bucket = LocalBucket(args.local_bucket)
+    elif args.miniflare:
+        bucket = MiniflareBucket(args.miniflare)
+    else:
+        try:
+            bucket = get_r2_client()
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+    songs = CatalogManager().catalog["songs"]
+    try:
+        report = reconcile(bucket, songs, args.completed or COMPLETED_FOLDER, repair=args.repair,
+                           orphans=args.orphans, workers=args.workers, prefix=args.prefix)
+    except R2Error as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    for item in report["missing"]:
+        print(f"  ❌ missing  {item['key']}  ({item['song_id']})")
+    for item in report["orphans"]:
+        print(f"  👻 orphan   {item['key']}  {item['size']:,} bytes")
+    for item in report["missing_linked"]:
+        print(f"  🎚️ missing linked file {item['key']}  ({item['song_id']})")
+    for key in report["no_master"]:
+        print(f"  ⚠️ no master in Completed/ for {key}")
+    for key in report["failed"]:
+        print(f"  ⛔ failed   {key}")
+    print(f"☁️ {report['bucket']}: {report['objects']} objects, {report['expected']} referenced, "
+          f"{len(report['missing'])} missing, {len(report['orphans'])} orphaned; "
+          f"{len(report['reuploaded'])} re-uploaded, {len(report['orphans_removed'])} orphans {args.orphans or 'kept'}")
+
+
+if __name__ == "__main__":
+    main()
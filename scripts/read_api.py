@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Local Read API
+==========================================
+Read-only HTTP API over the catalog, so portals and the Streamlit app can
+query songs instead of loading the whole catalog.json.
+
+Usage:
+    python read_api.py                    # http://127.0.0.1:8765
+    python read_api.py --port 9000 --host 0.0.0.0
+
+Endpoints (all GET, JSON):
+    /health                               catalog version + song count
+    /songs?page=1&per_page=50             paginated list
+          &act=FC&status=released         filters (act accepts FC/PB/BS aliases)
+          &sort=-created                  title|artist|status|song_id|created, "-" = descending
+          &fields=song_id,title,status    top-level fields to return
+          &view=full                      whole song documents (default: public fields only)
+    /songs/<song_id>                      one song
+    /songs/by-code/<legacy_code>          one song by its 4-letter code
+    /search?q=summer&limit=20             title / artist / code / alt-title search
+    /facets?act=FC                        counts by act, status, artist, genre, platform
+
+Songs are served in their portal-safe form (projections.project_song:
+PUBLIC_SONG_FIELDS and the public parts of dates, registration, rights and
+the sync checklist), so licenses, fees, revenue and writer splits stay in
+the manager unless a request asks for view=full. Errors are JSON
+{"error": ...} with 400, 404 or 500 (500s also count in read_api_errors_total).
+
+Caching:
+    Every response carries an ETag derived from the catalog version and the
+    body; If-None-Match returns 304. Bodies over 1 KB are gzipped when the
+    client accepts it. Responses are cached in-process per (path, query) and
+    the cache is dropped as soon as the catalog version (file mtime + size)
+    changes, e.g. after the app or the watcher saves.
+"""
+
+import sys
+import gzip
+import zlib
+import traceback
+import argparse
+import threading
+from collections import OrderedDict, Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from codec import dumps
+from catalog_manager import CatalogManager, DATA_DIR
+from catalog_views import song_platforms
+from projections import project_song
+from metrics import span, inc
+
+
+DEFAULT_PORT = 8765
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+CACHE_SIZE = 512
+ENDPOINTS = ("health", "songs", "search", "facets")  # span labels; anything else is "other"
+GZIP_MIN_BYTES = 1024
+SORT_KEYS = {
+    "title": lambda s: (s.get("title") or "").casefold(),
+    "artist": lambda s: (s.get("artist") or "").casefold(),
+    "status": lambda s: s.get("status") or "",
+    "song_id": lambda s: s.get("song_id") or "",
+    "created": lambda s: str((s.get("dates") or {}).get("created") or ""),
+}
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class CatalogIndex:
+    """Lookup tables for one catalog version."""
+
+    def __init__(self, catalog: Dict[str, Any], version: Optional[str]):
+        self.version = version or "empty"
+        self.songs: List[Dict[str, Any]] = catalog.get("songs", [])
+        self.by_id = {s.get("song_id"): s for s in self.songs}
+        self.by_code = {(s.get("legacy_code") or "").upper(): s for s in self.songs if s.get("legacy_code")}
+        self.search_text = [
+            " ".join([s.get("title") or "", s.get("artist") or "", s.get("legacy_code") or "", *(s.get("alt_titles") or [])]).casefold()
+            for s in self.songs
+        ]
+        self._orders: Dict[str, List[int]] = {}
+
+    def order(self, sort: str) -> List[int]:
+        """Song positions sorted by a key, computed once per version."""
+        key = sort.lstrip("-")
+        if key not in SORT_KEYS:
+            raise BadRequest(f"sort must be one of: {', '.join(SORT_KEYS)}")
+        if key not in self._orders:
+            getter = SORT_KEYS[key]
+            self._orders[key] = sorted(range(len(self.songs)), key=lambda i: getter(self.songs[i]))
+        order = self._orders[key]
+        return order[::-1] if sort.startswith("-") else order
+
+
+def _one(query: Dict[str, List[str]], name: str, default: Optional[str] = None) -> Optional[str]:
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _int(query: Dict[str, List[str]], name: str, default: int, low: int, high: int) -> int:
+    try:
+        value = int(_one(query, name, str(default)))
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+    return max(low, min(high, value))
+
+
+def _fields(song: Dict[str, Any], fields: Optional[List[str]], full: bool = False) -> Dict[str, Any]:
+    """The public view of a song (the whole document with full=True), limited to fields."""
+    doc = song if full else project_song(song)
+    return {f: doc[f] for f in fields if f in doc} if fields else doc
+
+
+# =============================================================================
+# API
+# =============================================================================
+
+class ReadAPI:
+    """Routes, response cache and version tracking; no HTTP details."""
+
+    def __init__(self, manager: CatalogManager):
+        self.manager = manager
+        self._lock = threading.Lock()
+        self._index: Optional[CatalogIndex] = None
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[bytes, str]]" = OrderedDict()
+
+    def index(self) -> CatalogIndex:
+        """Current index, rebuilt (and the cache dropped) when the catalog version moves."""
+        with self._lock:
+            changed = self.manager.reload_if_changed()
+            if changed or self._index is None:
+                with span("read_api.index"):
+                    self._index = CatalogIndex(self.manager.catalog, self.manager.catalog_signature())
+                self._cache.clear()
+            return self._index
+
+    # -- routes ---------------------------------------------------------------
+
+    def route(self, path: str, query: Dict[str, List[str]], index: CatalogIndex) -> Any:
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+        if parts == ["health"]:
+            return {"status": "ok", "version": index.version, "songs": len(index.songs)}
+        if parts == ["songs"]:
+            return self.list_songs(index, query)
+        if len(parts) == 2 and parts[0] == "songs":
+            song = index.by_id.get(parts[1])
+            if song is None:
+                raise NotFound(f"No song with id {parts[1]}")
+            return _fields(song, self._field_list(query), self._full(query))
+        if len(parts) == 3 and parts[:2] == ["songs", "by-code"]:
+            song = index.by_code.get(parts[2].upper())
+            if song is None:
+                raise NotFound(f"No song with code {parts[2]}")
+            return _fields(song, self._field_list(query), self._full(query))
+        if parts == ["search"]:
+            return self.search(index, query)
+        if parts == ["facets"]:
+            return self.facets(index, query)
+        raise NotFound(f"Unknown endpoint /{'/'.join(parts)}")
+
+    @staticmethod
+    def _field_list(query: Dict[str, List[str]]) -> Optional[List[str]]:
+        raw = _one(query, "fields")
+        return [f.strip() for f in raw.split(",") if f.strip()] if raw else None
+
+    @staticmethod
+    def _full(query: Dict[str, List[str]]) -> bool:
+        view = _one(query, "view", "public")
+        if view not in ("public", "full"):
+            raise BadRequest("view must be public or full")
+        return view == "full"
+
+    @staticmethod
+    def _matches(song: Dict[str, Any], act: Optional[str], status: Optional[str]) -> bool:
+        return (not act or song.get("act_id") == act) and (not status or song.get("status") == status)
+
+    def _filters(self, query: Dict[str, List[str]]) -> Tuple[Optional[str], Optional[str]]:
+        act = _one(query, "act")
+        if act:
+            act = self.manager.act_registry.resolve(act) or act.upper()
+        return act, _one(query, "status")
+
+    def list_songs(self, index: CatalogIndex, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        page = _int(query, "page", 1, 1, 10 ** 9)
+        per_page = _int(query, "per_page", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+        act, status = self._filters(query)
+        fields = self._field_list(query)
+        sort = _one(query, "sort")
+        positions = index.order(sort) if sort else range(len(index.songs))
+        songs = index.songs
+        if act or status:
+            positions = [i for i in positions if self._matches(songs[i], act, status)]
+        total = len(positions)
+        start = (page - 1) * per_page
+        full = self._full(query)
+        items = [_fields(songs[i], fields, full) for i in positions[start:start + per_page]]
+        return {"items": items, "page": page, "per_page": per_page, "total": total,
+                "pages": (total + per_page - 1) // per_page}
+
+    def search(self, index: CatalogIndex, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        q = (_one(query, "q") or "").strip().casefold()
+        if not q:
+            raise BadRequest("q is required")
+        limit = _int(query, "limit", 20, 1, MAX_PER_PAGE)
+        act, status = self._filters(query)
+        fields = self._field_list(query) or ["song_id", "title", "artist", "act_id", "status", "legacy_code"]
+        terms = q.split()
+        hits = []
+        for i, text in enumerate(index.search_text):
+            if all(t in text for t in terms) and self._matches(index.songs[i], act, status):
+                hits.append(i)
+        # Exact title / code matches first, then catalog order
+        hits.sort(key=lambda i: ((index.songs[i].get("title") or "").casefold() != q and (index.songs[i].get("legacy_code") or "").casefold() != q))
+        full = self._full(query)
+        return {"q": q, "total": len(hits), "items": [_fields(index.songs[i], fields, full) for i in hits[:limit]]}
+
+    def facets(self, index: CatalogIndex, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        act, status = self._filters(query)
+        counts = {name: Counter() for name in ("act_id", "status", "artist", "genre", "platform")}
+        for song in index.songs:
+            if not self._matches(song, act, status):
+                continue
+            counts["act_id"][song.get("act_id") or "Unknown"] += 1
+            counts["status"][song.get("status") or "unknown"] += 1
+            counts["artist"][song.get("artist") or "Unknown"] += 1
+            counts["genre"][(song.get("musical_info") or {}).get("genre") or "Unknown"] += 1
+            counts["platform"].update(song_platforms(song))
+        return {name: dict(counter.most_common()) for name, counter in counts.items()}
+
+    # -- responses ------------------------------------------------------------
+
+    def respond(self, target: str, if_none_match: Optional[str] = None, accept_gzip: bool = False) -> Tuple[int, Dict[str, str], bytes]:
+        """(status, headers, body) for a GET request target like "/songs?page=2"."""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        cache_key = (url.path, "&".join(sorted(url.query.split("&"))))
+        try:
+            index = self.index()
+            with self._lock:
+                cached = self._cache.get(cache_key)
+                if cached:
+                    self._cache.move_to_end(cache_key)
+            if cached:
+                inc("read_api_cache_total", result="hit")
+                body, etag = cached
+            else:
+                inc("read_api_cache_total", result="miss")
+                endpoint = url.path.strip("/").split("/")[0]
+                with span("read_api.request", endpoint=endpoint if endpoint in ENDPOINTS else "other") as s:
+                    s.set(path=url.path)
+                    body = dumps(self.route(url.path, query, index))
+                etag = f'"{index.version}-{zlib.crc32(body):08x}"'
+                with self._lock:
+                    self._cache[cache_key] = (body, etag)
+                    if len(self._cache) > CACHE_SIZE:
+                        self._cache.popitem(last=False)
+        except NotFound as e:
+            return 404, {"Content-Type": "application/json"}, dumps({"error": str(e)})
+        except BadRequest as e:
+            return 400, {"Content-Type": "application/json"}, dumps({"error": str(e)})
+        except Exception as e:  # a bad song or bug must not drop the connection without a reply
+            inc("read_api_errors_total", endpoint=url.path.split("/")[1] if "/" in url.path else url.path)
+            traceback.print_exc(file=sys.stderr)
+            return 500, {"Content-Type": "application/json"}, dumps({"error": f"internal error: {type(e).__name__}"})
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return 304, headers, b""
+        headers["Content-Type"] = "application/json"
+        if accept_gzip and len(body) > GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        return 200, headers, body
+
+
+# =============================================================================
+# HTTP
+# =============================================================================
+
+def make_handler(api: ReadAPI):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, headers, body = api.respond(
+                self.path,
+                if_none_match=self.headers.get("If-None-Match"),
+                accept_gzip="gzip" in (self.headers.get("Accept-Encoding") or ""),
+            )
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, data_dir: Path = DATA_DIR) -> ThreadingHTTPServer:
+    """Build the server (call serve_forever() on it, or run it on a thread for tests)."""
+    api = ReadAPI(CatalogManager(data_dir))
+    return ThreadingHTTPServer((host, port), make_handler(api))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the catalog over a local read-only HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    server = serve(args.host, args.port, args.data_dir)
+    print(f"📚 Catalog read API on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
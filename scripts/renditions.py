@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Audio Renditions
+============================================
+Derived files for the website and pitching, made from each uploaded master:
+
+    preview   <stem>.preview.mp3   96 kbps stream for the website player
+    clip      <stem>.clip.mp3      30-second 128 kbps pitch clip with fades
+    peaks     <stem>.peaks.json    waveform peaks (audiowaveform JSON, 8-bit)
+
+They are uploaded next to the master under renditions/ and referenced in
+links (preview_path, clip_path, peaks_path) and tracks.json (stream, clip,
+peaks), so the player no longer has to pull a full WAV to start playing.
+
+Usage:
+    python renditions.py render ~/Music/Ridgemont-Upload/Completed/Song.wav --out /tmp/renditions
+    python renditions.py backfill                   # songs whose master is in Completed/ but have no renditions
+    python renditions.py backfill --workers 4 --limit 20
+
+Encoding runs in a process pool (RIDGEMONT_RENDITION_WORKERS, default: CPU
+count) so the watcher keeps uploading while ffmpeg works. MP3s need ffmpeg
+on PATH; without it only WAV peaks are produced and the other renditions are
+skipped, never failing the upload. numpy is imported by the worker
+processes only, so the watcher doesn't pay for it at startup.
+"""
+
+import os
+import sys
+import wave
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Dict, List, Optional, Any
+
+from codec import dumps
+
+
+RENDITIONS = ("preview", "clip", "peaks")
+SUFFIXES = {"preview": ".preview.mp3", "clip": ".clip.mp3", "peaks": ".peaks.json"}
+CONTENT_TYPES = {"preview": "audio/mpeg", "clip": "audio/mpeg", "peaks": "application/json"}
+PREVIEW_BITRATE = "96k"
+CLIP_BITRATE = "128k"
+CLIP_SECONDS = 30
+PEAKS_WIDTH = 1000          # min/max pairs per track
+PEAKS_SAMPLE_RATE = 8000    # decode rate for MP3 peaks
+WORKERS_ENV = "RIDGEMONT_RENDITION_WORKERS"
+
+
+def ffmpeg_path() -> Optional[str]:
+    return shutil.which("ffmpeg")
+
+
+def rendition_key(master_key: str, kind: str) -> str:
+    """'Artist/Album/Song.wav' -> 'Artist/Album/renditions/Song.preview.mp3'."""
+    folder, _, name = master_key.rpartition("/")
+    stem = name.rsplit(".", 1)[0]
+    return f"{folder}/renditions/{stem}{SUFFIXES[kind]}" if folder else f"renditions/{stem}{SUFFIXES[kind]}"
+
+
+# =============================================================================
+# DECODING
+# =============================================================================
+
+def _wav_samples(path: Path) -> Optional[tuple]:
+    """(mono float32 samples in [-1, 1], sample rate) for PCM WAV, None if wave can't read it."""
+    import numpy as np
+    try:
+        with wave.open(str(path), "rb") as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            raw = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None  # float or extensible WAV: leave it to ffmpeg
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = ((b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8).astype(np.float32) / 2 ** 23
+    else:
+        dtype = {2: np.int16, 4: np.int32}[width]
+        samples = np.frombuffer(raw, dtype=dtype).astype(np.float32) / float(np.iinfo(dtype).max)
+    if channels > 1:
+        samples = samples[: len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def _ffmpeg_samples(path: Path, ffmpeg: str) -> tuple:
+    """Decode anything ffmpeg reads to mono 16-bit PCM at PEAKS_SAMPLE_RATE."""
+    import numpy as np
+    raw = subprocess.run([ffmpeg, "-v", "error", "-i", str(path), "-vn", "-ac", "1", "-ar", str(PEAKS_SAMPLE_RATE),
+                          "-f", "s16le", "-"], check=True, capture_output=True).stdout
+    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32767, PEAKS_SAMPLE_RATE
+
+
+def waveform_peaks(samples: "np.ndarray", rate: int, width: int = PEAKS_WIDTH) -> Dict[str, Any]:
+    """audiowaveform-style JSON: interleaved min/max per pixel, 8-bit."""
+    import numpy as np
+    if samples.size == 0:
+        return {"version": 2, "channels": 1, "sample_rate": rate, "samples_per_pixel": 0, "bits": 8, "length": 0, "data": []}
+    per_pixel = max(1, -(-samples.size // width))
+    padded = np.pad(samples, (0, per_pixel * -(-samples.size // per_pixel) - samples.size))
+    buckets = padded.reshape(-1, per_pixel)
+    pairs = np.empty((buckets.shape[0], 2), dtype=np.int16)
+    pairs[:, 0] = np.clip(np.round(buckets.min(axis=1) * 127), -128, 127)
+    pairs[:, 1] = np.clip(np.round(buckets.max(axis=1) * 127), -128, 127)
+    return {"version": 2, "channels": 1, "sample_rate": rate, "samples_per_pixel": per_pixel, "bits": 8,
+            "length": int(buckets.shape[0]), "data": pairs.ravel().tolist()}
+
+
+# =============================================================================
+# RENDERING (runs in worker processes)
+# =============================================================================
+
+def clip_start(duration: Optional[float]) -> float:
+    """Start the pitch clip a third of the way in - past the intro, usually into the hook."""
+    if not duration or duration <= CLIP_SECONDS:
+        return 0.0
+    return round(min(duration / 3, duration - CLIP_SECONDS), 2)
+
+
+def render(master: Path, out_dir: Path, duration: Optional[float] = None) -> Dict[str, str]:
+    """Write the renditions for one master into out_dir. Returns kind -> file path (skipped kinds omitted)."""
+    master, out_dir = Path(master), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ffmpeg = ffmpeg_path()
+    stem = master.stem
+    made: Dict[str, str] = {}
+
+    decoded = _wav_samples(master) if master.suffix.lower() == ".wav" else None
+    if decoded is None and ffmpeg:
+        decoded = _ffmpeg_samples(master, ffmpeg)
+    if decoded is not None:
+        samples, rate = decoded
+        duration = duration or samples.size / rate
+        path = out_dir / f"{stem}{SUFFIXES['peaks']}"
+        path.write_bytes(dumps(waveform_peaks(samples, rate)))
+        made["peaks"] = str(path)
+
+    if ffmpeg:
+        path = out_dir / f"{stem}{SUFFIXES['preview']}"
+        subprocess.run([ffmpeg, "-v", "error", "-y", "-i", str(master), "-vn", "-map_metadata", "0",
+                        "-c:a", "libmp3lame", "-b:a", PREVIEW_BITRATE, str(path)], check=True, capture_output=True)
+        made["preview"] = str(path)
+        path = out_dir / f"{stem}{SUFFIXES['clip']}"
+        fade_out = max(0, min(CLIP_SECONDS, duration or CLIP_SECONDS) - 1)
+        subprocess.run([ffmpeg, "-v", "error", "-y", "-ss", str(clip_start(duration)), "-t", str(CLIP_SECONDS),
+                        "-i", str(master), "-vn", "-af", f"afade=t=in:d=1,afade=t=out:st={fade_out}:d=1",
+                        "-c:a", "libmp3lame", "-b:a", CLIP_BITRATE, str(path)], check=True, capture_output=True)
+        made["clip"] = str(path)
+    return made
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def rendition_pool() -> ProcessPoolExecutor:
+    """Shared process pool, created on first use."""
+    global _pool
+    if _pool is None:
+        workers = int(os.getenv(WORKERS_ENV, 0)) or os.cpu_count() or 2
+        _pool = ProcessPoolExecutor(max_workers=workers)
+    return _pool
+
+
+def submit(master: Path, out_dir: Path, duration: Optional[float] = None) -> Future:
+    return rendition_pool().submit(render, master, out_dir, duration)
+
+
+def upload_renditions(r2_client: Any, master_key: str, made: Dict[str, str]) -> Dict[str, str]:
+    """Upload rendered files next to the master. Returns the links entries (preview_path, ...)."""
+    links = {}
+    for kind in RENDITIONS:
+        if kind in made:
+            key = rendition_key(master_key, kind)
+            if r2_client.upload_file(Path(made[kind]), key, CONTENT_TYPES[kind]):
+                links[f"{kind}_path"] = key
+    return links
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def backfill(manager: Any, r2_client: Any, completed: Path, workers: Optional[int] = None,
+             limit: Optional[int] = None, work_dir: Optional[Path] = None) -> List[str]:
+    """Render and upload renditions for songs that lack them; one catalog save at the end."""
+    import tempfile
+    from r2_reconcile import index_masters, find_master
+
+    masters = index_masters(completed)
+    todo = []
+    for song in manager.catalog["songs"]:
+        links = song.get("links") or {}
+        if links.get("r2_path") and not links.get("preview_path"):
+            path = find_master(links["r2_path"], masters)
+            if path is not None:
+                todo.append((song, path))
+    todo = todo[:limit] if limit else todo
+    done: Dict[str, Dict[str, str]] = {}
+    work_dir = Path(work_dir or tempfile.mkdtemp(prefix="renditions-"))
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        futures = [(song, pool.submit(render, path, work_dir / song["song_id"],
+                                      (song.get("musical_info") or {}).get("duration_seconds"))) for song, path in todo]
+        for song, future in futures:
+            try:
+                links = upload_renditions(r2_client, song["links"]["r2_path"], future.result())
+            except Exception as e:  # one bad master (or a dead worker) must not lose the links already made
+                print(f"  ⚠️ {song['song_id']}: {type(e).__name__}: {e}")
+                continue
+            if links:
+                done[song["song_id"]] = links
+    shutil.rmtree(work_dir, ignore_errors=True)
+    manager.update_song_links(done)
+    return list(done)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Streaming previews, pitch clips and waveform peaks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    one = sub.add_parser("render")
+    one.add_argument("master", type=Path)
+    one.add_argument("--out", type=Path, default=Path("."))
+    fill = sub.add_parser("backfill")
+    fill.add_argument("--workers", type=int)
+    fill.add_argument("--limit", type=int)
+    args = parser.parse_args(argv)
+
+    if not ffmpeg_path():
+        print("⚠️ ffmpeg not found - only WAV waveform peaks will be produced")
+    if args.command == "render":
+        for kind, path in render(args.master, args.out).items():
+            print(f"  {kind:<8} {path}")
+        return
+
+    from catalog_manager import CatalogManager
+    from watch_and_upload import COMPLETED_FOLDER, get_r2_client
+    try:
+        r2_client = get_r2_client()
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    done = backfill(CatalogManager(), r2_client, COMPLETED_FOLDER, args.workers, args.limit)
+    print(f"🎚️ Renditions uploaded for {len(done)} song(s)")
+
+
+if __name__ == "__main__":
+    main()
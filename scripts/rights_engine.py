@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Rights Engine
+=========================================
+License availability and conflict checks over rights.licenses.
+
+Usage:
+    python rights_engine.py check RS-2026-0042 --territory UK --start 2026-01-01 --end 2026-06-30 [--exclusive]
+    python rights_engine.py available --territory Europe --start 2026-03-01 --end 2026-09-01
+    python rights_engine.py expiring --days 90
+    python rights_engine.py invalid                    # licenses with unreadable dates
+
+Rules:
+    - Two licenses collide when their territories overlap and their date
+      ranges overlap (inclusive; a missing end_date means open-ended).
+    - A non-exclusive deal is blocked only by exclusive licenses; an
+      exclusive deal is blocked by any license.
+    - "Worldwide" overlaps every territory, and a region overlaps the
+      territories inside it (TERRITORY_PARENTS: UK is in Europe, ...).
+    - A stored license whose start_date/end_date can't be read ("TBD") is
+      treated as open on that side, so it blocks rather than hides, and is
+      listed in RightsIndex.invalid. Only a bad query window raises.
+
+Index: per song and territory, licenses sorted by start day with a running
+max of end days, so "does anything overlap [A, B]" is one bisect plus one
+lookup, for all licenses and for exclusive ones separately. Expiry reports
+bisect a catalog-wide list sorted by end day.
+"""
+
+import gc
+import argparse
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from typing import Dict, List, Optional, Any, Iterable, Tuple, Union
+
+
+WORLDWIDE = "Worldwide"
+TERRITORY_PARENTS = {
+    "UK": "Europe", "Ireland": "Europe", "Germany": "Europe", "France": "Europe", "Spain": "Europe", "Italy": "Europe",
+    "USA": "North America", "US": "North America", "Canada": "North America",
+    "Mexico": "Latin America", "Brazil": "Latin America", "Argentina": "Latin America",
+    "Japan": "Asia", "China": "Asia", "India": "Asia", "South Korea": "Asia",
+    "Australia": "Oceania", "New Zealand": "Oceania",
+}
+OPEN_END = date.max.toordinal()
+OPEN_START = date.min.toordinal()
+DateLike = Union[str, date, datetime, None]
+
+
+class LicenseConflict(ValueError):
+    """A new license collides with existing ones (available as .conflicts)."""
+
+    def __init__(self, song_id: str, conflicts: List[Dict[str, Any]]):
+        self.song_id = song_id
+        self.conflicts = conflicts
+        names = ", ".join(f"{c.get('licensee', '?')} ({c.get('territory')}, {c.get('start_date')}–{c.get('end_date') or 'open'})" for c in conflicts)
+        super().__init__(f"{song_id} is already licensed: {names}")
+
+
+def day(value: DateLike, default: int = OPEN_START) -> int:
+    """Ordinal day of an ISO date/datetime string or date; default when empty."""
+    if value is None or value == "":
+        return default
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def license_start(license: Dict[str, Any]) -> DateLike:
+    """First day a license covers: its start_date, else the day it was recorded, else today."""
+    return license.get("start_date") or license.get("created") or date.today()
+
+
+def license_days(license: Dict[str, Any]) -> Tuple[int, int, List[str]]:
+    """(start, end) ordinal days of a stored license, plus the fields that couldn't be read
+    (an unreadable start counts as OPEN_START, an unreadable end as OPEN_END)."""
+    bad = []
+    try:
+        start = day(license_start(license))
+    except (TypeError, ValueError):
+        start = OPEN_START
+        bad.append("start_date")
+    try:
+        end = day(license.get("end_date"), OPEN_END)
+    except (TypeError, ValueError):
+        end = OPEN_END
+        bad.append("end_date")
+    return start, end, bad
+
+
+def territory_path(territory: Optional[str]) -> List[str]:
+    """The territory and every region containing it, up to Worldwide."""
+    territory = (territory or WORLDWIDE).strip() or WORLDWIDE
+    path = [territory]
+    while path[-1] in TERRITORY_PARENTS:
+        path.append(TERRITORY_PARENTS[path[-1]])
+    if path[-1] != WORLDWIDE:
+        path.append(WORLDWIDE)
+    return path
+
+
+def territories_overlap(a: Optional[str], b: Optional[str]) -> bool:
+    return (a or WORLDWIDE) in territory_path(b) or (b or WORLDWIDE) in territory_path(a)
+
+
+# =============================================================================
+# INTERVAL INDEX
+# =============================================================================
+
+class IntervalList:
+    """Intervals sorted by start, with a prefix max of ends for O(log n) overlap tests."""
+
+    __slots__ = ("starts", "ends", "max_end", "items")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.max_end: List[int] = []
+        self.items: List[Dict[str, Any]] = []
+
+    def add(self, start: int, end: int, item: Dict[str, Any]) -> None:
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.items.insert(i, item)
+        self.max_end[i:] = []
+        running = self.max_end[-1] if self.max_end else OPEN_START
+        for e in self.ends[i:]:
+            running = max(running, e)
+            self.max_end.append(running)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        k = bisect_right(self.starts, end)
+        return k > 0 and self.max_end[k - 1] >= start
+
+    def overlapping(self, start: int, end: int) -> List[Dict[str, Any]]:
+        k = bisect_right(self.starts, end)
+        return [self.items[i] for i in range(k) if self.ends[i] >= start]
+
+
+class SongRights:
+    """One song's licenses, indexed per territory (all and exclusive-only)."""
+
+    __slots__ = ("all", "exclusive")
+
+    def __init__(self):
+        self.all: Dict[str, IntervalList] = {}
+        self.exclusive: Dict[str, IntervalList] = {}
+
+    def add(self, license: Dict[str, Any], start: int, end: int) -> None:
+        territory = (license.get("territory") or WORLDWIDE).strip() or WORLDWIDE
+        self.all.setdefault(territory, IntervalList()).add(start, end, license)
+        if license.get("exclusive"):
+            self.exclusive.setdefault(territory, IntervalList()).add(start, end, license)
+
+    def _relevant(self, table: Dict[str, IntervalList], territory: str) -> Iterable[IntervalList]:
+        """Index lists whose territory overlaps the queried one."""
+        path = territory_path(territory)
+        for name, intervals in table.items():
+            if name in path or path[0] in territory_path(name):
+                yield intervals
+
+    def blocked(self, territory: str, start: int, end: int, exclusive: bool) -> bool:
+        table = self.all if exclusive else self.exclusive
+        return any(iv.overlaps(start, end) for iv in self._relevant(table, territory))
+
+    def conflicts(self, territory: str, start: int, end: int, exclusive: bool) -> List[Dict[str, Any]]:
+        table = self.all if exclusive else self.exclusive
+        return [item for iv in self._relevant(table, territory) for item in iv.overlapping(start, end)]
+
+
+class RightsIndex:
+    """Interval index over every song's rights.licenses."""
+
+    def __init__(self):
+        self.songs: Dict[str, SongRights] = {}
+        self._by_end: List[Tuple[int, str, str]] = []
+        self._licenses: Dict[str, Dict[str, Any]] = {}
+        self.invalid: List[Dict[str, Any]] = []  # licenses with unreadable dates (see license_days)
+
+    @classmethod
+    def from_songs(cls, songs: Iterable[Dict[str, Any]]) -> "RightsIndex":
+        index = cls()
+        # Many small containers: pause the cyclic GC like codec.loads does
+        paused = gc.isenabled()
+        gc.disable()
+        try:
+            for song in songs:
+                for license in (song.get("rights") or {}).get("licenses") or []:
+                    index.add_license(song.get("song_id"), license, _sorted=False)
+        finally:
+            if paused:
+                gc.enable()
+        index._by_end.sort()
+        if index.invalid:
+            print(f"⚠️ {len(index.invalid)} license(s) with unreadable dates, treated as open-ended "
+                  f"(python rights_engine.py invalid)")
+        return index
+
+    def add_license(self, song_id: str, license: Dict[str, Any], _sorted: bool = True) -> None:
+        start, end, bad = license_days(license)
+        self.songs.setdefault(song_id, SongRights()).add(license, start, end)
+        key = license.get("license_id") or f"{song_id}#{len(self._licenses)}"
+        self._licenses[key] = {"song_id": song_id, **license}
+        for field in bad:
+            self.invalid.append({"song_id": song_id, "license_id": key, "field": field, "value": license.get(field)})
+        entry = (end, song_id, key)
+        if _sorted:
+            insort(self._by_end, entry)
+        else:
+            self._by_end.append(entry)
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def is_clearable(self, song_id: str, territory: str = WORLDWIDE, start: DateLike = None,
+                     end: DateLike = None, exclusive: bool = False) -> bool:
+        """Can song_id be licensed for territory between start and end (default: today, open-ended)?"""
+        rights = self.songs.get(song_id)
+        if rights is None:
+            return True
+        a, b = self._window(start, end)
+        return not rights.blocked(territory, a, b, exclusive)
+
+    def conflicts(self, song_id: str, territory: str = WORLDWIDE, start: DateLike = None,
+                  end: DateLike = None, exclusive: bool = False) -> List[Dict[str, Any]]:
+        """The existing licenses that block such a deal."""
+        rights = self.songs.get(song_id)
+        if rights is None:
+            return []
+        a, b = self._window(start, end)
+        return rights.conflicts(territory, a, b, exclusive)
+
+    def check_license(self, song_id: str, license: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Conflicts a proposed license dict (territory/start_date/end_date/exclusive) would cause."""
+        return self.conflicts(song_id, license.get("territory") or WORLDWIDE, license_start(license),
+                              license.get("end_date"), bool(license.get("exclusive")))
+
+    def availability(self, song_ids: Iterable[str], territory: str = WORLDWIDE, start: DateLike = None,
+                     end: DateLike = None, exclusive: bool = False) -> Dict[str, bool]:
+        """Batch is_clearable for a shortlist (or the whole catalog)."""
+        a, b = self._window(start, end)
+        result = {}
+        for song_id in song_ids:
+            rights = self.songs.get(song_id)
+            result[song_id] = rights is None or not rights.blocked(territory, a, b, exclusive)
+        return result
+
+    def exclusively_licensed(self, song_id: str, territory: str = WORLDWIDE, on: DateLike = None) -> List[Dict[str, Any]]:
+        """Exclusive licenses in force on a day (default today) that overlap territory."""
+        return self.conflicts(song_id, territory, on or date.today(), on or date.today(), exclusive=False)
+
+    def expiring(self, within_days: int = 90, today: DateLike = None) -> List[Dict[str, Any]]:
+        """Licenses ending between today and today + within_days, soonest first."""
+        start = day(today or date.today())
+        lo = bisect_left(self._by_end, (start,))
+        hi = bisect_left(self._by_end, (start + within_days + 1,))
+        out = []
+        for end, song_id, key in self._by_end[lo:hi]:
+            license = self._licenses[key]
+            out.append({**license, "days_left": end - start})
+        return out
+
+    @staticmethod
+    def _window(start: DateLike, end: DateLike) -> Tuple[int, int]:
+        a = day(start or date.today())
+        b = day(end, OPEN_END)
+        if b < a:
+            raise ValueError("end date is before start date")
+        return a, b
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from catalog_manager import CatalogManager
+
+    parser = argparse.ArgumentParser(description="License availability, conflicts and expiry.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("check", "available"):
+        cmd = sub.add_parser(name)
+        if name == "check":
+            cmd.add_argument("song_id")
+        cmd.add_argument("--territory", default=WORLDWIDE)
+        cmd.add_argument("--start", help="YYYY-MM-DD (default: today)")
+        cmd.add_argument("--end", help="YYYY-MM-DD (default: open-ended)")
+        cmd.add_argument("--exclusive", action="store_true")
+    expiring = sub.add_parser("expiring")
+    expiring.add_argument("--days", type=int, default=90)
+    sub.add_parser("invalid")
+    args = parser.parse_args(argv)
+
+    manager = CatalogManager()
+    index = manager.rights_index()
+    if args.command == "check":
+        conflicts = index.conflicts(args.song_id, args.territory, args.start, args.end, args.exclusive)
+        if not conflicts:
+            print(f"✅ {args.song_id} is clearable for {args.territory}")
+        for c in conflicts:
+            print(f"⛔ {c.get('licensee')} - {c.get('territory')} {c.get('start_date')}–{c.get('end_date') or 'open'}"
+                  f"{' (exclusive)' if c.get('exclusive') else ''}")
+    elif args.command == "available":
+        songs = manager.catalog["songs"]
+        result = index.availability((s["song_id"] for s in songs), args.territory, args.start, args.end, args.exclusive)
+        for song in songs:
+            if result[song["song_id"]]:
+                print(f"  {song['song_id']}  {song.get('title', '')}")
+        print(f"✅ {sum(result.values())} of {len(result)} songs clearable for {args.territory}")
+    elif args.command == "invalid":
+        for item in index.invalid:
+            print(f"  {item['song_id']}  {item['license_id']}  {item['field']}={item['value']!r}")
+        print(f"{'⚠️' if index.invalid else '✅'} {len(index.invalid)} unreadable license date(s)")
+    else:
+        for item in index.expiring(args.days):
+            print(f"  {item['end_date']}  {item['days_left']:>4}d  {item['song_id']}  {item.get('licensee', '')} ({item.get('territory')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Royalty Statements
+==============================================
+Writer split validation and per-writer payout statements.
+
+Usage:
+    python royalties.py validate                  # songs whose splits don't add up
+    python royalties.py statements 2026Q1         # statements/2026Q1/<writer>.csv + summary.csv
+    python royalties.py statements 2026-05 --act FC
+    python royalties.py statements 2026           # whole year
+
+Income ledger (one row per dated income item):
+    - license fees: rights.licenses[].fee, dated by start_date
+    - revenue.income[]: {"date", "amount", "source"} entries, when present
+revenue.total_earned is an undated running total and is not split by period.
+
+Payouts: every ledger row is joined with the song's writer splits
+(percentage / 100). Shares that don't reach 100% - including songs with no
+writers at all - go to the UNALLOCATED line, so statement totals always
+reconcile with the ledger. The whole catalog is processed as one flattened
+frame (merge + groupby), so every writer's statement comes out of one pass.
+"""
+
+import argparse
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+import pandas as pd
+
+
+UNALLOCATED = "UNALLOCATED"
+SPLIT_TOLERANCE = 0.01
+LEDGER_COLUMNS = ["song_id", "title", "act_id", "date", "source", "counterparty", "amount"]
+
+
+def period_bounds(period: str) -> Tuple[date, date]:
+    """'2026Q1', '2026-05' or '2026' -> (first day, last day)."""
+    period = period.strip().upper()
+    if "Q" in period:
+        year, quarter = period.split("Q")
+        first_month = (int(quarter) - 1) * 3 + 1
+        if not 1 <= first_month <= 10:
+            raise ValueError(f"Bad quarter in '{period}'")
+        start = date(int(year.rstrip("-")), first_month, 1)
+        months = 3
+    elif "-" in period:
+        year, month = period.split("-")[:2]
+        start, months = date(int(year), int(month), 1), 1
+    else:
+        start, months = date(int(period), 1, 1), 12
+    end_month = start.month + months
+    end = date(start.year + (end_month - 1) // 12, (end_month - 1) % 12 + 1, 1)
+    return start, date.fromordinal(end.toordinal() - 1)
+
+
+# =============================================================================
+# FLATTENING
+# =============================================================================
+
+def splits_frame(songs: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """One row per (song, writer) with share = percentage / 100."""
+    song_ids, writer_ids, roles, percentages = [], [], [], []
+    for song in songs:
+        for writer in song.get("writers") or []:
+            song_ids.append(song.get("song_id"))
+            writer_ids.append(writer.get("writer_id") or "")
+            roles.append(writer.get("role") or "")
+            percentages.append(writer.get("percentage"))
+    frame = pd.DataFrame({"song_id": song_ids, "writer_id": writer_ids, "role": roles,
+                          "percentage": pd.to_numeric(pd.Series(percentages, dtype=object), errors="coerce")})
+    frame["share"] = frame["percentage"] / 100
+    return frame
+
+
+def revenue_ledger(songs: Iterable[Dict[str, Any]], start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+    """Dated income rows across the catalog, optionally limited to [start, end]."""
+    rows: Dict[str, List[Any]] = {c: [] for c in LEDGER_COLUMNS}
+
+    def add(song, when, source, counterparty, amount):
+        rows["song_id"].append(song.get("song_id"))
+        rows["title"].append(song.get("title", ""))
+        rows["act_id"].append(song.get("act_id", ""))
+        rows["date"].append(str(when or "")[:10])
+        rows["source"].append(source)
+        rows["counterparty"].append(counterparty or "")
+        rows["amount"].append(amount)
+
+    for song in songs:
+        for license in (song.get("rights") or {}).get("licenses") or []:
+            if license.get("fee"):
+                add(song, license.get("start_date") or license.get("created"), f"license:{license.get('type') or 'sync'}",
+                    license.get("licensee"), license.get("fee"))
+        for item in (song.get("revenue") or {}).get("income") or []:
+            add(song, item.get("date"), item.get("source") or "income", item.get("payer"), item.get("amount"))
+
+    ledger = pd.DataFrame(rows)
+    ledger["amount"] = pd.to_numeric(ledger["amount"], errors="coerce").fillna(0.0)
+    if start is not None:
+        ledger = ledger[ledger["date"] >= start.isoformat()]
+    if end is not None:
+        ledger = ledger[(ledger["date"] != "") & (ledger["date"] <= end.isoformat())]
+    return ledger.reset_index(drop=True)
+
+
+# =============================================================================
+# VALIDATION
+# =============================================================================
+
+def validate_splits(songs: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Songs with missing writers, bad/duplicate entries, or shares not summing to 100%."""
+    catalog = pd.DataFrame({"song_id": [s.get("song_id") for s in songs],
+                            "title": [s.get("title", "") for s in songs],
+                            "act_id": [s.get("act_id", "") for s in songs]})
+    splits = splits_frame(songs)
+    # Flag rows as columns first, so one groupby sum replaces per-group Python callbacks
+    checks = pd.DataFrame({
+        "song_id": splits["song_id"],
+        "writers": 1,
+        "total": splits["percentage"],
+        "invalid": splits["percentage"].isna() | (splits["percentage"] < 0),
+        "unnamed": splits["writer_id"] == "",
+        "duplicates": splits.duplicated(["song_id", "writer_id"]),
+    })
+    per_song = checks.groupby("song_id").sum()
+    report = catalog.join(per_song, on="song_id")
+    report["writers"] = report["writers"].fillna(0).astype(int)
+    report["total"] = report["total"].fillna(0.0)
+    issues = pd.Series("", index=report.index)
+    issues = issues.mask(report["writers"] == 0, "no writers")
+    issues = issues.mask((report["writers"] > 0) & ((report["total"] - 100).abs() > SPLIT_TOLERANCE),
+                         "splits total " + report["total"].round(2).astype(str) + "%")
+    issues = issues.mask(report["invalid"].fillna(0) > 0, "missing or negative percentage")
+    issues = issues.mask(report["unnamed"].fillna(0) > 0, "writer without writer_id")
+    issues = issues.mask(report["duplicates"].fillna(0) > 0, "writer listed twice")
+    report["issue"] = issues
+    return report.loc[report["issue"] != "", ["song_id", "title", "act_id", "writers", "total", "issue"]].reset_index(drop=True)
+
+
+# =============================================================================
+# STATEMENTS
+# =============================================================================
+
+def allocate(ledger: pd.DataFrame, splits: pd.DataFrame) -> pd.DataFrame:
+    """Ledger x splits: one row per income item and writer, with the writer's payout."""
+    splits = splits[["song_id", "writer_id", "role", "share"]]
+    splits = splits[splits["share"].notna() & (splits["share"] > 0)]
+    # Whatever the splits leave unassigned (or over-assign) goes to UNALLOCATED
+    assigned = splits.groupby("song_id")["share"].sum()
+    remainder = (1 - assigned.reindex(ledger["song_id"].unique(), fill_value=0.0)).round(6)
+    remainder = remainder[remainder.abs() > SPLIT_TOLERANCE / 100]
+    unallocated = pd.DataFrame({"song_id": remainder.index, "writer_id": UNALLOCATED, "role": "", "share": remainder.values})
+    shares = pd.concat([splits, unallocated], ignore_index=True)
+    lines = ledger.merge(shares, on="song_id", how="inner")
+    lines["payout"] = (lines["amount"] * lines["share"]).round(2)
+    return lines
+
+
+def payouts(songs: List[Dict[str, Any]], start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+    return allocate(revenue_ledger(songs, start, end), splits_frame(songs))
+
+
+def writer_statements(songs: List[Dict[str, Any]], period: str,
+                      writer_names: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Per-writer statement lines plus a summary for one period ('2026Q1', '2026-05', '2026')."""
+    start, end = period_bounds(period)
+    ledger = revenue_ledger(songs, start, end)
+    lines = allocate(ledger, splits_frame(songs))
+    by_line = (lines.groupby(["writer_id", "song_id", "title", "source"], as_index=False)
+               .agg(gross=("amount", "sum"), share=("share", "first"), payout=("payout", "sum"), items=("amount", "size")))
+    summary = (lines.groupby("writer_id", as_index=False)
+               .agg(songs=("song_id", "nunique"), items=("amount", "size"), payout=("payout", "sum"))
+               .sort_values("payout", ascending=False, kind="stable"))
+    names = writer_names or {}
+    summary.insert(1, "name", summary["writer_id"].map(lambda w: names.get(w, "")))
+    return {
+        "period": period.upper(),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "gross": round(float(ledger["amount"].sum()), 2),
+        "summary": summary.reset_index(drop=True),
+        "statements": {writer: frame.drop(columns="writer_id").reset_index(drop=True) for writer, frame in by_line.groupby("writer_id")},
+    }
+
+
+def write_statements(result: Dict[str, Any], out_dir: Path) -> List[Path]:
+    """statements/<period>/<writer_id>.csv and summary.csv."""
+    folder = Path(out_dir) / result["period"]
+    folder.mkdir(parents=True, exist_ok=True)
+    written = []
+    for writer, frame in result["statements"].items():
+        path = folder / f"{writer}.csv"
+        frame.to_csv(path, index=False)
+        written.append(path)
+    path = folder / "summary.csv"
+    result["summary"].to_csv(path, index=False)
+    written.append(path)
+    return written
+
+
+def writer_names_from(manager: Any) -> Dict[str, str]:
+    """writer_id -> name from data/writers.json, if the manager loaded one."""
+    writers = getattr(manager, "writers", None) or {}
+    entries = writers.get("writers", []) if isinstance(writers, dict) else writers
+    return {w.get("writer_id") or w.get("id"): w.get("name", "") for w in entries if isinstance(w, dict)}
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from catalog_manager import CatalogManager, STATEMENTS_DIR
+
+    parser = argparse.ArgumentParser(description="Writer split validation and royalty statements.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("validate")
+    statements = sub.add_parser("statements")
+    statements.add_argument("period", help="2026Q1, 2026-05 or 2026")
+    statements.add_argument("--act", help="limit to one act (FC/PB/BS or full ID)")
+    statements.add_argument("--out", type=Path, default=STATEMENTS_DIR)
+    args = parser.parse_args(argv)
+
+    manager = CatalogManager()
+    if args.command == "validate":
+        songs = manager.catalog["songs"]
+        report = validate_splits(songs)
+        for row in report.itertuples(index=False):
+            print(f"  ⚠️ {row.song_id}  {row.title:<32} {row.issue}")
+        print(f"{len(report)} of {len(songs)} songs need split fixes")
+        return
+    # one act's statements only need that act's songs (a single shard with the sharded store)
+    songs = manager.act_catalog(args.act)["songs"] if args.act else manager.catalog["songs"]
+    result = writer_statements(songs, args.period, writer_names_from(manager))
+    for row in result["summary"].itertuples(index=False):
+        print(f"  {row.writer_id:<12} {row.name:<24} {row.songs:>5} songs  ${row.payout:>12,.2f}")
+    paths = write_statements(result, args.out)
+    print(f"💵 {result['period']}: ${result['gross']:,.2f} gross → {len(paths) - 1} statement(s) in {paths[-1].parent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Supervisor CRM Store
+================================================
+Music supervisor contacts with indexed lookup and an append-only pitch log.
+
+Files (in data/):
+    supervisors.json     Contact records only: {"supervisors": [{id, name, email, ...}]}
+    pitch_history.jsonl  One pitch per line, appended - never rewritten
+
+Contacts are indexed by ID, casefolded name and casefolded email. While the
+pitch log is read at startup, per-supervisor aggregates ("songs already
+pitched", "last contact") are built once and then kept current on every
+append, so campaign dedup checks are O(1) lookups.
+
+Older supervisors.json files that still embed a "history" list per contact
+are read as they are (those pitches count for dedup and last contact);
+migrate() moves them into the pitch log:
+
+    python supervisor_store.py migrate
+"""
+
+import os
+import json
+import argparse
+from datetime import datetime
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
+
+from metrics import inc, record_file_write
+
+
+CONTACTS_FILE = "supervisors.json"
+PITCH_LOG_FILE = "pitch_history.jsonl"
+PLACEHOLDER_EMAILS = {"", "tbd", "email@example.com"}
+
+
+def _key(text: Optional[str]) -> str:
+    return (text or "").strip().casefold()
+
+
+class SupervisorStore:
+    """Supervisor contacts plus precomputed pitch-history analytics."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.contacts_path = self.data_dir / CONTACTS_FILE
+        self.log_path = self.data_dir / PITCH_LOG_FILE
+        self.document: Dict[str, List[Dict[str, Any]]] = {"supervisors": []}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_email: Dict[str, Dict[str, Any]] = {}
+        self._history: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._pitched: Dict[str, Set[str]] = defaultdict(set)
+        self._last_contact: Dict[str, str] = {}
+        self._dirty = False
+        self._signature: Tuple = ()
+        self._load()
+
+    # =========================================================================
+    # LOADING
+    # =========================================================================
+
+    def _load(self) -> None:
+        self._signature = self.signature()
+        if self.contacts_path.exists():
+            with open(self.contacts_path, "r") as f:
+                self.document = json.load(f)
+        self.document.setdefault("supervisors", [])
+        for contact in self.document["supervisors"]:
+            self._index(contact)
+
+        for entry in self._read_log():
+            self._apply(entry)
+
+        # Legacy embedded histories count for analytics but are only moved into the log by migrate()
+        legacy = self._legacy_entries()
+        if legacy:
+            logged = self._logged_keys()
+            for entry in legacy:
+                if self._pitch_key(entry) not in logged:
+                    self._apply(entry)
+
+    def _read_log(self) -> Iterable[Dict[str, Any]]:
+        if self.log_path.exists():
+            with open(self.log_path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def _logged_keys(self) -> Set[tuple]:
+        return {self._pitch_key(e) for e in self._read_log()}
+
+    def _legacy_entries(self) -> List[Dict[str, Any]]:
+        """Pitch-log entries for the history lists older supervisors.json files embed per contact."""
+        return [{
+            "date": item.get("date"),
+            "supervisor_id": contact["id"],
+            "song_id": item.get("song_id"),
+            "song": item.get("song"),
+            "project": item.get("project", "General Pitch"),
+        } for contact in self.contacts if "history" in contact for item in contact["history"] or []]
+
+    def signature(self) -> Tuple:
+        """(size, mtime) of the contacts file and the pitch log; changes when any process writes them."""
+        stamps = []
+        for path in (self.contacts_path, self.log_path):
+            try:
+                st = path.stat()
+                stamps.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def reload_if_changed(self) -> bool:
+        """Re-read contacts and pitch log if another process wrote them since we loaded or saved.
+
+        Unsaved contact edits win: a dirty store is left alone until it has been saved.
+        """
+        if self._dirty or self.signature() == self._signature:
+            return False
+        self._reload()
+        return True
+
+    def _reload(self) -> None:
+        self.document = {"supervisors": []}
+        for table in (self._by_id, self._by_name, self._by_email, self._history, self._pitched, self._last_contact):
+            table.clear()
+        self._load()
+
+    def migrate(self) -> int:
+        """Move legacy per-contact history lists into the pitch log and rewrite supervisors.json without them.
+
+        Pitches already in the log are skipped, so a re-run after a crash
+        between the append and the contacts rewrite doesn't duplicate them.
+        Returns the number of pitches moved.
+        """
+        if not any("history" in c for c in self.contacts):
+            return 0
+        logged = self._logged_keys()
+        entries = [e for e in self._legacy_entries() if self._pitch_key(e) not in logged]
+        self.log_pitches(entries)
+        for contact in self.contacts:
+            contact.pop("history", None)
+        self._dirty = True
+        self.save_contacts()
+        self._reload()  # the legacy pitches were already counted in memory
+        return len(entries)
+
+    @staticmethod
+    def _pitch_key(entry: Dict[str, Any]) -> tuple:
+        return (entry["supervisor_id"], entry.get("song_id") or _key(entry.get("song")), entry.get("date"))
+
+    def _index(self, contact: Dict[str, Any]) -> None:
+        self._by_id[contact["id"]] = contact
+        self._by_name[_key(contact.get("name"))] = contact
+        email = _key(contact.get("email"))
+        if email not in PLACEHOLDER_EMAILS:
+            self._by_email[email] = contact
+
+    def _unindex(self, contact: Dict[str, Any]) -> None:
+        # Only drop keys that still point at this contact; a duplicate name/email may own them
+        for table, key in ((self._by_name, _key(contact.get("name"))), (self._by_email, _key(contact.get("email")))):
+            if table.get(key) is contact:
+                del table[key]
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        sup_id = entry["supervisor_id"]
+        self._history[sup_id].append(entry)
+        self._pitched[sup_id].add(entry.get("song_id") or _key(entry.get("song")))
+        date = entry.get("date") or ""
+        if date > self._last_contact.get(sup_id, ""):
+            self._last_contact[sup_id] = date
+
+    # =========================================================================
+    # CONTACTS
+    # =========================================================================
+
+    @property
+    def contacts(self) -> List[Dict[str, Any]]:
+        return self.document["supervisors"]
+
+    def get(self, supervisor_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(supervisor_id)
+
+    def find_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._by_name.get(_key(name))
+
+    def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        return self._by_email.get(_key(email))
+
+    def find(self, name_or_email: str) -> Optional[Dict[str, Any]]:
+        """Look a contact up by email (if it looks like one) or by name."""
+        if "@" in name_or_email:
+            return self.find_by_email(name_or_email) or self.find_by_name(name_or_email)
+        return self.find_by_name(name_or_email)
+
+    def _new_id(self) -> str:
+        import uuid  # uuid imports platform: keep it off the startup path
+        while True:
+            supervisor_id = f"SUP-{uuid.uuid4().hex[:8].upper()}"
+            if supervisor_id not in self._by_id:
+                return supervisor_id
+
+    def get_or_create(self, name: str, email: Optional[str] = None, **fields: Any) -> Tuple[Dict[str, Any], bool]:
+        """Returns (contact, created). New contacts are saved by save_contacts()."""
+        existing = (self.find_by_email(email) if email else None) or self.find_by_name(name)
+        if existing:
+            return existing, False
+        contact = {"id": self._new_id(), "name": name.strip(), "email": email or "TBD", **fields}
+        self.contacts.append(contact)
+        self._index(contact)
+        self._dirty = True
+        return contact, True
+
+    def update_contact(self, supervisor_id: str, **fields: Any) -> bool:
+        contact = self.get(supervisor_id)
+        if not contact:
+            return False
+        self._unindex(contact)
+        contact.update(fields)
+        self._index(contact)
+        self._dirty = True
+        return True
+
+    def save_contacts(self, force: bool = False) -> bool:
+        """Rewrite supervisors.json if contacts changed. Pitches never trigger this."""
+        if not (self._dirty or force):
+            return False
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.contacts_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.document, f, indent=2, default=str)
+        os.replace(tmp, self.contacts_path)
+        record_file_write(self.contacts_path)
+        self._dirty = False
+        self._signature = self.signature()
+        return True
+
+    # =========================================================================
+    # PITCH LOG
+    # =========================================================================
+
+    def log_pitches(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Append pitch entries to the log in a single write.
+
+        Each entry needs supervisor_id plus song_id and/or song (title);
+        date and timestamp default to now.
+        """
+        now = datetime.now()
+        lines, applied = [], []
+        for entry in entries:
+            entry = {"timestamp": now.isoformat(), "date": now.strftime("%Y-%m-%d"), **entry}
+            lines.append(json.dumps(entry, default=str, ensure_ascii=False))
+            applied.append(entry)
+        if not lines:
+            return 0
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        payload = "\n".join(lines) + "\n"
+        current = self.signature() == self._signature  # else another writer's pitches are still to be read
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(payload)
+        inc("bytes_written_total", len(payload.encode("utf-8")), target=PITCH_LOG_FILE)
+        for entry in applied:
+            self._apply(entry)
+        if current:
+            self._signature = self.signature()
+        return len(applied)
+
+    def log_pitch(self, supervisor_id: str, song: Dict[str, Any], project: str = "General Pitch") -> Dict[str, Any]:
+        entry = {"supervisor_id": supervisor_id, "song_id": song.get("song_id"), "song": song.get("title"), "project": project}
+        self.log_pitches([entry])
+        return self._history[supervisor_id][-1]
+
+    # =========================================================================
+    # ANALYTICS
+    # =========================================================================
+
+    def history(self, supervisor_id: str) -> List[Dict[str, Any]]:
+        return list(self._history.get(supervisor_id, []))
+
+    def was_pitched(self, supervisor_id: str, song: Dict[str, Any]) -> bool:
+        """O(1): has this song already gone to this supervisor?"""
+        pitched = self._pitched.get(supervisor_id)
+        if not pitched:
+            return False
+        return song.get("song_id") in pitched or _key(song.get("title")) in pitched
+
+    def songs_pitched_to(self, supervisor_id: str) -> Set[str]:
+        """Song IDs (or casefolded titles for migrated entries) pitched to a supervisor."""
+        return set(self._pitched.get(supervisor_id, ()))
+
+    def last_contact(self, supervisor_id: str) -> Optional[str]:
+        return self._last_contact.get(supervisor_id)
+
+    def last_contact_report(self) -> List[Dict[str, Any]]:
+        """One row per contact, most recently contacted first."""
+        rows = [{
+            "id": c["id"],
+            "name": c.get("name"),
+            "email": c.get("email"),
+            "pitches": len(self._history.get(c["id"], [])),
+            "last_contact": self._last_contact.get(c["id"]),
+        } for c in self.contacts]
+        rows.sort(key=lambda r: r["last_contact"] or "", reverse=True)
+        return rows
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from catalog_manager import DATA_DIR
+
+    parser = argparse.ArgumentParser(description="Supervisor contacts and pitch log.")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="move legacy per-contact history into the pitch log")
+    args = parser.parse_args(argv)
+
+    store = SupervisorStore(args.data_dir)
+    if args.command == "migrate":
+        moved = store.migrate()
+        print(f"📇 Moved {moved} pitch(es) into {store.log_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Ridgemont Catalog Manager - Synthetic Catalog Generator
+=======================================================
+Generates catalogs in the data/catalog.json schema for benchmarking.
+
+Usage:
+    python synthetic_catalog.py 10000 /tmp/bench/catalog.json
+    python synthetic_catalog.py 100000 out.json --seed 7
+
+Songs carry realistic nested rights (licenses), events, deployments and
+revenue (expenses), with a fixed seed so runs are reproducible.
+"""
+
+import json
+import random
+import string
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+ACTS = [
+    ("FROZEN_CLOUD", "Frozen Cloud", 0.45),
+    ("PARK_BELLEVUE", "Park Bellevue", 0.25),
+    ("BAJAN_SUN", "Bajan Sun", 0.2),
+    ("STONE_MERIDIAN", "Stone Meridian", 0.05),
+    ("FUEGO_URBANO", "Fuego Urbano", 0.05),
+]
+STATUSES = ["idea", "demo", "mixing", "mastered", "copyright", "released"]
+GENRES = ["Pop", "Rock", "Reggae", "Soul", "Electronic", "Folk", "Banda", "Hip Hop"]
+MOODS = ["upbeat", "fun", "dark", "romantic", "driving", "melancholy", "epic", "chill", "tense"]
+DISTRIBUTORS = ["DistroKid", "TuneCore", "CD Baby", "Amuse", "AWAL", "Ditto"]
+SYNC_LIBS = ["Songtradr", "Music Gateway", "Pond5", "Disco", "Taxi", "Musicbed", "Artlist"]
+STREAMING = ["Spotify", "Apple Music", "Amazon", "YouTube", "Tidal", "Deezer", "Pandora"]
+TERRITORIES = ["Worldwide", "North America", "Europe", "UK", "Asia", "Latin America"]
+LICENSEES = ["Universal Pictures", "Nike", "Netflix", "HBO", "Ubisoft", "Toyota", "BBC"]
+EVENT_TYPES = ["updated", "placement", "license_added", "pitched", "status_change"]
+WORDS = ("down road journey night fire river light shadow summer city heart dream ocean storm golden "
+         "echo silver wild broken midnight sun rain home lost street glass velvet electric").split()
+SPLITS = {
+    "FROZEN_CLOUD": [{"writer_id": "W-0001", "percentage": 50}, {"writer_id": "W-0002", "percentage": 50}],
+    "PARK_BELLEVUE": [{"writer_id": "W-0001", "percentage": 50}, {"writer_id": "W-0003", "percentage": 50}],
+}
+
+
+def _pick_act(rng: random.Random):
+    roll, acc = rng.random(), 0.0
+    for act in ACTS:
+        acc += act[2]
+        if roll <= acc:
+            return act
+    return ACTS[0]
+
+
+def _timestamp(rng: random.Random, start: datetime, days: int) -> datetime:
+    return start + timedelta(days=rng.randint(0, days), seconds=rng.randint(0, 86399))
+
+
+def synthetic_song(rng: random.Random, index: int) -> Dict[str, Any]:
+    """One song with the same shape as a fully populated catalog.json entry."""
+    act_id, artist, _ = _pick_act(rng)
+    created = _timestamp(rng, datetime(2002, 1, 1), 365 * 24)
+    modified = created + timedelta(days=rng.randint(0, 400))
+    title = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 4)))
+    status = rng.choice(STATUSES)
+
+    licenses = []
+    for n in range(rng.choice([0, 0, 0, 1, 1, 2, 3])):
+        start = _timestamp(rng, datetime(2024, 1, 1), 900)
+        licenses.append({
+            "license_id": f"LIC-{index:06d}-{n}",
+            "type": rng.choice(["sync", "sync", "mechanical"]),
+            "licensee": rng.choice(LICENSEES),
+            "territory": rng.choice(TERRITORIES),
+            "start_date": start.strftime("%Y-%m-%d"),
+            "end_date": (start + timedelta(days=rng.randint(30, 1095))).strftime("%Y-%m-%d"),
+            "exclusive": rng.random() < 0.2,
+            "fee": float(rng.choice([500, 1500, 5000, 20000, 25000])),
+            "notes": "",
+            "created": start.isoformat(),
+        })
+
+    events = [{
+        "timestamp": created.isoformat(),
+        "event_type": "created",
+        "description": "Imported from Excel",
+        "user": "System Import",
+    }]
+    for _ in range(rng.randint(0, 20)):
+        events.append({
+            "timestamp": _timestamp(rng, created, 400).isoformat(),
+            "event_type": rng.choice(EVENT_TYPES),
+            "description": "Synthetic event " + "".join(rng.choices(string.ascii_lowercase, k=24)),
+            "user": "John York",
+        })
+
+    expenses = [{
+        "date": _timestamp(rng, created, 400).strftime("%Y-%m-%d"),
+        "amount": float(rng.choice([50, 150, 300, 750])),
+        "category": rng.choice(["Mixing", "Mastering", "Musicians", "Artwork"]),
+    } for _ in range(rng.choice([0, 0, 1, 2, 5]))]
+
+    return {
+        "song_id": f"RS-{created.year}-{index:06d}",
+        "title": title,
+        "alt_titles": [],
+        "act_id": act_id,
+        "artist": artist,
+        "album": "Unknown Album",
+        "writers": SPLITS.get(act_id, [{"writer_id": "W-0001", "percentage": 100}]),
+        "legacy_code": "".join(rng.choices(string.ascii_uppercase, k=4)),
+        "musical_info": {
+            "genre": rng.choice(GENRES), "subgenre": "", "bpm": rng.choice([None, rng.randint(70, 170)]),
+            "key": None, "time_signature": "4/4", "duration_seconds": rng.randint(90, 360), "instrumental": False,
+        },
+        "sync_metadata": {
+            "moods": rng.sample(MOODS, rng.randint(0, 3)), "themes": [], "keywords": [], "similar_artists": [],
+            "use_cases": [], "explicit": False, "one_stop": True,
+        },
+        "status": status,
+        "dates": {
+            "created": created.isoformat(), "demo_completed": created.isoformat(), "mastered": None,
+            "released": created.strftime("%Y-%m-%d") if status == "released" else None,
+            "last_modified": modified.isoformat(),
+        },
+        "registration": {
+            "isrc": f"US-RS1-{created.strftime('%y')}-{index % 100000:05d}" if status == "released" else None,
+            "iswc": None, "pro_work_id": None, "copyright_reg": None,
+            "registered_with": ["ASCAP"] if rng.random() < 0.5 else [],
+        },
+        "rights": {
+            "master_owner": "Ridgemont Studio", "publisher": "Ridgemont Studio",
+            "territories": ["Worldwide"], "restrictions": [], "licenses": licenses,
+        },
+        "revenue": {"expenses": expenses, "total_earned": round(sum(l["fee"] for l in licenses) + rng.random() * 500, 2)},
+        "links": {"r2_path": f"{artist}/Unknown Album/{title}.mp3"} if rng.random() < 0.4 else {},
+        "events": events,
+        "notes": "",
+        "sync_checklist": {
+            "sync_status": "available", "master_cleared": True, "publishing_cleared": True,
+            "one_stop_available": True, "stems_available": rng.random() < 0.3,
+            "instrumental_available": rng.random() < 0.3, "sync_rep_assigned": None, "pitch_deck_ready": False,
+        },
+        "deployments": {
+            "distribution": rng.sample(DISTRIBUTORS, rng.randint(0, 2)),
+            "sync_libraries": rng.sample(SYNC_LIBS, rng.randint(0, 3)),
+            "streaming": rng.sample(STREAMING, rng.randint(0, 4)),
+        },
+    }
+
+
+def generate_catalog(size: int, seed: int = 42) -> Dict[str, Any]:
+    """A catalog dict of `size` songs, deterministic for a given seed."""
+    rng = random.Random(seed)
+    return {"songs": [synthetic_song(rng, i + 1) for i in range(size)], "albums": []}
+
+
+def write_catalog(size: int, path: Path, seed: int = 42) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(generate_catalog(size, seed), f, indent=2, default=str)
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalog.json")
+    parser.add_argument("size", type=int)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    print(f"Wrote {args.size} songs → {write_catalog(args.size, args.output, args.seed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,15 @@ Ridgemont Catalog Manager - Watch & Upload Script
 Monitors a folder for new audio files, extracts metadata,
 uploads to Cloudflare R2, and updates the catalog.
 
+A folder dropped into the watch folder is ingested as ONE song package:
+    My Song/
+        My Song.wav                  master (top-level .wav/.mp3)
+        My Song (Instrumental).wav   -> links.instrumental_path, instrumental_available
+        stems/Drums.wav ...          -> links.stems, stems_available
+        My Song 30s.wav              -> links.versions (edits, cutdowns, a cappellas)
+All files upload concurrently (RIDGEMONT_UPLOAD_WORKERS, default 8) and
+the song is written to the catalog once, after every upload succeeded.
+
 Usage:
     python watch_and_upload.py
 
@@ -16,34 +25,49 @@ Environment Variables (in .env file):
     CLOUDFLARE_R2_ACCESS_KEY_ID=your_access_key
     CLOUDFLARE_R2_SECRET_ACCESS_KEY=your_secret_key
     R2_BUCKET_NAME=ridgemont-studio
+    R2_ENDPOINT_URL=http://127.0.0.1:9000       optional: any S3-compatible endpoint instead of R2
+
+Optional R2 connection tuning (defaults shown):
+    R2_MAX_POOL_CONNECTIONS=50                  HTTP connections kept per client
+    R2_MAX_ATTEMPTS=8                           attempts per request, retried with backoff
+    R2_RETRY_MODE=adaptive                      adaptive | standard | legacy
+    R2_CONNECT_TIMEOUT=5                        seconds
+    R2_READ_TIMEOUT=60                          seconds
+
+Optional storage:
+    RIDGEMONT_STORE_FORMAT=compact              json (default) | compact | msgpack, see codec.py
+
+Optional instrumentation:
+    RIDGEMONT_METRICS_PORT=9108                 serve Prometheus text at /metrics
+    RIDGEMONT_METRICS_FILE=metrics/watcher.prom write it to a file after each upload
+    RIDGEMONT_LOG_LEVEL=INFO                    JSON span logs on stderr
 """
 
 import os
 import sys
-import json
 import re
 import shutil
 import time
+import tempfile
+import threading
 import hashlib
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 
-# Third-party imports
-try:
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler, FileCreatedEvent
-    from mutagen.mp3 import MP3
-    from mutagen.id3 import ID3
-    from mutagen.wave import WAVE
-    import boto3
-    from botocore.config import Config
-    from dotenv import load_dotenv
-except ImportError as e:
-    print(f"Missing dependency: {e}")
-    print("\nInstall required packages:")
-    print("  pip install watchdog mutagen boto3 python-dotenv")
-    sys.exit(1)
+# Third-party packages (watchdog, mutagen, boto3, python-dotenv) are imported
+# where they're used, so importing this module for build_tracks_payload,
+# classify_package & co. stays cheap; main() checks they're installed.
+REQUIREMENTS = "pip install watchdog mutagen boto3 python-dotenv"
+
+import metrics
+from metrics import span, inc
+from models import PUBLISHED_STATUSES, new_song
+from change_feed import ChangeFeed
+from event_store import EventStore, detach_events
+from codec import dumps, loads, dump_file, read_catalog, write_catalog, catalog_source
+import renditions
 
 
 # =============================================================================
@@ -58,37 +82,121 @@ CATALOG_JSON_PATH = CATALOG_MANAGER_ROOT / "data" / "catalog.json"
 
 # Supported file extensions
 SUPPORTED_EXTENSIONS = {'.mp3', '.wav'}
+# Song folders may also carry stems/alternates in these formats
+PACKAGE_EXTENSIONS = SUPPORTED_EXTENSIONS | {'.aif', '.aiff', '.flac'}
+CONTENT_TYPES = {'.mp3': 'audio/mpeg', '.wav': 'audio/wav', '.aif': 'audio/aiff', '.aiff': 'audio/aiff', '.flac': 'audio/flac'}
+
+# Package ingest: how files inside a song folder are recognised
+STEM_FOLDERS = {"stems", "stem", "multitracks", "tracks"}
+STEM_PATTERN = re.compile(r"\bstems?\b")
+INSTRUMENTAL_PATTERN = re.compile(r"instrumental|\binst\b|\binstr\b|no[ _-]?vox|no[ _-]?vocals?|\btv[ _-]?mix|backing[ _-]?track")
+VERSION_PATTERN = re.compile(r"a[ _-]?cappella|acapella|vocals?[ _-]?only|\bclean\b|\bedit\b|\b\d+[ _-]?sec(ond)?s?\b")
+UPLOAD_WORKERS = int(os.getenv("RIDGEMONT_UPLOAD_WORKERS", "8"))
 
-# Artist name to act_id mapping
-# Add new artists here as needed
-ARTIST_TO_ACT_ID = {
-    # Primary artist names
-    "frozen cloud": "FROZEN_CLOUD",
-    "bajan sun": "BAJAN_SUN",
-    "park bellevue": "PARK_BELLEVUE",
-    # Pseudonyms / Aliases
-    "honest mile": "FROZEN_CLOUD",
-    "echoes of jahara": "FROZEN_CLOUD",
-    # Add more mappings as you add acts
-}
 
 
 # =============================================================================
 # R2 CLIENT
 # =============================================================================
 
+# Error codes that mean "no such object" rather than "couldn't tell"
+NOT_FOUND_CODES = {"404", "NoSuchKey", "NotFound"}
+# Throttling / server-side errors worth retrying later
+TRANSIENT_CODES = {"429", "500", "502", "503", "504", "SlowDown", "Throttling", "ThrottlingException",
+                   "RequestTimeout", "RequestTimeTooSkewed", "InternalError", "ServiceUnavailable"}
+
+
+class R2Error(Exception):
+    """An R2 request failed for a reason other than a missing object."""
+
+
+class R2TransientError(R2Error):
+    """Throttled, timed out or unreachable after retries - the object may well exist."""
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def check_dependencies() -> None:
+    """Exit with an install hint if a watcher dependency is missing."""
+    try:
+        import watchdog, mutagen, boto3, dotenv  # noqa: F401
+    except ImportError as e:
+        print(f"Missing dependency: {e}")
+        print("\nInstall required packages:")
+        print(f"  {REQUIREMENTS}")
+        sys.exit(1)
+
+
+def _boto_errors() -> tuple:
+    """(ClientError, BotoCoreError) - botocore is only imported once R2 is actually used."""
+    from botocore.exceptions import ClientError, BotoCoreError
+    return ClientError, BotoCoreError
+
+
+def r2_config():
+    """botocore Config from the R2_* environment: pool size, retries with backoff, timeouts."""
+    from botocore.config import Config
+    return Config(
+        signature_version='s3v4',
+        max_pool_connections=int(_env_number("R2_MAX_POOL_CONNECTIONS", 50)),
+        retries={'total_max_attempts': int(_env_number("R2_MAX_ATTEMPTS", 8)), 'mode': os.getenv("R2_RETRY_MODE", "adaptive")},
+        connect_timeout=_env_number("R2_CONNECT_TIMEOUT", 5),
+        read_timeout=_env_number("R2_READ_TIMEOUT", 60),
+        tcp_keepalive=True,
+    )
+
+
+def _is_not_found(error: Exception) -> bool:
+    ClientError, _ = _boto_errors()
+    if not isinstance(error, ClientError):
+        return False
+    return str(error.response.get('Error', {}).get('Code')) in NOT_FOUND_CODES
+
+
+def _classify(error: Exception, action: str) -> R2Error:
+    """Wrap an R2 failure: R2TransientError for throttling/5xx/network, R2Error otherwise
+    (bad responses, unreadable local files, ...)."""
+    ClientError, BotoCoreError = _boto_errors()
+    message = error
+    if not isinstance(error, (ClientError, BotoCoreError)) and isinstance(error.__context__, (ClientError, BotoCoreError)):
+        error = error.__context__  # boto3's S3UploadFailedError wraps the ClientError
+    if isinstance(error, ClientError):
+        code = str(error.response.get('Error', {}).get('Code'))
+        status = str(error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', ''))
+        transient = code in TRANSIENT_CODES or status in TRANSIENT_CODES
+    else:
+        transient = isinstance(error, BotoCoreError)  # connection, read timeout, ...
+    inc("r2_errors_total", kind="transient" if transient else "error", operation=action)
+    cls = R2TransientError if transient else R2Error
+    return cls(f"{action} failed: {message}")
+
+
 class R2Client:
-    """Cloudflare R2 storage client using S3-compatible API."""
+    """Cloudflare R2 storage client using S3-compatible API.
+
+    One client is safe to share across threads (boto3 clients are; its pooled
+    connections are sized by R2_MAX_POOL_CONNECTIONS) - use get_r2_client()
+    rather than building one per upload.
+    """
 
     def __init__(self):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from dotenv import load_dotenv
         load_dotenv(CATALOG_MANAGER_ROOT / ".env")
 
         self.account_id = os.getenv("CLOUDFLARE_ACCOUNT_ID")
         self.access_key = os.getenv("CLOUDFLARE_R2_ACCESS_KEY_ID")
         self.secret_key = os.getenv("CLOUDFLARE_R2_SECRET_ACCESS_KEY")
         self.bucket_name = os.getenv("R2_BUCKET_NAME", "ridgemont-studio")
+        self.endpoint_url = os.getenv("R2_ENDPOINT_URL")
 
-        if not all([self.account_id, self.access_key, self.secret_key]):
+        if not all([self.account_id or self.endpoint_url, self.access_key, self.secret_key]):
             raise ValueError(
                 "Missing R2 credentials. Please set these in .env:\n"
                 "  CLOUDFLARE_ACCOUNT_ID\n"
@@ -96,67 +204,153 @@ class R2Client:
                 "  CLOUDFLARE_R2_SECRET_ACCESS_KEY"
             )
 
-        self.endpoint_url = f"https://{self.account_id}.r2.cloudflarestorage.com"
+        if not self.endpoint_url:
+            self.endpoint_url = f"https://{self.account_id}.r2.cloudflarestorage.com"
 
-        self.client = boto3.client(
+        self.config = r2_config()
+        # boto3.client() goes through the shared default session, which is not thread-safe
+        self.client = boto3.session.Session().client(
             's3',
             endpoint_url=self.endpoint_url,
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
-            config=Config(signature_version='s3v4'),
+            config=self.config,
             region_name='auto'
         )
+        self.transfer_config = TransferConfig(max_concurrency=max(1, min(10, self.config.max_pool_connections)))
+        self.client.meta.events.register('after-call.s3', self._count_retries)
+        self._errors = _boto_errors()
+        from boto3.exceptions import S3UploadFailedError
+        self._upload_errors = self._errors + (S3UploadFailedError, OSError)  # OSError: the local file
+
+    @staticmethod
+    def _count_retries(parsed=None, model=None, **kwargs):
+        """botocore hook: record retry attempts reported on each response."""
+        attempts = (parsed or {}).get('ResponseMetadata', {}).get('RetryAttempts', 0)
+        if attempts:
+            inc("r2_retries_total", attempts, operation=getattr(model, 'name', 'unknown'))
 
     def file_exists(self, key: str) -> bool:
-        """Check if a file exists in R2."""
+        """Check if a file exists in R2. Raises R2TransientError when R2 can't say."""
         try:
-            self.client.head_object(Bucket=self.bucket_name, Key=key)
+            with span("r2.head_object"):
+                self.client.head_object(Bucket=self.bucket_name, Key=key)
             return True
-        except:
-            return False
+        except self._errors as e:
+            if _is_not_found(e):
+                return False
+            raise _classify(e, "head_object") from e
 
     def upload_file(self, local_path: Path, r2_key: str, content_type: str = None) -> bool:
-        """Upload a file to R2."""
+        """Upload a file to R2. False (logged and counted by kind) when R2 or the local file fails."""
         try:
             extra_args = {}
             if content_type:
                 extra_args['ContentType'] = content_type
 
-            self.client.upload_file(
-                str(local_path),
-                self.bucket_name,
-                r2_key,
-                ExtraArgs=extra_args
-            )
+            with span("r2.upload_file"):
+                self.client.upload_file(
+                    str(local_path),
+                    self.bucket_name,
+                    r2_key,
+                    ExtraArgs=extra_args,
+                    Config=self.transfer_config
+                )
+            inc("r2_uploads_total", result="ok", kind="file")
+            inc("bytes_written_total", local_path.stat().st_size, target="r2")
             print(f"  [R2] Uploaded: {r2_key}")
             return True
-        except Exception as e:
-            print(f"  [R2] Upload failed: {e}")
+        except self._upload_errors as e:
+            inc("r2_uploads_total", result="error", kind="file")
+            print(f"  [R2] Upload failed: {_classify(e, 'upload_file')}")
             return False
 
     def upload_json(self, data: dict, r2_key: str) -> bool:
-        """Upload JSON data to R2."""
+        """Upload JSON data to R2. False (logged and counted by kind) when R2 fails."""
         try:
-            json_bytes = json.dumps(data, indent=2).encode('utf-8')
-            self.client.put_object(
-                Bucket=self.bucket_name,
-                Key=r2_key,
-                Body=json_bytes,
-                ContentType='application/json'
-            )
+            json_bytes = dumps(data, pretty=True)
+            with span("r2.put_object"):
+                self.client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=r2_key,
+                    Body=json_bytes,
+                    ContentType='application/json'
+                )
+            inc("r2_uploads_total", result="ok", kind="json")
+            inc("bytes_written_total", len(json_bytes), target="r2")
             print(f"  [R2] Updated: {r2_key}")
             return True
-        except Exception as e:
-            print(f"  [R2] JSON upload failed: {e}")
+        except self._errors as e:
+            inc("r2_uploads_total", result="error", kind="json")
+            print(f"  [R2] JSON upload failed: {_classify(e, 'put_object')}")
+            return False
+
+    def list_keys(self, prefix: str = "") -> Dict[str, int]:
+        """Every key under prefix with its size (paginated list_objects_v2, 1000 keys per page)."""
+        keys = {}
+        try:
+            with span("r2.list_objects"):
+                for page in self.client.get_paginator('list_objects_v2').paginate(Bucket=self.bucket_name, Prefix=prefix):
+                    for item in page.get('Contents', []):
+                        keys[item['Key']] = item['Size']
+        except self._errors as e:
+            raise _classify(e, "list_objects_v2") from e
+        return keys
+
+    def delete_keys(self, keys: List[str]) -> int:
+        """Delete keys in batches of 1000 (delete_objects). Returns how many were deleted.
+        Raises R2TransientError / R2Error when a batch request fails."""
+        deleted = 0
+        for i in range(0, len(keys), 1000):
+            batch = [{'Key': key} for key in keys[i:i + 1000]]
+            try:
+                with span("r2.delete_objects"):
+                    response = self.client.delete_objects(Bucket=self.bucket_name, Delete={'Objects': batch, 'Quiet': True})
+            except self._errors as e:
+                raise _classify(e, "delete_objects") from e
+            deleted += len(batch) - len(response.get('Errors', []))
+        return deleted
+
+    def copy_key(self, source_key: str, target_key: str) -> bool:
+        """Server-side copy within the bucket. False (logged and counted by kind) when R2 fails."""
+        try:
+            with span("r2.copy_object"):
+                self.client.copy_object(Bucket=self.bucket_name, Key=target_key,
+                                        CopySource={'Bucket': self.bucket_name, 'Key': source_key})
+            return True
+        except self._errors as e:
+            print(f"  [R2] Copy failed: {_classify(e, 'copy_object')}")
             return False
 
     def get_json(self, r2_key: str) -> Optional[dict]:
-        """Download and parse JSON from R2."""
+        """Download and parse JSON from R2; None if the key doesn't exist.
+        Raises R2TransientError / R2Error, including for a body that isn't valid JSON."""
+        try:
+            with span("r2.get_object"):
+                response = self.client.get_object(Bucket=self.bucket_name, Key=r2_key)
+                body = response['Body'].read()
+        except self._errors as e:
+            if _is_not_found(e):
+                return None
+            raise _classify(e, "get_object") from e
         try:
-            response = self.client.get_object(Bucket=self.bucket_name, Key=r2_key)
-            return json.loads(response['Body'].read().decode('utf-8'))
-        except:
-            return None
+            return loads(body)
+        except ValueError as e:  # a corrupt or truncated object, e.g. a half-written tracks.json
+            raise _classify(ValueError(f"{r2_key} is not valid JSON: {e}"), "get_object") from e
+
+
+_shared_client: Optional[R2Client] = None
+_shared_lock = threading.Lock()
+
+
+def get_r2_client() -> R2Client:
+    """The process-wide R2Client, created on first use (thread-safe)."""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = R2Client()
+    return _shared_client
 
 
 # =============================================================================
@@ -165,6 +359,8 @@ class R2Client:
 
 def extract_metadata(file_path: Path) -> Dict[str, Any]:
     """Extract metadata from audio file using ID3 tags."""
+    from mutagen.mp3 import MP3
+    from mutagen.wave import WAVE
 
     metadata = {
         "title": file_path.stem,  # Default to filename
@@ -235,11 +431,13 @@ def sanitize_filename(name: str) -> str:
 
 
 def get_act_id(artist_name: str) -> str:
-    """Convert artist name to act_id."""
-    normalized = artist_name.lower().strip()
+    """Convert artist name to act_id (registered acts and their pseudonyms first, see act_registry.py)."""
+    from act_registry import ActRegistry
+    act_id = ActRegistry.load(CATALOG_JSON_PATH.parent).act_for_artist(artist_name)
+    if act_id:
+        return act_id
 
-    if normalized in ARTIST_TO_ACT_ID:
-        return ARTIST_TO_ACT_ID[normalized]
+    normalized = artist_name.lower().strip()
 
     # Generate act_id from artist name (UPPER_SNAKE_CASE)
     act_id = re.sub(r'[^a-z0-9]+', '_', normalized).upper().strip('_')
@@ -259,127 +457,60 @@ def generate_song_id() -> str:
 # =============================================================================
 
 def load_catalog() -> Dict[str, Any]:
-    """Load the catalog.json file."""
-    if CATALOG_JSON_PATH.exists():
-        with open(CATALOG_JSON_PATH, 'r') as f:
-            return json.load(f)
-    return {"songs": [], "writers": [], "contacts": [], "opportunities": []}
+    """Load the catalog (catalog.json or the working store, whichever is newer)."""
+    return read_catalog(CATALOG_JSON_PATH.parent, default={"songs": [], "writers": [], "contacts": [], "opportunities": []})
 
 
 def save_catalog(catalog: Dict[str, Any]) -> None:
-    """Save the catalog.json file."""
-    # Create backup first
-    if CATALOG_JSON_PATH.exists():
-        backup_dir = CATALOG_MANAGER_ROOT / "backups"
-        backup_dir.mkdir(exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = backup_dir / f"catalog_backup_{timestamp}.json"
-        shutil.copy(CATALOG_JSON_PATH, backup_path)
-
-    with open(CATALOG_JSON_PATH, 'w') as f:
-        json.dump(catalog, f, indent=2)
-    print(f"  [CATALOG] Saved: {CATALOG_JSON_PATH}")
+    """Save the catalog in the configured store format (RIDGEMONT_STORE_FORMAT)."""
+    # Create backup first: always a whole catalog, never the shard index
+    source = catalog_source(CATALOG_JSON_PATH.parent)
+    if source.exists():
+        from catalog_manager import backup_catalog
+        payload = source.read_bytes() if source == CATALOG_JSON_PATH else dumps(read_catalog(CATALOG_JSON_PATH.parent), pretty=True)
+        backup_catalog(payload)
+    with span("save_catalog"):
+        saved = write_catalog(CATALOG_JSON_PATH.parent, catalog)
+    metrics.record_file_write(saved)
+    print(f"  [CATALOG] Saved: {saved}")
 
 
 def create_song_entry(metadata: Dict[str, Any], r2_path: str) -> Dict[str, Any]:
-    """Create a new song entry for the catalog."""
-    now = datetime.now().isoformat()
-
-    return {
-        "song_id": generate_song_id(),
-        "title": metadata["title"],
-        "alt_titles": [],
-        "act_id": get_act_id(metadata["artist"]),
-        "artist": metadata["artist"],
-        "album": metadata.get("album", "Unknown Album"),
-        "writers": [],
-        "legacy_code": "",
-        "musical_info": {
+    """Create a new song entry for the catalog (shared schema from models.new_song)."""
+    song = new_song(
+        generate_song_id(),
+        metadata["title"],
+        get_act_id(metadata["artist"]),
+        metadata["artist"],
+        status="mastered",
+        album=metadata.get("album", "Unknown Album"),
+        musical_info={
             "genre": metadata.get("genre") or "Unknown",
-            "subgenre": "",
             "bpm": metadata.get("bpm"),
-            "key": None,
-            "time_signature": "4/4",
             "duration_seconds": metadata.get("duration_seconds"),
-            "instrumental": False
-        },
-        "sync_metadata": {
-            "moods": [],
-            "themes": [],
-            "keywords": [],
-            "similar_artists": [],
-            "use_cases": [],
-            "explicit": False,
-            "one_stop": True
-        },
-        "status": "finished",
-        "dates": {
-            "created": now,
-            "demo_completed": now,
-            "mastered": now,
-            "released": None,
-            "last_modified": now
-        },
-        "registration": {
-            "isrc": None,
-            "iswc": None,
-            "pro_work_id": None,
-            "copyright_reg": None,
-            "registered_with": []
         },
-        "rights": {
-            "master_owner": "Ridgemont Studio",
-            "publisher": "Ridgemont Studio",
-            "territories": ["Worldwide"],
-            "restrictions": [],
-            "licenses": []
-        },
-        "revenue": {
-            "expenses": [],
-            "total_earned": 0
-        },
-        "links": {
-            "r2_path": r2_path
-        },
-        "events": [
-            {
-                "timestamp": now,
-                "event_type": "created",
-                "description": f"Auto-uploaded via watch_and_upload.py",
-                "user": "System"
-            }
-        ],
-        "notes": "",
-        "sync_checklist": {
-            "sync_status": "available",
-            "master_cleared": True,
-            "publishing_cleared": True,
-            "one_stop_available": True,
-            "stems_available": False,
-            "instrumental_available": False,
-            "sync_rep_assigned": None,
-            "pitch_deck_ready": False
-        },
-        "deployments": {
-            "distribution": [],
-            "sync_libraries": [],
-            "streaming": []
-        }
-    }
+        r2_path=r2_path,
+        description="Auto-uploaded via watch_and_upload.py",
+    )
+    return song.to_dict()
 
 
 # =============================================================================
 # TRACKS.JSON FOR WEBSITE
 # =============================================================================
 
-def update_tracks_json(r2_client: R2Client, catalog: Dict[str, Any]) -> None:
-    """Update the tracks.json file in R2 for the website."""
+# links.<kind>_path -> tracks.json field; "file" stays the master
+TRACK_RENDITIONS = {"preview": "stream", "clip": "clip", "peaks": "peaks"}
+
+
+def build_tracks_payload(catalog: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the tracks.json document for the website from the catalog."""
 
-    # Get all finished songs with R2 paths
+    # Get all mastered/released songs with R2 paths
     tracks = []
     for song in catalog.get("songs", []):
         r2_path = song.get("links", {}).get("r2_path")
-        if r2_path and song.get("status") in ["finished", "released"]:
+        if r2_path and song.get("status") in PUBLISHED_STATUSES:
             tracks.append({
                 "id": song["song_id"],
                 "file": r2_path,
@@ -388,15 +519,19 @@ def update_tracks_json(r2_client: R2Client, catalog: Dict[str, Any]) -> None:
                 "album": song.get("album", "Unknown Album"),
                 "duration": format_duration(song.get("musical_info", {}).get("duration_seconds")),
                 "year": song.get("dates", {}).get("created", "")[:4] if song.get("dates", {}).get("created") else None,
-                "genre": song.get("musical_info", {}).get("genre", "")
+                "genre": song.get("musical_info", {}).get("genre", ""),
+                **{field: song["links"][f"{kind}_path"] for kind, field in TRACK_RENDITIONS.items() if song["links"].get(f"{kind}_path")}
             })
 
-    tracks_data = {
+    return {
         "lastUpdated": datetime.now().strftime("%Y-%m-%d"),
         "tracks": tracks
     }
 
-    r2_client.upload_json(tracks_data, "tracks.json")
+
+def update_tracks_json(r2_client: R2Client, catalog: Dict[str, Any]) -> None:
+    """Update the tracks.json file in R2 for the website."""
+    r2_client.upload_json(build_tracks_payload(catalog), "tracks.json")
 
 
 def format_duration(seconds: Optional[int]) -> str:
@@ -412,6 +547,7 @@ def format_duration(seconds: Optional[int]) -> str:
 # FILE PROCESSOR
 # =============================================================================
 
+@span("process_file")
 def process_file(file_path: Path, r2_client: R2Client) -> bool:
     """Process a single audio file: extract, upload, catalog, cleanup."""
 
@@ -421,7 +557,8 @@ def process_file(file_path: Path, r2_client: R2Client) -> bool:
 
     # 1. Extract metadata
     print("\n[1/5] Extracting metadata...")
-    metadata = extract_metadata(file_path)
+    with span("process_file.extract_metadata"):
+        metadata = extract_metadata(file_path)
     print(f"  Title:    {metadata['title']}")
     print(f"  Artist:   {metadata['artist']}")
     print(f"  Album:    {metadata['album']}")
@@ -429,57 +566,282 @@ def process_file(file_path: Path, r2_client: R2Client) -> bool:
     if metadata['genre']:
         print(f"  Genre:    {metadata['genre']}")
 
-    # 2. Build R2 path
-    print("\n[2/5] Building R2 path...")
-    artist_folder = sanitize_filename(metadata['artist'])
-    album_folder = sanitize_filename(metadata['album'])
-    filename = sanitize_filename(metadata['title']) + file_path.suffix.lower()
+    # Renditions encode in the process pool while the master uploads
+    rendition_dir = Path(tempfile.mkdtemp(prefix="renditions-"))
+    rendition_job = renditions.submit(file_path, rendition_dir, metadata['duration_seconds'])
+    try:
+        return _upload_and_catalog(file_path, r2_client, metadata, rendition_job)
+    finally:
+        rendition_job.cancel()
+        shutil.rmtree(rendition_dir, ignore_errors=True)
 
-    r2_key = f"{artist_folder}/{album_folder}/{filename}"
 
-    # Handle duplicates
-    if r2_client.file_exists(r2_key):
-        timestamp = datetime.now().strftime("%Y%m%d")
-        base_name = sanitize_filename(metadata['title'])
-        filename = f"{base_name}-{timestamp}{file_path.suffix.lower()}"
-        r2_key = f"{artist_folder}/{album_folder}/{filename}"
-        print(f"  [DUPLICATE] Renamed to: {filename}")
+def _upload_and_catalog(file_path: Path, r2_client: R2Client, metadata: Dict[str, Any], rendition_job) -> bool:
+    """Steps 2-5 of process_file; rendition_job is the pending renditions.render() future."""
 
+    # 2. Build R2 path
+    print("\n[2/5] Building R2 path...")
+    try:
+        r2_key = master_r2_key(metadata, file_path.suffix, r2_client)
+    except R2Error as e:
+        # Don't guess: treating "couldn't check" as "not there" overwrites or duplicates uploads
+        print(f"  [ERROR] Could not check R2 for duplicates: {e}")
+        inc("files_processed_total", result="r2_unavailable")
+        return False
     print(f"  R2 Path: {r2_key}")
 
     # 3. Upload to R2
     print("\n[3/5] Uploading to R2...")
-    content_type = 'audio/mpeg' if file_path.suffix.lower() == '.mp3' else 'audio/wav'
-    if not r2_client.upload_file(file_path, r2_key, content_type):
+    with span("process_file.upload"):
+        uploaded = r2_client.upload_file(file_path, r2_key, content_type_for(file_path))
+    if not uploaded:
         print("  [ERROR] Upload failed!")
+        inc("files_processed_total", result="upload_failed")
         return False
+    rendition_links = _finish_renditions(r2_client, r2_key, rendition_job)
 
     # 4. Update catalog
     print("\n[4/5] Updating catalog...")
-    catalog = load_catalog()
     song_entry = create_song_entry(metadata, r2_key)
-    catalog["songs"].append(song_entry)
-    save_catalog(catalog)
+    song_entry["links"].update(rendition_links)
+    commit_song(song_entry, r2_client)
+
+    # 5. Move to Completed folder
+    print("\n[5/5] Moving to Completed...")
+    print(f"  Moved to: {move_to_completed(file_path)}")
+
+    print(f"\n[SUCCESS] {metadata['title']} uploaded successfully!")
+    inc("files_processed_total", result="ok")
+    return True
+
+
+def content_type_for(path: Path) -> str:
+    return CONTENT_TYPES.get(path.suffix.lower(), 'application/octet-stream')
+
+
+def master_r2_key(metadata: Dict[str, Any], suffix: str, r2_client: R2Client) -> str:
+    """Artist/Album/Title.ext, date-suffixed if that key is taken. Raises R2Error if R2 can't say."""
+    artist_folder = sanitize_filename(metadata['artist'])
+    album_folder = sanitize_filename(metadata['album'])
+    base_name = sanitize_filename(metadata['title'])
+    r2_key = f"{artist_folder}/{album_folder}/{base_name}{suffix.lower()}"
+
+    # Handle duplicates
+    with span("process_file.check_duplicate"):
+        duplicate = r2_client.file_exists(r2_key)
+    if duplicate:
+        timestamp = datetime.now().strftime("%Y%m%d")
+        filename = f"{base_name}-{timestamp}{suffix.lower()}"
+        r2_key = f"{artist_folder}/{album_folder}/{filename}"
+        print(f"  [DUPLICATE] Renamed to: {filename}")
+    return r2_key
+
+
+def _finish_renditions(r2_client: R2Client, r2_key: str, rendition_job) -> Dict[str, str]:
+    """Wait for the rendition job and upload its files; renditions never fail an ingest."""
+    try:
+        with span("process_file.renditions"):
+            rendition_links = renditions.upload_renditions(r2_client, r2_key, rendition_job.result())
+        print(f"  Renditions: {', '.join(sorted(rendition_links)) or 'none (ffmpeg not installed?)'}")
+        return rendition_links
+    except Exception as e:
+        print(f"  [WARNING] Renditions skipped: {e}")
+        return {}
+
+
+def commit_song(song_entry: Dict[str, Any], r2_client: R2Client) -> Dict[str, Any]:
+    """Append one new song in a single catalog write, publish it, and refresh tracks.json."""
+    with span("process_file.catalog_update"):
+        catalog = load_catalog()
+        events = detach_events(song_entry)
+        catalog["songs"].append(song_entry)
+        save_catalog(catalog)
+        ChangeFeed(CATALOG_JSON_PATH.parent).append("song", "create", song_entry["song_id"], act_id=song_entry["act_id"], data=song_entry)
+        EventStore(CATALOG_JSON_PATH.parent).append_many(events)
     print(f"  Song ID: {song_entry['song_id']}")
     print(f"  Act ID:  {song_entry['act_id']}")
 
     # Update tracks.json for website
-    update_tracks_json(r2_client, catalog)
+    with span("process_file.tracks_json"):
+        update_tracks_json(r2_client, catalog)
+    return catalog
 
-    # 5. Move to Completed folder
-    print("\n[5/5] Moving to Completed...")
+
+def move_to_completed(path: Path) -> Path:
+    """Move a file or package folder into Completed/, timestamping the name if it's taken."""
     COMPLETED_FOLDER.mkdir(parents=True, exist_ok=True)
-    completed_path = COMPLETED_FOLDER / file_path.name
+    completed_path = COMPLETED_FOLDER / path.name
 
-    # Handle duplicate in Completed folder
+    # Handle duplicate in Completed folder (folders keep their whole name: "Vol. 2" has no suffix)
     if completed_path.exists():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        completed_path = COMPLETED_FOLDER / f"{file_path.stem}_{timestamp}{file_path.suffix}"
+        stem, suffix = (path.name, "") if path.is_dir() else (path.stem, path.suffix)
+        completed_path = COMPLETED_FOLDER / f"{stem}_{timestamp}{suffix}"
 
-    shutil.move(str(file_path), str(completed_path))
-    print(f"  Moved to: {completed_path}")
+    with span("process_file.move"):
+        shutil.move(str(path), str(completed_path))
+    return completed_path
 
-    print(f"\n[SUCCESS] {metadata['title']} uploaded successfully!")
+
+# =============================================================================
+# PACKAGE INGEST (song folders: master + instrumental + stems)
+# =============================================================================
+
+def classify_package(folder: Path) -> Dict[str, Any]:
+    """Sort a song folder's audio into master / instrumental / stems / versions.
+
+    Stems: anything in a stems/ (or multitracks/, tracks/) subfolder, or with
+    the word "stem(s)" in the name ("Ecosystem" is not a stem). Instrumentals
+    and alternate mixes (acappella, clean, edit, "30 sec") are recognised by
+    name; underscores count as spaces. The master is the remaining top-level .wav/.mp3 (WAV first, then
+    the largest file).
+    """
+    files = sorted(p for p in folder.rglob("*")
+                   if p.is_file() and not p.name.startswith(".") and p.suffix.lower() in PACKAGE_EXTENSIONS)
+    package: Dict[str, Any] = {"master": None, "instrumental": [], "stems": [], "versions": []}
+    candidates = []
+    for path in files:
+        subfolders = {part.lower() for part in path.relative_to(folder).parts[:-1]}
+        name = path.stem.lower().replace("_", " ")
+        if subfolders & STEM_FOLDERS or STEM_PATTERN.search(name):
+            package["stems"].append(path)
+        elif INSTRUMENTAL_PATTERN.search(name):
+            package["instrumental"].append(path)
+        elif VERSION_PATTERN.search(name) or subfolders or path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+            package["versions"].append(path)
+        else:
+            candidates.append(path)
+    if not candidates:  # everything looked like an alternate: fall back to the top-level files
+        candidates = [p for p in package["versions"] if p.parent == folder and p.suffix.lower() in SUPPORTED_EXTENSIONS]
+        package["versions"] = [p for p in package["versions"] if p not in candidates]
+    if candidates:
+        candidates.sort(key=lambda p: (p.suffix.lower() == '.wav', p.stat().st_size), reverse=True)
+        package["master"] = candidates[0]
+        package["versions"] += candidates[1:]
+    return package
+
+
+def package_keys(folder: Path, package: Dict[str, Any], prefix: str) -> Dict[Path, str]:
+    """R2 key for every extra: <prefix>/<kind>/<path inside the folder>, so stems/Verse/Vox.wav and
+    stems/Chorus/Vox.wav stay apart (a leading stems/ folder is dropped). Clashes left after
+    sanitizing get -2, -3, ..."""
+    keys: Dict[Path, str] = {}
+    taken = set()
+    for kind in ("instrumental", "stems", "versions"):
+        for path in package[kind]:
+            parts = list(path.relative_to(folder).parent.parts)
+            if kind == "stems" and parts and parts[0].lower() in STEM_FOLDERS:
+                parts = parts[1:]
+            base = "/".join([prefix, kind] + [sanitize_filename(p) for p in parts] + [sanitize_filename(path.stem)])
+            key, n = f"{base}{path.suffix.lower()}", 1
+            while key.lower() in taken:
+                n += 1
+                key = f"{base}-{n}{path.suffix.lower()}"
+            taken.add(key.lower())
+            keys[path] = key
+    return keys
+
+
+def is_package(path: Path) -> bool:
+    return path.is_dir() and path.parent == WATCH_FOLDER and path.name != COMPLETED_FOLDER.name and not path.name.startswith(".")
+
+
+def wait_until_settled(folder: Path, interval: float = 1.0, timeout: float = 600) -> bool:
+    """Wait until a folder's file count and total size stop changing (copy finished)."""
+    def snapshot():
+        sizes = [p.stat().st_size for p in folder.rglob("*") if p.is_file()]
+        return len(sizes), sum(sizes)
+
+    deadline = time.time() + timeout
+    previous, stable = None, 0
+    while time.time() < deadline:
+        if not folder.exists():
+            return False
+        current = snapshot()
+        stable = stable + 1 if current == previous else 0
+        if stable >= 2:
+            return True
+        previous = current
+        time.sleep(interval)
+    return False
+
+
+@span("process_package")
+def process_package(folder: Path, r2_client: R2Client) -> bool:
+    """Ingest a song folder as ONE song: every file uploads concurrently under the master's key,
+    sync_checklist stems/instrumental flags are set, and the catalog is written once."""
+
+    print(f"\n{'='*60}")
+    print(f"Processing package: {folder.name}/")
+    print(f"{'='*60}")
+
+    # 1. Sort the folder and read the master's tags
+    print("\n[1/5] Reading package...")
+    package = classify_package(folder)
+    master = package["master"]
+    if master is None:
+        print("  [ERROR] No master .wav/.mp3 found at the top of the folder")
+        inc("files_processed_total", result="no_master")
+        return False
+    with span("process_file.extract_metadata"):
+        metadata = extract_metadata(master)
+    if metadata["title"] == master.stem and master.stem.lower() != folder.name.lower():
+        metadata["title"] = folder.name  # untagged master: the folder is the better title
+    print(f"  Master:       {master.name}  ({metadata['title']} - {metadata['artist']})")
+    print(f"  Instrumental: {len(package['instrumental'])}   Stems: {len(package['stems'])}   Versions: {len(package['versions'])}")
+
+    rendition_dir = Path(tempfile.mkdtemp(prefix="renditions-"))
+    rendition_job = renditions.submit(master, rendition_dir, metadata['duration_seconds'])
+    try:
+        # 2. Keys: extras live in a folder named after the master's key
+        print("\n[2/5] Building R2 paths...")
+        try:
+            r2_key = master_r2_key(metadata, master.suffix, r2_client)
+        except R2Error as e:
+            print(f"  [ERROR] Could not check R2 for duplicates: {e}")
+            inc("files_processed_total", result="r2_unavailable")
+            return False
+        prefix = r2_key.rsplit(".", 1)[0]
+        jobs = [(master, r2_key)] + list(package_keys(folder, package, prefix).items())
+        print(f"  R2 Path: {r2_key} (+{len(jobs) - 1} under {prefix}/)")
+
+        # 3. Upload everything at once through the shared client's connection pool
+        print(f"\n[3/5] Uploading {len(jobs)} file(s) to R2...")
+        with span("process_package.upload") as s, ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            s.set(files=len(jobs))
+            results = list(pool.map(lambda job: r2_client.upload_file(job[0], job[1], content_type_for(job[0])), jobs))
+        failed = [key for (_, key), ok in zip(jobs, results) if not ok]
+        if failed:
+            # Nothing is cataloged; the uploaded part shows up as orphans in r2_reconcile.py
+            print(f"  [ERROR] {len(failed)} upload(s) failed - package left in place: {', '.join(failed)}")
+            inc("files_processed_total", result="upload_failed")
+            return False
+        rendition_links = _finish_renditions(r2_client, r2_key, rendition_job)
+    finally:
+        rendition_job.cancel()
+        shutil.rmtree(rendition_dir, ignore_errors=True)
+
+    # 4. One song, one catalog write
+    print("\n[4/5] Updating catalog...")
+    keys = dict((path, key) for path, key in jobs)
+    song_entry = create_song_entry(metadata, r2_key)
+    song_entry["links"].update(rendition_links)
+    if package["instrumental"]:
+        song_entry["links"]["instrumental_path"] = keys[package["instrumental"][0]]
+    for kind in ("stems", "versions"):
+        if package[kind]:
+            song_entry["links"][kind] = [keys[p] for p in package[kind]]
+    song_entry["sync_checklist"]["stems_available"] = bool(package["stems"])
+    song_entry["sync_checklist"]["instrumental_available"] = bool(package["instrumental"])
+    song_entry["events"][-1]["description"] = f"Package upload: {len(jobs)} files via watch_and_upload.py"
+    commit_song(song_entry, r2_client)
+
+    # 5. Move the whole folder to Completed
+    print("\n[5/5] Moving to Completed...")
+    print(f"  Moved to: {move_to_completed(folder)}")
+
+    print(f"\n[SUCCESS] {metadata['title']} package uploaded ({len(jobs)} files)!")
+    inc("files_processed_total", len(jobs), result="ok")
     return True
 
 
@@ -487,25 +849,35 @@ def process_file(file_path: Path, r2_client: R2Client) -> bool:
 # FOLDER WATCHER
 # =============================================================================
 
-class UploadHandler(FileSystemEventHandler):
-    """Watches for new audio files and processes them."""
+class UploadHandler:
+    """Watches for new audio files and song folders and processes them.
+
+    A plain watchdog handler: the observer only calls dispatch(), so there's
+    no need to import watchdog just to subclass FileSystemEventHandler.
+    """
 
     def __init__(self, r2_client: R2Client):
         self.r2_client = r2_client
         self.processing = set()  # Track files being processed
 
+    def dispatch(self, event):
+        if event.event_type == "created":
+            self.on_created(event)
+
     def on_created(self, event):
+        file_path = Path(event.src_path)
+
         if event.is_directory:
+            if is_package(file_path):
+                self._process_package(file_path)
             return
 
-        file_path = Path(event.src_path)
-
         # Skip non-audio files
         if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
             return
 
-        # Skip files in Completed folder
-        if "Completed" in str(file_path):
+        # Skip files in Completed folder and files inside song folders (ingested as a package)
+        if "Completed" in str(file_path) or file_path.parent != WATCH_FOLDER:
             return
 
         # Skip if already processing
@@ -531,10 +903,26 @@ class UploadHandler(FileSystemEventHandler):
             process_file(file_path, self.r2_client)
 
         except Exception as e:
+            inc("files_processed_total", result="error")
             print(f"\n[ERROR] Failed to process {file_path.name}: {e}")
 
         finally:
             self.processing.discard(str(file_path))
+            metrics.flush()
+
+    def _process_package(self, folder: Path):
+        if str(folder) in self.processing:
+            return
+        self.processing.add(str(folder))
+        try:
+            if wait_until_settled(folder):
+                process_package(folder, self.r2_client)
+        except Exception as e:
+            inc("files_processed_total", result="error")
+            print(f"\n[ERROR] Failed to process {folder.name}/: {e}")
+        finally:
+            self.processing.discard(str(folder))
+            metrics.flush()
 
 
 def watch_folder(r2_client: R2Client) -> None:
@@ -550,7 +938,8 @@ def watch_folder(r2_client: R2Client) -> None:
     print(f"\nWatching folder: {WATCH_FOLDER}")
     print(f"Completed folder: {COMPLETED_FOLDER}")
     print(f"Catalog: {CATALOG_JSON_PATH}")
-    print(f"\nDrop .mp3 or .wav files into the watch folder to upload.")
+    print(f"\nDrop .mp3 or .wav files into the watch folder to upload,")
+    print("or a song folder (master + instrumental + stems/) to upload it as one song.")
     print("Press Ctrl+C to stop.\n")
 
     # Process any existing files first
@@ -560,11 +949,14 @@ def watch_folder(r2_client: R2Client) -> None:
         for file_path in existing_files:
             if "Completed" not in str(file_path):
                 process_file(file_path, r2_client)
+    for folder in sorted(p for p in WATCH_FOLDER.iterdir() if is_package(p)):
+        process_package(folder, r2_client)
 
     # Start watching
+    from watchdog.observers import Observer
     event_handler = UploadHandler(r2_client)
     observer = Observer()
-    observer.schedule(event_handler, str(WATCH_FOLDER), recursive=False)
+    observer.schedule(event_handler, str(WATCH_FOLDER), recursive=True)
     observer.start()
 
     try:
@@ -584,6 +976,7 @@ def watch_folder(r2_client: R2Client) -> None:
 
 def main():
     """Main entry point."""
+    check_dependencies()
 
     # Verify .env exists
     env_path = CATALOG_MANAGER_ROOT / ".env"
@@ -597,9 +990,14 @@ def main():
         print("  R2_BUCKET_NAME=ridgemont-studio")
         sys.exit(1)
 
+    # Structured span logs + optional Prometheus endpoint/file
+    metrics.configure_logging()
+    if metrics.start_metrics_server():
+        print(f"Metrics: http://127.0.0.1:{os.getenv(metrics.METRICS_PORT_ENV)}/metrics")
+
     # Initialize R2 client
     try:
-        r2_client = R2Client()
+        r2_client = get_r2_client()
     except ValueError as e:
         print(f"ERROR: {e}")
         sys.exit(1)
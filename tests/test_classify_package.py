@@ -0,0 +1,80 @@
+"""classify_package: how files in a dropped song folder are sorted."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import watch_and_upload  # noqa: E402
+from watch_and_upload import classify_package, package_keys  # noqa: E402
+
+
+def _folder(root: Path, name: str, files):
+    folder = root / name
+    for rel in files:
+        path = folder / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"\0" * 16)
+    return folder
+
+
+def _names(paths):
+    return sorted(p.name for p in paths)
+
+
+def test_title_containing_stem_is_a_master(tmp_path):
+    folder = _folder(tmp_path, "Ecosystem", ["Ecosystem.wav", "Ecosystem (Instrumental).wav"])
+    package = classify_package(folder)
+    assert package["master"].name == "Ecosystem.wav"
+    assert _names(package["instrumental"]) == ["Ecosystem (Instrumental).wav"]
+    assert package["stems"] == []
+
+
+def test_decade_in_title_is_not_a_version(tmp_path):
+    folder = _folder(tmp_path, "Back to the 80s", ["Back to the 80s.wav"])
+    package = classify_package(folder)
+    assert package["master"].name == "Back to the 80s.wav"
+    assert package["versions"] == []
+
+
+@pytest.mark.parametrize("name", ["Song Stem Drums.wav", "Song_stems_bass.wav", "Song - STEM - Vox.wav"])
+def test_stem_word_in_name(tmp_path, name):
+    package = classify_package(_folder(tmp_path, "Song", ["Song.wav", name]))
+    assert package["master"].name == "Song.wav"
+    assert _names(package["stems"]) == [name]
+
+
+def test_stems_subfolder(tmp_path):
+    package = classify_package(_folder(tmp_path, "Song", ["Song.wav", "Stems/Drums.wav", "multitracks/Bass.wav"]))
+    assert package["master"].name == "Song.wav"
+    assert _names(package["stems"]) == ["Bass.wav", "Drums.wav"]
+
+
+@pytest.mark.parametrize("name", ["Song 30 sec.wav", "Song_60sec.wav", "Song 15 seconds.wav", "Song (Clean).wav",
+                                  "Song Acapella.wav", "Song Radio Edit.wav"])
+def test_alternate_versions(tmp_path, name):
+    package = classify_package(_folder(tmp_path, "Song", ["Song.wav", name]))
+    assert package["master"].name == "Song.wav"
+    assert _names(package["versions"]) == [name]
+
+
+def test_stems_with_same_name_get_distinct_keys(tmp_path):
+    folder = _folder(tmp_path, "Song", ["Song.wav", "stems/Verse/Vox.wav", "stems/Chorus/Vox.wav", "Song Instrumental.wav"])
+    keys = package_keys(folder, classify_package(folder), "Act/Album/Song")
+    assert sorted(keys.values()) == ["Act/Album/Song/instrumental/Song Instrumental.wav",
+                                     "Act/Album/Song/stems/Chorus/Vox.wav", "Act/Album/Song/stems/Verse/Vox.wav"]
+
+
+def test_keys_that_clash_after_sanitizing_are_numbered(tmp_path):
+    folder = _folder(tmp_path, "Song", ["Song.wav", "stems/Vox.wav", "stems/Vox.WAV"])
+    keys = package_keys(folder, classify_package(folder), "P")
+    assert len(set(keys.values())) == 2
+
+
+def test_completed_folder_with_dots_keeps_its_name(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch_and_upload, "COMPLETED_FOLDER", tmp_path / "Completed")
+    (tmp_path / "Completed" / "Hits Vol. 2").mkdir(parents=True)
+    moved = watch_and_upload.move_to_completed(_folder(tmp_path / "in", "Hits Vol. 2", ["Song.wav"]))
+    assert moved.name.startswith("Hits Vol. 2_") and moved.is_dir()
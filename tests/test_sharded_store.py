@@ -0,0 +1,48 @@
+"""Sharded working store: a tracked edit rewrites only the shard of the act it touched."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import catalog_manager  # noqa: E402
+from catalog_manager import CatalogManager  # noqa: E402
+from codec import SHARD_DIR, SHARD_INDEX  # noqa: E402
+
+
+def _song(n, act_id):
+    return {"song_id": f"RS-2026-{n:04d}", "title": f"Song {n}", "act_id": act_id, "status": "demo",
+            "dates": {"created": "2026-01-25"}}
+
+
+def _stamps(folder: Path):
+    return {p.name: (p.stat().st_ino, p.stat().st_mtime_ns) for p in folder.glob("*.json")}
+
+
+def test_tracked_edit_rewrites_one_shard(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_manager, "BACKUPS_DIR", tmp_path / "backups")
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    songs = [_song(n, act) for n, act in enumerate(["FROZEN_CLOUD", "PARK_BELLEVUE", "BAJAN_SUN"] * 3)]
+    (data_dir / "catalog.json").write_text(json.dumps({"songs": songs, "albums": []}))
+
+    manager = CatalogManager(data_dir, store_format="sharded")
+    manager.save_data()  # first save: every shard, plus a whole-catalog backup
+    shards = data_dir / SHARD_DIR
+    before = _stamps(shards)
+
+    assert manager.update_song("RS-2026-0001", {"notes": "remixed"})
+    after = _stamps(shards)
+    changed = sorted(name for name in after if after[name] != before.get(name))
+    assert changed == ["PARK_BELLEVUE.json", SHARD_INDEX]  # the index only records the new digest
+
+    # the replaced shard was kept as the backup of this save, not a full catalog copy
+    kept = sorted(p.name for p in (tmp_path / "backups" / SHARD_DIR).glob("*/*.json"))
+    assert kept == ["PARK_BELLEVUE.json", SHARD_INDEX]
+    assert len(list((tmp_path / "backups").glob("catalog_backup_*.json"))) == 1
+
+    manager.update_song("RS-2026-0001", {"act_id": "BAJAN_SUN"})
+    moved = _stamps(shards)
+    assert sorted(name for name in moved if moved[name] != after[name]) == ["BAJAN_SUN.json", "PARK_BELLEVUE.json", SHARD_INDEX]
+    assert "RS-2026-0001" in [s["song_id"] for s in manager.act_catalog("BAJAN_SUN")["songs"]]